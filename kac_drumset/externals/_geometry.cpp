@@ -3,15 +3,23 @@ Generate python bindings for functions in `/kac_core/geometry` and configure C++
 */
 
 // core
+#include <algorithm>
 #include <array>
+#include <cmath>
+#include <cstdint>
+#include <numeric>
+#include <optional>
 #include <random>
+#include <stdexcept>
 #include <string>
+#include <thread>
 #include <time.h>
 #include <utility>
 #include <vector>
 
 // dependencies
 #include <kac_core.hpp>
+#include <pybind11/numpy.h>		  // numpy arrays
 #include <pybind11/pybind11.h>	  // python bindings
 #include <pybind11/stl.h>		  // type conversion
 
@@ -26,6 +34,7 @@ Intermediary types.
 typedef std::array<double, 2> _Point;
 typedef std::array<_Point, 2> _Line;
 typedef std::vector<_Point> _Vertices;
+typedef std::array<unsigned long, 3> _Triangle;
 
 /*
 Type conversions.
@@ -43,19 +52,615 @@ T::Polygon convertVectorToPolygon(const _Vertices& V) {
 	return out;
 }
 
+/*
+Rasterisation.
+*/
+
+template <typename Crossings>
+void fillCoverage(py::array_t<double>& out, const long& supersample, Crossings crossings) {
+	/*
+	Write the fractional coverage of a shape into a buffer, by sampling a supersample x supersample grid within each
+	pixel. The shape is defined by a function which, given a horizontal line x ∈ [0, 1], returns the sorted boundary
+	crossings along that line, such that each pair of crossings encloses the interior of the shape.
+	*/
+
+	auto M = out.mutable_unchecked<2>();
+	const long X = M.shape(0);
+	const long Y = M.shape(1);
+	const long S = std::max(supersample, 1L);
+	const double weight = 1. / static_cast<double>(S * S);
+	py::gil_scoped_release release;
+	std::vector<double> C;
+	for (long i = 0; i < X; i++) {
+		for (long j = 0; j < Y; j++) { M(i, j) = 0.; }
+		for (long s = 0; s < S; s++) {
+			crossings((static_cast<double>(i * S + s) + 0.5) / static_cast<double>(X * S), C);
+			for (unsigned long c = 0; c + 1 < C.size(); c += 2) {
+				// subpixels whose centres lie within [C[c], C[c + 1])
+				long start = std::max(0L, static_cast<long>(std::ceil(C[c] * Y * S - 0.5)));
+				const long end = std::min(Y * S, static_cast<long>(std::ceil(C[c + 1] * Y * S - 0.5)));
+				while (start < end) {
+					const long j = start / S;
+					const long next = std::min(end, (j + 1) * S);
+					M(i, j) += static_cast<double>(next - start) * weight;
+					start = next;
+				}
+			}
+		}
+	}
+}
+
+template <typename Crossings>
+void fillMask(py::array_t<std::int8_t>& out, Crossings crossings) {
+	/*
+	Write a boolean mask of a shape into a buffer, whereby a pixel is filled if its centre lies within the shape. The
+	shape is defined as in fillCoverage().
+	*/
+
+	auto M = out.mutable_unchecked<2>();
+	const long X = M.shape(0);
+	const long Y = M.shape(1);
+	py::gil_scoped_release release;
+	std::vector<double> C;
+	for (long i = 0; i < X; i++) {
+		for (long j = 0; j < Y; j++) { M(i, j) = 0; }
+		crossings((static_cast<double>(i) + 0.5) / static_cast<double>(X), C);
+		for (unsigned long c = 0; c + 1 < C.size(); c += 2) {
+			const long start = std::max(0L, static_cast<long>(std::ceil(C[c] * Y - 0.5)));
+			const long end = std::min(Y, static_cast<long>(std::ceil(C[c + 1] * Y - 0.5)));
+			for (long j = start; j < end; j++) { M(i, j) = 1; }
+		}
+	}
+}
+
+auto ellipseCrossings(const _Point& centroid, const _Point& radii) {
+	/*
+	The boundary crossings of an axis aligned ellipse along the line x.
+	*/
+
+	return [centroid, radii](const double& x, std::vector<double>& C) {
+		C.clear();
+		const double d = (x - centroid[0]) / radii[0];
+		if (d * d < 1.) {
+			const double h = radii[1] * std::sqrt(1. - d * d);
+			C.push_back(centroid[1] - h);
+			C.push_back(centroid[1] + h);
+		}
+	};
+}
+
+auto polygonCrossings(const _Vertices& V) {
+	/*
+	The boundary crossings of a polygon along the line x, using the even-odd rule. Each edge is treated as half open,
+	such that vertices lying on the line are only counted once.
+	*/
+
+	return [&V](const double& x, std::vector<double>& C) {
+		C.clear();
+		for (unsigned long n = 0; n < V.size(); n++) {
+			const _Point& a = V[n];
+			const _Point& b = V[(n + 1) % V.size()];
+			if ((a[0] <= x) != (b[0] <= x)) { C.push_back(a[1] + (x - a[0]) * (b[1] - a[1]) / (b[0] - a[0])); }
+		}
+		std::sort(C.begin(), C.end());
+	};
+}
+
+/*
+Segment intersections.
+*/
+
+int orientation(const T::Point& a, const T::Point& b, const T::Point& c) {
+	/*
+	The sign of the signed area of the triangle abc.
+	*/
+
+	const double d = (b.x - a.x) * (c.y - a.y) - (b.y - a.y) * (c.x - a.x);
+	return (d > 0.) - (d < 0.);
+}
+
+bool segmentsIntersect(const T::Point& a, const T::Point& b, const T::Point& c, const T::Point& d) {
+	/*
+	Determine whether the closed line segments ab and cd intersect, including touching and overlapping segments.
+	*/
+
+	auto onSegment = [](const T::Point& p, const T::Point& q, const T::Point& r) {
+		return std::min(p.x, q.x) <= r.x && r.x <= std::max(p.x, q.x) && std::min(p.y, q.y) <= r.y
+			&& r.y <= std::max(p.y, q.y);
+	};
+	const int o_1 = orientation(a, b, c);
+	const int o_2 = orientation(a, b, d);
+	const int o_3 = orientation(c, d, a);
+	const int o_4 = orientation(c, d, b);
+	if (o_1 != o_2 && o_3 != o_4) { return true; }
+	return (o_1 == 0 && onSegment(a, b, c)) || (o_2 == 0 && onSegment(a, b, d)) || (o_3 == 0 && onSegment(c, d, a))
+		|| (o_4 == 0 && onSegment(c, d, b));
+}
+
+std::int8_t encodeLineIntersection(const std::string& type) {
+	/*
+	Encode the type of an intersection returned by g::lineIntersection(), matching geometry.LineIntersection.
+	*/
+
+	if (type == "intersect") { return 1; }
+	if (type == "vertex") { return 2; }
+	if (type == "adjacent") { return 3; }
+	if (type == "colinear") { return 4; }
+	return 0;
+}
+
+std::vector<std::pair<unsigned long, unsigned long>> findIntersections(
+	const T::Polygon& P,
+	const bool& first_only = false
+) {
+	/*
+	Find every pair of intersecting edges (i, j), i < j, of a polygon, where edge i connects P[i] to P[i + 1]. Adjacent
+	edges are only considered to intersect when they fold back on one another. Edges are swept from left to right, such
+	that each edge is only compared to the active edges whose horizontal and vertical extents overlap with its own.
+	*/
+
+	const unsigned long N = P.size();
+	std::vector<std::pair<unsigned long, unsigned long>> out;
+	if (N < 3) { return out; }
+	auto x_min = [&P, N](unsigned long e) { return std::min(P[e].x, P[(e + 1) % N].x); };
+	auto x_max = [&P, N](unsigned long e) { return std::max(P[e].x, P[(e + 1) % N].x); };
+	auto y_min = [&P, N](unsigned long e) { return std::min(P[e].y, P[(e + 1) % N].y); };
+	auto y_max = [&P, N](unsigned long e) { return std::max(P[e].y, P[(e + 1) % N].y); };
+	std::vector<unsigned long> order(N);
+	std::iota(order.begin(), order.end(), 0);
+	std::sort(order.begin(), order.end(), [&x_min](unsigned long a, unsigned long b) { return x_min(a) < x_min(b); });
+	std::vector<unsigned long> active;
+	for (const unsigned long e : order) {
+		// remove the edges which end before the current edge begins
+		const double x = x_min(e);
+		active.erase(
+			std::remove_if(active.begin(), active.end(), [&x_max, x](unsigned long a) { return x_max(a) < x; }),
+			active.end()
+		);
+		for (const unsigned long a : active) {
+			if (y_max(a) < y_min(e) || y_max(e) < y_min(a)) { continue; }
+			const unsigned long i = std::min(a, e);
+			const unsigned long j = std::max(a, e);
+			bool intersects = false;
+			if (j == i + 1 || (i == 0 && j == N - 1)) {
+				// adjacent edges share a vertex, and so only intersect if the polygon folds back on itself
+				const unsigned long shared = j == i + 1 ? j : 0;
+				const T::Point& p = P[j == i + 1 ? i : N - 1];
+				const T::Point& q = P[(shared + 1) % N];
+				const T::Point& s = P[shared];
+				intersects = orientation(p, s, q) == 0 && (s.x - p.x) * (q.x - s.x) + (s.y - p.y) * (q.y - s.y) < 0.;
+			} else {
+				intersects = segmentsIntersect(P[i], P[i + 1], P[j], P[(j + 1) % N]);
+			}
+			if (intersects) {
+				out.push_back(std::make_pair(i, j));
+				if (first_only) { return out; }
+			}
+		}
+		active.push_back(e);
+	}
+	std::sort(out.begin(), out.end());
+	return out;
+}
+
+T::Polygon generateTravellingSalesmanPolygon(const int& N, std::mt19937& engine) {
+	/*
+	Generate a simple polygon by untangling a random tour of N points using 2-opt moves. After each sweep for
+	intersections, the intersecting pairs of edges are visited in a random order, and the vertices between each pair are
+	reversed. Only pairs whose ranges of vertices are disjoint are untangled during the same sweep, as these moves do not
+	interfere with one another.
+	van Leeuwen, J., & Schoone, A. A. (1982). Untangling a traveling salesman tour in the plane.
+	*/
+
+	std::uniform_real_distribution<double> uniform(0., 1.);
+	T::Polygon P(N);
+	for (T::Point& p : P) { p = T::Point(uniform(engine), uniform(engine)); }
+	std::vector<std::pair<unsigned long, unsigned long>> moves;
+	while (true) {
+		std::vector<std::pair<unsigned long, unsigned long>> I = findIntersections(P);
+		if (I.empty()) { return P; }
+		std::shuffle(I.begin(), I.end(), engine);
+		moves.clear();
+		bool colinear = false;
+		for (const auto& [i, j] : I) {
+			if (j == i + 1 || (i == 0 && j + 1 == P.size())) {
+				colinear = true;
+				continue;
+			}
+			if (std::all_of(moves.begin(), moves.end(), [i, j](const auto& m) { return j < m.first || m.second < i; })) {
+				moves.push_back(std::make_pair(i, j));
+			}
+		}
+		// three colinear vertices cannot be untangled using a 2-opt move, so the tour is shuffled instead
+		if (moves.empty() && colinear) { std::shuffle(P.begin(), P.end(), engine); }
+		for (const auto& [i, j] : moves) { std::reverse(P.begin() + i + 1, P.begin() + j + 1); }
+	}
+}
+
+T::Polygon generateConvexPolygon(const int& N, std::mt19937& engine) {
+	/*
+	Generate a convex polygon using Pavel Valtr's algorithm. Two sorted lists of N random coordinates are each split at
+	random into two chains running between their extrema, and the differences along each chain form the components of N
+	vectors which sum to zero. The components are paired at random, sorted by angle, and laid end to end.
+	Valtr, P. (1995). Probability that n random points are in convex position.
+	*/
+
+	std::uniform_real_distribution<double> uniform(0., 1.);
+	std::bernoulli_distribution coin(0.5);
+	auto components = [&]() {
+		std::vector<double> V(N);
+		for (double& v : V) { v = uniform(engine); }
+		std::sort(V.begin(), V.end());
+		std::vector<double> C;
+		C.reserve(N);
+		double a = V[0];
+		double b = V[0];
+		for (int n = 1; n < N - 1; n++) {
+			if (coin(engine)) {
+				C.push_back(V[n] - a);
+				a = V[n];
+			} else {
+				C.push_back(b - V[n]);
+				b = V[n];
+			}
+		}
+		C.push_back(V[N - 1] - a);
+		C.push_back(b - V[N - 1]);
+		return C;
+	};
+	std::vector<double> X = components();
+	std::vector<double> Y = components();
+	std::shuffle(Y.begin(), Y.end(), engine);
+	std::vector<std::pair<double, T::Point>> vectors(N);
+	for (int n = 0; n < N; n++) { vectors[n] = std::make_pair(std::atan2(Y[n], X[n]), T::Point(X[n], Y[n])); }
+	std::sort(vectors.begin(), vectors.end(), [](const auto& u, const auto& v) { return u.first < v.first; });
+	T::Polygon P(N);
+	T::Point p(0., 0.);
+	for (int n = 0; n < N; n++) {
+		P[n] = p;
+		p = T::Point(p.x + vectors[n].second.x, p.y + vectors[n].second.y);
+	}
+	return P;
+}
+
+T::Polygon generateIrregularStar(const int& N, std::mt19937& engine) {
+	/*
+	Generate a star-shaped polygon by ordering N random points by their angle around the mean of the points.
+	*/
+
+	std::uniform_real_distribution<double> uniform(0., 1.);
+	std::vector<std::pair<double, T::Point>> points(N);
+	double c_x = 0.;
+	double c_y = 0.;
+	for (auto& [theta, p] : points) {
+		p = T::Point(uniform(engine), uniform(engine));
+		c_x += p.x / N;
+		c_y += p.y / N;
+	}
+	for (auto& [theta, p] : points) { theta = std::atan2(p.y - c_y, p.x - c_x); }
+	std::sort(points.begin(), points.end(), [](const auto& u, const auto& v) { return u.first < v.first; });
+	T::Polygon P(N);
+	for (int n = 0; n < N; n++) { P[n] = points[n].second; }
+	return P;
+}
+
+std::mt19937 seedEngine(const std::optional<unsigned long>& seed, const unsigned long& k = 0) {
+	/*
+	Create the random engine used to generate a polygon. When a seed is given, the engine is keyed using both the seed
+	and the index k, such that every polygon is reproducible regardless of the order in which polygons are generated.
+	*/
+
+	if (!seed.has_value()) {
+		std::random_device rd;
+		return std::mt19937(rd());
+	}
+	std::seed_seq sequence{
+		static_cast<unsigned int>(seed.value()),
+		static_cast<unsigned int>(seed.value() >> 32),
+		static_cast<unsigned int>(k),
+		static_cast<unsigned int>(k >> 32),
+	};
+	return std::mt19937(sequence);
+}
+
+/*
+Convex hulls.
+*/
+
+std::vector<unsigned long> convexHull(const T::Polygon& P) {
+	/*
+	Andrew's monotone chain. Returns the indices of the vertices of the convex hull in counterclockwise order, omitting
+	colinear points. Coincident points are represented by their lowest index.
+	*/
+
+	std::vector<unsigned long> order(P.size());
+	std::iota(order.begin(), order.end(), 0);
+	std::sort(order.begin(), order.end(), [&P](const unsigned long& a, const unsigned long& b) {
+		if (P[a].x != P[b].x) { return P[a].x < P[b].x; }
+		if (P[a].y != P[b].y) { return P[a].y < P[b].y; }
+		return a < b;
+	});
+	order.erase(
+		std::unique(
+			order.begin(),
+			order.end(),
+			[&P](const unsigned long& a, const unsigned long& b) { return P[a].x == P[b].x && P[a].y == P[b].y; }
+		),
+		order.end()
+	);
+	if (order.size() < 3) { return order; }
+	// build the lower and then the upper hull
+	std::vector<unsigned long> H(2 * order.size());
+	unsigned long k = 0;
+	for (unsigned long n = 0; n < order.size(); n++) {
+		while (k >= 2 && orientation(P[H[k - 2]], P[H[k - 1]], P[order[n]]) <= 0) { k--; }
+		H[k++] = order[n];
+	}
+	for (unsigned long n = order.size() - 1, t = k + 1; n > 0; n--) {
+		while (k >= t && orientation(P[H[k - 2]], P[H[k - 1]], P[order[n - 1]]) <= 0) { k--; }
+		H[k++] = order[n - 1];
+	}
+	H.resize(k - 1);
+	return H;
+}
+
+std::pair<double, std::pair<int, int>> rotatingCalipers(const T::Polygon& P) {
+	/*
+	Find the largest vector between any two points using the rotating calipers method on their convex hull, in O(N log N).
+	Every antipodal pair of the hull is visited, and ties are broken in favour of the lowest indices (i, j), i < j, such
+	that the output matches that of an exhaustive pairwise search.
+	*/
+
+	std::vector<unsigned long> H = convexHull(P);
+	double best = 0.;
+	std::pair<int, int> out(0, 0);
+	auto update = [&P, &best, &out](const unsigned long& a, const unsigned long& b) {
+		const int i = static_cast<int>(std::min(a, b));
+		const int j = static_cast<int>(std::max(a, b));
+		const double d = std::hypot(P[j].x - P[i].x, P[j].y - P[i].y);
+		if (d > best || (d == best && d > 0. && std::make_pair(i, j) < out)) {
+			best = d;
+			out = {i, j};
+		}
+	};
+	if (H.size() == 2) { update(H[0], H[1]); }
+	if (H.size() < 3) { return {best, out}; }
+	// the area of the triangle formed by the hull edge (a, a + 1) and the hull vertex b
+	const unsigned long M = H.size();
+	auto area = [&P, &H, &M](const unsigned long& a, const unsigned long& b) {
+		const T::Point& p = P[H[a]];
+		const T::Point& q = P[H[(a + 1) % M]];
+		const T::Point& r = P[H[b]];
+		return (q.x - p.x) * (r.y - p.y) - (q.y - p.y) * (r.x - p.x);
+	};
+	unsigned long j = 1;
+	for (unsigned long i = 0; i < M; i++) {
+		while (area(i, (j + 1) % M) > area(i, j)) { j = (j + 1) % M; }
+		update(H[i], H[j]);
+		update(H[(i + 1) % M], H[j]);
+		// parallel edges produce a second antipodal vertex
+		if (area(i, (j + 1) % M) == area(i, j)) {
+			update(H[i], H[(j + 1) % M]);
+			update(H[(i + 1) % M], H[(j + 1) % M]);
+		}
+	}
+	return {best, out};
+}
+
+/*
+Persistent types.
+*/
+
+class _Polygon {
+	/*
+	A native polygon, which owns a converted copy of its vertices for the lifetime of a python Polygon. Derived quantities
+	are calculated lazily and cached, and are either updated or invalidated whenever the polygon is transformed.
+	*/
+
+  public:
+	_Polygon(const _Vertices& V) : P(convertVectorToPolygon(V)) {}
+
+	py::array_t<bool> arePointsInside(
+		const py::array_t<double, py::array::c_style | py::array::forcecast>& points
+	) {
+		const bool is_convex = convex();
+		auto p = points.unchecked<2>();
+		py::array_t<bool> out(p.shape(0));
+		auto o = out.mutable_unchecked<1>();
+		for (py::ssize_t n = 0; n < p.shape(0); n++) {
+			T::Point q(p(n, 0), p(n, 1));
+			o(n) = is_convex ? g::isPointInsideConvexPolygon(q, P) : g::isPointInsidePolygon(q, P);
+		}
+		return out;
+	}
+
+	double area() {
+		if (!_area) { _area = g::polygonArea(P); }
+		return *_area;
+	}
+
+	_Point centroid() {
+		if (!_centroid) {
+			T::Point c = g::polygonCentroid(P);
+			_centroid = _Point({c.x, c.y});
+		}
+		return *_centroid;
+	}
+
+	bool convex() {
+		if (!_convex) { _convex = g::isConvex(P); }
+		return *_convex;
+	}
+
+	bool isPointInside(const _Point& p) {
+		T::Point q(p[0], p[1]);
+		return convex() ? g::isPointInsideConvexPolygon(q, P) : g::isPointInsidePolygon(q, P);
+	}
+
+	void scaleByArea(const double& a) {
+		// scaling preserves convexity and simplicity
+		P = g::scalePolygonByArea(P, a);
+		_area = std::nullopt;
+		_centroid = std::nullopt;
+	}
+
+	bool simple() {
+		if (!_simple) { _simple = findIntersections(P, true).empty(); }
+		return *_simple;
+	}
+
+	void translate(const _Point& d) {
+		// translation preserves every cached quantity except the centroid, which is shifted accordingly
+		for (T::Point& p : P) {
+			p.x += d[0];
+			p.y += d[1];
+		}
+		if (_centroid) { _centroid = _Point({(*_centroid)[0] + d[0], (*_centroid)[1] + d[1]}); }
+	}
+
+	_Vertices vertices() const { return convertPolygonToVector(P); }
+
+  private:
+	T::Polygon P;
+	std::optional<double> _area;
+	std::optional<_Point> _centroid;
+	std::optional<bool> _convex;
+	std::optional<bool> _simple;
+};
+
 /*
 PyBind11 exports.
 */
 
-_Vertices _generateIrregularStar(const int& N) {
-	return convertPolygonToVector(g::generateIrregularStar(N));
+py::array_t<bool> _arePointsInsideConvexPolygon(
+	const py::array_t<double, py::array::c_style | py::array::forcecast>& P,
+	const _Vertices& V
+) {
+	// convert the polygon once and test every point against it
+	T::Polygon polygon = convertVectorToPolygon(V);
+	auto p = P.unchecked<2>();
+	py::array_t<bool> out(p.shape(0));
+	auto o = out.mutable_unchecked<1>();
+	for (py::ssize_t n = 0; n < p.shape(0); n++) {
+		o(n) = g::isPointInsideConvexPolygon(T::Point(p(n, 0), p(n, 1)), polygon);
+	}
+	return out;
+}
+
+py::array_t<bool> _arePointsInsidePolygon(
+	const py::array_t<double, py::array::c_style | py::array::forcecast>& P,
+	const _Vertices& V
+) {
+	// convert the polygon once and test every point against it
+	T::Polygon polygon = convertVectorToPolygon(V);
+	auto p = P.unchecked<2>();
+	py::array_t<bool> out(p.shape(0));
+	auto o = out.mutable_unchecked<1>();
+	for (py::ssize_t n = 0; n < p.shape(0); n++) {
+		o(n) = g::isPointInsidePolygon(T::Point(p(n, 0), p(n, 1)), polygon);
+	}
+	return out;
+}
+
+void _drawEllipse(const _Point& centroid, const _Point& radii, py::array_t<std::int8_t>& out) {
+	fillMask(out, ellipseCrossings(centroid, radii));
+}
+
+void _drawEllipseCoverage(
+	const _Point& centroid,
+	const _Point& radii,
+	const long& supersample,
+	py::array_t<double>& out
+) {
+	fillCoverage(out, supersample, ellipseCrossings(centroid, radii));
+}
+
+void _drawPolygon(const _Vertices& V, py::array_t<std::int8_t>& out) { fillMask(out, polygonCrossings(V)); }
+
+void _drawPolygonCoverage(const _Vertices& V, const long& supersample, py::array_t<double>& out) {
+	fillCoverage(out, supersample, polygonCrossings(V));
 }
 
-_Vertices _generateConvexPolygon(const int& N) {
-	return convertPolygonToVector(g::generateConvexPolygon(N));
+std::vector<std::pair<unsigned long, unsigned long>> _findIntersections(const _Vertices& V) {
+	return findIntersections(convertVectorToPolygon(V));
 }
 
-_Vertices _generatePolygon(const int& N) { return convertPolygonToVector(g::generatePolygon(N)); }
+_Vertices _generateIrregularStar(const int& N, const std::optional<unsigned long>& seed) {
+	std::mt19937 engine = seedEngine(seed);
+	return convertPolygonToVector(generateIrregularStar(N, engine));
+}
+
+_Vertices _generateConvexPolygon(const int& N, const std::optional<unsigned long>& seed) {
+	std::mt19937 engine = seedEngine(seed);
+	return convertPolygonToVector(generateConvexPolygon(N, engine));
+}
+
+_Vertices _generatePolygon(const int& N, const std::optional<unsigned long>& seed) {
+	std::mt19937 engine = seedEngine(seed);
+	return convertPolygonToVector(generateTravellingSalesmanPolygon(N, engine));
+}
+
+std::pair<py::array_t<double>, py::array_t<std::int64_t>> _generatePolygons(
+	const std::string& method,
+	const unsigned long& K,
+	const int& N,
+	const int& max_vertices,
+	const std::optional<unsigned long>& seed,
+	const unsigned long& start
+) {
+	/*
+	Generate and normalise K random polygons in parallel. The polygons are returned as a zero padded array with the shape
+	(K, N_max, 2), alongside the number of vertices of each polygon. Each polygon uses its own engine, keyed using the
+	seed and its index start + k, such that the output is independent of the amount of threads.
+	*/
+
+	if (method != "convex" && method != "irregular_star" && method != "travelling_salesman") {
+		throw std::invalid_argument("Unknown polygon generation method: " + method);
+	}
+	std::random_device rd;
+	const unsigned long key = seed.has_value() ? seed.value() : (static_cast<unsigned long>(rd()) << 32) | rd();
+	// generate the polygons without holding the GIL
+	std::vector<T::Polygon> polygons(K);
+	{
+		py::gil_scoped_release release;
+		unsigned long threads = std::max(1u, std::thread::hardware_concurrency());
+		threads = std::min(threads, std::max(K, 1ul));
+		std::vector<std::thread> workers;
+		for (unsigned long t = 0; t < threads; t++) {
+			workers.emplace_back([&, t]() {
+				std::uniform_int_distribution<int> distribution(3, std::max(max_vertices, 3));
+				for (unsigned long k = t; k < K; k += threads) {
+					std::mt19937 engine = seedEngine(key, start + k);
+					const int n = N < 3 ? distribution(engine) : N;
+					if (method == "convex") {
+						polygons[k] = g::normaliseConvexPolygon(generateConvexPolygon(n, engine), true);
+					} else {
+						T::Polygon P = method == "irregular_star" ? generateIrregularStar(n, engine)
+																  : generateTravellingSalesmanPolygon(n, engine);
+						polygons[k] = g::isConvex(P) ? g::normaliseConvexPolygon(P, true)
+													 : g::normaliseSimplePolygon(P, true);
+					}
+				}
+			});
+		}
+		for (std::thread& worker : workers) { worker.join(); }
+	}
+	// copy the polygons into structure of arrays storage
+	unsigned long N_max = 0;
+	for (const T::Polygon& P : polygons) { N_max = std::max(N_max, static_cast<unsigned long>(P.size())); }
+	py::array_t<double> vertices({K, N_max, 2ul});
+	py::array_t<std::int64_t> sizes(K);
+	auto v = vertices.mutable_unchecked<3>();
+	auto s = sizes.mutable_unchecked<1>();
+	for (unsigned long k = 0; k < K; k++) {
+		s(k) = static_cast<std::int64_t>(polygons[k].size());
+		for (unsigned long n = 0; n < N_max; n++) {
+			v(k, n, 0) = n < polygons[k].size() ? polygons[k][n].x : 0.;
+			v(k, n, 1) = n < polygons[k].size() ? polygons[k][n].y : 0.;
+		}
+	}
+	return std::make_pair(vertices, sizes);
+}
 
 _Vertices _generateUnitRectangle(const double& epsilon) {
 	return convertPolygonToVector(g::generateUnitRectangle(epsilon));
@@ -81,9 +686,13 @@ bool _isPointInsidePolygon(const _Point& p, const _Vertices& V) {
 	return g::isPointInsidePolygon(T::Point(p[0], p[1]), convertVectorToPolygon(V));
 }
 
-bool _isSimple(const _Vertices& V) { return g::isSimple(convertVectorToPolygon(V)); }
+bool _isSimple(const _Vertices& V) { return findIntersections(convertVectorToPolygon(V), true).empty(); }
 
 std::pair<double, std::pair<int, int>> _largestVector(const _Vertices& V) {
+	return rotatingCalipers(convertVectorToPolygon(V));
+}
+
+std::pair<double, std::pair<int, int>> _largestVectorPairwise(const _Vertices& V) {
 	return g::largestVector(convertVectorToPolygon(V));
 }
 
@@ -95,6 +704,64 @@ std::pair<std::string, _Point> _lineIntersection(_Line& A, _Line& B) {
 	return std::make_pair(out.first, _Point({out.second.x, out.second.y}));
 }
 
+std::pair<py::array_t<std::int8_t>, py::array_t<double>> _lineIntersections(
+	const py::array_t<double, py::array::c_style | py::array::forcecast>& A,
+	const py::array_t<double, py::array::c_style | py::array::forcecast>& B
+) {
+	// classify each pair of line segments (A[n], B[n])
+	auto a = A.unchecked<3>();
+	auto b = B.unchecked<3>();
+	if (a.shape(0) != b.shape(0)) { throw std::invalid_argument("A and B must contain the same number of lines."); }
+	py::array_t<std::int8_t> type(a.shape(0));
+	py::array_t<double> point({a.shape(0), py::ssize_t(2)});
+	auto t = type.mutable_unchecked<1>();
+	auto p = point.mutable_unchecked<2>();
+	{
+		py::gil_scoped_release release;
+		for (py::ssize_t n = 0; n < a.shape(0); n++) {
+			std::pair<std::string, T::Point> out = g::lineIntersection(
+				T::Line(T::Point(a(n, 0, 0), a(n, 0, 1)), T::Point(a(n, 1, 0), a(n, 1, 1))),
+				T::Line(T::Point(b(n, 0, 0), b(n, 0, 1)), T::Point(b(n, 1, 0), b(n, 1, 1)))
+			);
+			t(n) = encodeLineIntersection(out.first);
+			p(n, 0) = out.second.x;
+			p(n, 1) = out.second.y;
+		}
+	}
+	return std::make_pair(type, point);
+}
+
+std::pair<py::array_t<std::int8_t>, py::array_t<double>> _lineIntersectionsAllPairs(
+	const py::array_t<double, py::array::c_style | py::array::forcecast>& A
+) {
+	// classify each pair of line segments (A[i], A[j]), i < j, in the order of np.triu_indices(n, 1)
+	auto a = A.unchecked<3>();
+	const py::ssize_t N = a.shape(0);
+	const py::ssize_t K = N * (N - 1) / 2;
+	py::array_t<std::int8_t> type(K);
+	py::array_t<double> point({K, py::ssize_t(2)});
+	auto t = type.mutable_unchecked<1>();
+	auto p = point.mutable_unchecked<2>();
+	{
+		py::gil_scoped_release release;
+		std::vector<T::Line> L;
+		L.reserve(N);
+		for (py::ssize_t n = 0; n < N; n++) {
+			L.push_back(T::Line(T::Point(a(n, 0, 0), a(n, 0, 1)), T::Point(a(n, 1, 0), a(n, 1, 1))));
+		}
+		py::ssize_t k = 0;
+		for (py::ssize_t i = 0; i < N; i++) {
+			for (py::ssize_t j = i + 1; j < N; j++, k++) {
+				std::pair<std::string, T::Point> out = g::lineIntersection(L[i], L[j]);
+				t(k) = encodeLineIntersection(out.first);
+				p(k, 0) = out.second.x;
+				p(k, 1) = out.second.y;
+			}
+		}
+	}
+	return std::make_pair(type, point);
+}
+
 _Vertices _normaliseConvexPolygon(const _Vertices& V, const bool& signed_norm) {
 	return convertPolygonToVector(
 		g::normaliseConvexPolygon(convertVectorToPolygon(V), signed_norm)
@@ -122,15 +789,116 @@ _Vertices _scalePolygonByArea(const _Vertices& V, const double& a) {
 	return convertPolygonToVector(g::scalePolygonByArea(convertVectorToPolygon(V), a));
 }
 
+std::vector<_Triangle> _triangulatePolygon(const _Vertices& V) {
+	/*
+	Triangulate a simple polygon using ear clipping. The output is a list of N - 2 triangles, each defined by the indices
+	of its vertices.
+	*/
+
+	// determine the orientation of the polygon
+	double orientation = 0.;
+	for (unsigned long n = 0; n < V.size(); n++) {
+		const _Point& a = V[n];
+		const _Point& b = V[(n + 1) % V.size()];
+		orientation += a[0] * b[1] - b[0] * a[1];
+	}
+	orientation = orientation < 0. ? -1. : 1.;
+	auto cross = [&V](unsigned long a, unsigned long b, unsigned long c) {
+		return (V[b][0] - V[a][0]) * (V[c][1] - V[a][1]) - (V[b][1] - V[a][1]) * (V[c][0] - V[a][0]);
+	};
+	// clip ears until a single triangle remains
+	std::vector<unsigned long> remaining(V.size());
+	for (unsigned long n = 0; n < V.size(); n++) { remaining[n] = n; }
+	std::vector<_Triangle> out;
+	while (remaining.size() > 3) {
+		unsigned long R = remaining.size();
+		bool clipped = false;
+		for (unsigned long n = 0; n < R; n++) {
+			unsigned long a = remaining[(n + R - 1) % R];
+			unsigned long b = remaining[n];
+			unsigned long c = remaining[(n + 1) % R];
+			// an ear must be a convex vertex...
+			if (orientation * cross(a, b, c) <= 0.) { continue; }
+			// ...whose triangle contains no other vertex
+			bool is_ear = true;
+			for (unsigned long m = 0; m < R; m++) {
+				unsigned long p = remaining[m];
+				if (p == a || p == b || p == c) { continue; }
+				if (
+					orientation * cross(a, b, p) >= 0. && orientation * cross(b, c, p) >= 0.
+					&& orientation * cross(c, a, p) >= 0.
+				) {
+					is_ear = false;
+					break;
+				}
+			}
+			if (is_ear) {
+				out.push_back({{a, b, c}});
+				remaining.erase(remaining.begin() + n);
+				clipped = true;
+				break;
+			}
+		}
+		// degenerate polygons may have no strict ears, in which case the next vertex is clipped regardless
+		if (!clipped) {
+			out.push_back({{remaining[R - 1], remaining[0], remaining[1]}});
+			remaining.erase(remaining.begin());
+		}
+	}
+	out.push_back({{remaining[0], remaining[1], remaining[2]}});
+	return out;
+}
+
 /*
 PyBind11 config.
 */
 
 PYBIND11_MODULE(_geometry, m) {
 	m.doc() = "_geometry";
-	m.def("_generateIrregularStar", &_generateIrregularStar);
-	m.def("_generatePolygon", &_generatePolygon);
-	m.def("_generateConvexPolygon", &_generateConvexPolygon);
+	py::class_<_Polygon>(m, "_Polygon")
+		.def(py::init<const _Vertices&>())
+		.def("arePointsInside", &_Polygon::arePointsInside)
+		.def("area", &_Polygon::area)
+		.def("centroid", &_Polygon::centroid)
+		.def("convex", &_Polygon::convex)
+		.def("isPointInside", &_Polygon::isPointInside)
+		.def("scaleByArea", &_Polygon::scaleByArea)
+		.def("simple", &_Polygon::simple)
+		.def("translate", &_Polygon::translate)
+		.def("vertices", &_Polygon::vertices)
+		.def(py::pickle(
+			[](const _Polygon& P) { return P.vertices(); },
+			[](const _Vertices& V) { return _Polygon(V); }
+		));
+	m.def("_arePointsInsideConvexPolygon", &_arePointsInsideConvexPolygon);
+	m.def("_arePointsInsidePolygon", &_arePointsInsidePolygon);
+	m.def("_drawEllipse", &_drawEllipse, py::arg("centroid"), py::arg("radii"), py::arg("out").noconvert());
+	m.def(
+		"_drawEllipseCoverage",
+		&_drawEllipseCoverage,
+		py::arg("centroid"),
+		py::arg("radii"),
+		py::arg("supersample"),
+		py::arg("out").noconvert()
+	);
+	m.def("_drawPolygon", &_drawPolygon, py::arg("V"), py::arg("out").noconvert());
+	m.def(
+		"_drawPolygonCoverage", &_drawPolygonCoverage, py::arg("V"), py::arg("supersample"), py::arg("out").noconvert()
+	);
+	m.def("_findIntersections", &_findIntersections);
+	m.def("_generateIrregularStar", &_generateIrregularStar, py::arg("N"), py::arg("seed") = py::none());
+	m.def("_generatePolygon", &_generatePolygon, py::arg("N"), py::arg("seed") = py::none());
+	m.def(
+		"_generatePolygons",
+		&_generatePolygons,
+		py::arg("method"),
+		py::arg("K"),
+		py::arg("N"),
+		py::arg("max_vertices"),
+		py::arg("seed") = py::none(),
+		py::arg("start") = 0
+	);
+	m.def("_generateConvexPolygon", &_generateConvexPolygon, py::arg("N"), py::arg("seed") = py::none());
 	m.def("_generateUnitRectangle", &_generateUnitRectangle);
 	// m.def("_generateUnitTriangle", &_generateUnitTriangle);
 	m.def("_isColinear", &_isColinear);
@@ -139,11 +907,15 @@ PYBIND11_MODULE(_geometry, m) {
 	m.def("_isPointInsidePolygon", &_isPointInsidePolygon);
 	m.def("_isSimple", &_isSimple);
 	m.def("_largestVector", &_largestVector);
+	m.def("_largestVectorPairwise", &_largestVectorPairwise);
 	m.def("_lineIntersection", &_lineIntersection);
+	m.def("_lineIntersections", &_lineIntersections);
+	m.def("_lineIntersectionsAllPairs", &_lineIntersectionsAllPairs);
 	m.def("_normaliseConvexPolygon", &_normaliseConvexPolygon);
 	m.def("_normalisePolygon", &_normalisePolygon);
 	m.def("_normaliseSimplePolygon", &_normaliseSimplePolygon);
 	m.def("_polygonArea", &_polygonArea);
 	m.def("_polygonCentroid", &_polygonCentroid);
 	m.def("_scalePolygonByArea", &_scalePolygonByArea);
+	m.def("_triangulatePolygon", &_triangulatePolygon);
 }
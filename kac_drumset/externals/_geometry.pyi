@@ -10,9 +10,33 @@ Line: TypeAlias = list[Point] | npt.NDArray[np.float64]
 Vertices: TypeAlias = list[list[float]] | npt.NDArray[np.float64]
 
 
-def _generateIrregularStar(N: int) -> Vertices: ...
-def _generateConvexPolygon(N: int) -> Vertices: ...
-def _generatePolygon(N: int) -> Vertices: ...
+class _Polygon:
+	def __init__(self, V: Vertices) -> None: ...
+	def arePointsInside(self, P: npt.NDArray[np.float64]) -> npt.NDArray[np.bool_]: ...
+	def area(self) -> float: ...
+	def centroid(self) -> Point: ...
+	def convex(self) -> bool: ...
+	def isPointInside(self, p: Point) -> bool: ...
+	def scaleByArea(self, a: float) -> None: ...
+	def simple(self) -> bool: ...
+	def translate(self, d: Point) -> None: ...
+	def vertices(self) -> Vertices: ...
+
+
+def _arePointsInsideConvexPolygon(P: npt.NDArray[np.float64], V: Vertices) -> npt.NDArray[np.bool_]: ...
+def _arePointsInsidePolygon(P: npt.NDArray[np.float64], V: Vertices) -> npt.NDArray[np.bool_]: ...
+def _drawEllipse(centroid: Point, radii: Point, out: npt.NDArray[np.int8]) -> None: ...
+def _drawEllipseCoverage(centroid: Point, radii: Point, supersample: int, out: npt.NDArray[np.float64]) -> None: ...
+def _drawPolygon(V: Vertices, out: npt.NDArray[np.int8]) -> None: ...
+def _drawPolygonCoverage(V: Vertices, supersample: int, out: npt.NDArray[np.float64]) -> None: ...
+def _findIntersections(V: Vertices) -> list[tuple[int, int]]: ...
+def _generateIrregularStar(N: int, seed: int | None = None) -> Vertices: ...
+def _generateConvexPolygon(N: int, seed: int | None = None) -> Vertices: ...
+def _generatePolygon(N: int, seed: int | None = None) -> Vertices: ...
+def _generatePolygons(method: str, K: int, N: int, max_vertices: int, seed: int | None = None, start: int = 0) -> tuple[
+	npt.NDArray[np.float64],
+	npt.NDArray[np.int64],
+]: ...
 def _generateUnitRectangle(epsilon: float) -> Vertices: ...
 # def _generateUnitTriangle(r: float, theta: float) -> Vertices: ...
 def _isColinear(V: Vertices) -> bool: ...
@@ -21,13 +45,23 @@ def _isPointInsideConvexPolygon(p: Point, V: Vertices) -> bool: ...
 def _isPointInsidePolygon(p: Point, V: Vertices) -> bool: ...
 def _isSimple(V: Vertices) -> bool: ...
 def _largestVector(V: Vertices) -> tuple[float, tuple[int, int]]: ...
+def _largestVectorPairwise(V: Vertices) -> tuple[float, tuple[int, int]]: ...
 def _lineIntersection(A: Line, B: Line) -> tuple[
 	Literal['adjacent', 'colinear', 'intersect', 'none', 'vertex'],
 	Point,
 ]: ...
+def _lineIntersections(A: npt.NDArray[np.float64], B: npt.NDArray[np.float64]) -> tuple[
+	npt.NDArray[np.int8],
+	npt.NDArray[np.float64],
+]: ...
+def _lineIntersectionsAllPairs(A: npt.NDArray[np.float64]) -> tuple[
+	npt.NDArray[np.int8],
+	npt.NDArray[np.float64],
+]: ...
 def _normaliseConvexPolygon(V: Vertices, signed_norm: bool) -> Vertices: ...
 def _normalisePolygon(V: Vertices, signed_norm: bool) -> Vertices: ...
 def _normaliseSimplePolygon(V: Vertices, signed_norm: bool) -> Vertices: ...
 def _polygonArea(V: Vertices) -> float: ...
 def _polygonCentroid(V: Vertices) -> Point: ...
 def _scalePolygonByArea(V: Vertices, a: float) -> Vertices: ...
+def _triangulatePolygon(V: Vertices) -> list[tuple[int, int, int]]: ...
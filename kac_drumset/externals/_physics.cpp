@@ -2,8 +2,17 @@
 Generate python bindings for functions in `/kac_core/physics`.
 */
 
+// core
+#include <algorithm>
+#include <array>
+#include <cstdint>
+#include <stdexcept>
+#include <thread>
+#include <vector>
+
 // dependencies
 #include <kac_core.hpp>
+#include <pybind11/numpy.h>		  // numpy arrays
 #include <pybind11/pybind11.h>	  // python bindings
 #include <pybind11/stl.h>		  // type conversion
 
@@ -11,9 +20,237 @@ namespace py = pybind11;
 namespace p = kac_core::physics;
 namespace T = kac_core::types;
 
+/*
+Compact matrices.
+*/
+
+T::Matrix_2D expandCompactMatrix(
+	const T::Matrix_2D& window,
+	const std::array<long, 2>& offset,
+	const unsigned long& X,
+	const unsigned long& Y
+) {
+	/*
+	Expand a compact matrix, stored as a dense window alongside the index of its first element, into a zero matrix with
+	the size (X, Y). Any part of the window which lies outside of the matrix is discarded.
+	*/
+
+	T::Matrix_2D out(X, T::Matrix_1D(Y, 0.));
+	for (unsigned long i = 0; i < window.size(); i++) {
+		const long x = offset[0] + static_cast<long>(i);
+		if (x < 0 || x >= static_cast<long>(X)) { continue; }
+		for (unsigned long j = 0; j < window[i].size(); j++) {
+			const long y = offset[1] + static_cast<long>(j);
+			if (y >= 0 && y < static_cast<long>(Y)) { out[x][y] = window[i][j]; }
+		}
+	}
+	return out;
+}
+
+/*
+Persistent types.
+*/
+
+class _FDTDWorkspace {
+	/*
+	A workspace used to simulate a 2 dimensional FDTD scheme, which owns the grids, boundary conditions and waveforms of
+	every simulation. Each buffer is allocated once, for a maximum grid size (X, Y), a waveform length T and K lanes, such
+	that the workspace can be reused for any amount of drums and strikes without allocating memory. Each lane owns a
+	pair of grids, and the lanes of a batch are simulated in parallel.
+	*/
+
+  public:
+	_FDTDWorkspace(const unsigned long& X, const unsigned long& Y, const unsigned long& T, const unsigned long& K)
+		: X_max(X),
+		  Y_max(Y),
+		  T(T),
+		  K(std::max(K, 1ul)),
+		  B(X * Y, 0),
+		  U(2 * std::max(K, 1ul) * X * Y, 0.),
+		  waveforms({std::max(K, 1ul), T}) {}
+
+	std::array<unsigned long, 2> gridSize() const { return {X, Y}; }
+
+	py::array_t<double> render(
+		const py::array_t<double, py::array::c_style | py::array::forcecast>& u_0,
+		const std::array<long, 2>& u_0_offset,
+		const py::array_t<double, py::array::c_style | py::array::forcecast>& U_1,
+		const py::array_t<long, py::array::c_style | py::array::forcecast>& U_1_offsets,
+		const double& c_0,
+		const double& c_1,
+		const double& c_2,
+		const std::array<unsigned long, 2>& w,
+		const double& c_3
+	) {
+		/*
+		Simulate one waveform per compact initial condition u_1 ∈ U_1, with the shape (K, W_x, W_y), for the current
+		boundary conditions. The waveforms are written to the workspace, which is returned with the shape (K, T). When c_3
+		is nonzero, the diagonal neighbours of each cell are included, such that the scheme uses a compact 9-point stencil.
+		*/
+
+		if (U_1.ndim() != 3 || U_1_offsets.ndim() != 2 || U_1_offsets.shape(0) != U_1.shape(0)) {
+			throw std::invalid_argument("U_1 and its offsets must have the shapes (K, W_x, W_y) and (K, 2).");
+		}
+		const unsigned long N = static_cast<unsigned long>(U_1.shape(0));
+		if (N > K) { throw std::invalid_argument("The workspace does not have enough lanes for this batch."); }
+		if (u_0.ndim() != 2) { throw std::invalid_argument("u_0 must be a two dimensional window."); }
+		if (w[0] >= X || w[1] >= Y) { throw std::invalid_argument("The sample point w lies outside of the grid."); }
+		// the arrays are read without the GIL
+		const Window u_0_window = {
+			u_0.data(),
+			static_cast<unsigned long>(u_0.shape(0)),
+			static_cast<unsigned long>(u_0.shape(1)),
+			u_0_offset[0],
+			u_0_offset[1],
+		};
+		const double* U_1_data = U_1.data();
+		const long* U_1_offsets_data = U_1_offsets.data();
+		const unsigned long W_x = static_cast<unsigned long>(U_1.shape(1));
+		const unsigned long W_y = static_cast<unsigned long>(U_1.shape(2));
+		double* out = waveforms.mutable_data();
+		{
+			py::gil_scoped_release release;
+			auto lane = [&](const unsigned long& k) {
+				simulate(
+					k,
+					u_0_window,
+					{U_1_data + k * W_x * W_y, W_x, W_y, U_1_offsets_data[2 * k], U_1_offsets_data[2 * k + 1]},
+					c_0,
+					c_1,
+					c_2,
+					c_3,
+					w[0] * Y + w[1],
+					out + k * T
+				);
+			};
+			unsigned long threads = std::max(1u, std::thread::hardware_concurrency());
+			threads = std::min(threads, std::max(N, 1ul));
+			if (threads == 1) {
+				for (unsigned long k = 0; k < N; k++) { lane(k); }
+			} else {
+				std::vector<std::thread> workers;
+				workers.reserve(threads);
+				for (unsigned long t = 0; t < threads; t++) {
+					workers.emplace_back([&, t]() {
+						for (unsigned long k = t; k < N; k += threads) { lane(k); }
+					});
+				}
+				for (std::thread& worker : workers) { worker.join(); }
+			}
+		}
+		return waveforms;
+	}
+
+	void setBoundary(const py::array_t<std::int8_t, py::array::c_style | py::array::forcecast>& mask) {
+		/*
+		Copy the boundary conditions of a drum into the workspace, and calculate the range of the grid which is updated.
+		*/
+
+		if (mask.ndim() != 2) { throw std::invalid_argument("The boundary conditions must be two dimensional."); }
+		auto M = mask.unchecked<2>();
+		if (static_cast<unsigned long>(M.shape(0)) > X_max || static_cast<unsigned long>(M.shape(1)) > Y_max) {
+			throw std::invalid_argument("The boundary conditions are larger than the workspace.");
+		}
+		X = static_cast<unsigned long>(M.shape(0));
+		Y = static_cast<unsigned long>(M.shape(1));
+		x_range = {X, 0};
+		y_range = {Y, 0};
+		// the outermost cells are always fixed, such that every updated cell has four neighbours
+		for (unsigned long x = 0; x < X; x++) {
+			for (unsigned long y = 0; y < Y; y++) {
+				const bool inside = x > 0 && y > 0 && x + 1 < X && y + 1 < Y && M(x, y) != 0;
+				B[x * Y + y] = inside ? 1 : 0;
+				if (inside) {
+					x_range = {std::min(x_range[0], x), std::max(x_range[1], x)};
+					y_range = {std::min(y_range[0], y), std::max(y_range[1], y)};
+				}
+			}
+		}
+	}
+
+  private:
+	unsigned long X_max;
+	unsigned long Y_max;
+	unsigned long T;
+	unsigned long K;
+	unsigned long X = 0;
+	unsigned long Y = 0;
+	std::array<unsigned long, 2> x_range = {1, 0};
+	std::array<unsigned long, 2> y_range = {1, 0};
+	std::vector<std::int8_t> B;
+	std::vector<double> U;
+	py::array_t<double> waveforms;
+
+	struct Window {
+		// a compact matrix, stored as a pointer to a dense window alongside the index of its first element
+		const double* data;
+		unsigned long W_x;
+		unsigned long W_y;
+		long o_x;
+		long o_y;
+	};
+
+	void scatter(double* u, const Window& window) const {
+		// write a compact matrix into a grid masked by the boundary conditions, discarding any part of the window which lies
+		// outside of the grid or the drum, such that every cell which is never updated remains zero
+		for (unsigned long i = 0; i < window.W_x; i++) {
+			const long x = window.o_x + static_cast<long>(i);
+			if (x < 0 || x >= static_cast<long>(X)) { continue; }
+			for (unsigned long j = 0; j < window.W_y; j++) {
+				const long y = window.o_y + static_cast<long>(j);
+				if (y < 0 || y >= static_cast<long>(Y)) { continue; }
+				const unsigned long n = static_cast<unsigned long>(x) * Y + static_cast<unsigned long>(y);
+				u[n] = B[n] ? window.data[i * window.W_y + j] : 0.;
+			}
+		}
+	}
+
+	void simulate(
+		const unsigned long& k,
+		const Window& u_0,
+		const Window& u_1,
+		const double& c_0,
+		const double& c_1,
+		const double& c_2,
+		const double& c_3,
+		const unsigned long& i_w,
+		double* waveform
+	) {
+		// initialise the grids of the kth lane
+		double* a = U.data() + 2 * k * X_max * Y_max;
+		double* b = a + X_max * Y_max;
+		std::fill(a, a + X * Y, 0.);
+		std::fill(b, b + X * Y, 0.);
+		scatter(a, u_0);
+		scatter(b, u_1);
+		// u_n+1 is written in place of u_n-1, which is only read at the same index
+		for (unsigned long t = 0; t < T; t++) {
+			for (unsigned long x = x_range[0]; x <= x_range[1]; x++) {
+				for (unsigned long y = y_range[0]; y <= y_range[1]; y++) {
+					const unsigned long i = x * Y + y;
+					if (!B[i]) {
+						a[i] = 0.;
+						continue;
+					}
+					a[i] = c_0 * (b[i + Y] + b[i - Y] + b[i + 1] + b[i - 1]) + c_1 * b[i] - c_2 * a[i];
+					if (c_3 != 0.) { a[i] += c_3 * (b[i + Y + 1] + b[i + Y - 1] + b[i - Y + 1] + b[i - Y - 1]); }
+				}
+			}
+			waveform[t] = a[i_w];
+			std::swap(a, b);
+		}
+	}
+};
+
+/*
+PyBind11 exports.
+*/
+
 T::Matrix_1D _FDTDWaveform2D(
-	T::Matrix_2D u_0,
-	T::Matrix_2D u_1,
+	const T::Matrix_2D& u_0,
+	const std::array<long, 2>& u_0_offset,
+	const T::Matrix_2D& u_1,
+	const std::array<long, 2>& u_1_offset,
 	const T::BooleanImage& B,
 	const double& c_0,
 	const double& c_1,
@@ -21,7 +258,70 @@ T::Matrix_1D _FDTDWaveform2D(
 	const unsigned long& T,
 	const std::array<double, 2>& w
 ) {
-	return p::FDTDWaveform2D(u_0, u_1, B, c_0, c_1, c_2, T, T::Point(w[0], w[1]));
+	/*
+	Generate a waveform from compact initial conditions, which are expanded to the size of the boundary conditions.
+	*/
+
+	const unsigned long X = B.size();
+	const unsigned long Y = X > 0 ? B[0].size() : 0;
+	return p::FDTDWaveform2D(
+		expandCompactMatrix(u_0, u_0_offset, X, Y),
+		expandCompactMatrix(u_1, u_1_offset, X, Y),
+		B,
+		c_0,
+		c_1,
+		c_2,
+		T,
+		T::Point(w[0], w[1])
+	);
+}
+
+std::vector<T::Matrix_1D> _FDTDWaveforms2D(
+	const T::Matrix_2D& u_0,
+	const std::array<long, 2>& u_0_offset,
+	const std::vector<T::Matrix_2D>& U_1,
+	const std::vector<std::array<long, 2>>& U_1_offsets,
+	const T::BooleanImage& B,
+	const double& c_0,
+	const double& c_1,
+	const double& c_2,
+	const unsigned long& T,
+	const std::array<double, 2>& w
+) {
+	/*
+	Generate one waveform per compact initial condition u_1 ∈ U_1 for the same drum. The waveforms are simulated in
+	parallel, without holding the GIL.
+	*/
+
+	const unsigned long K = U_1.size();
+	const unsigned long X = B.size();
+	const unsigned long Y = X > 0 ? B[0].size() : 0;
+	std::vector<T::Matrix_1D> waveforms(K);
+	{
+		py::gil_scoped_release release;
+		const T::Matrix_2D u_0_expanded = expandCompactMatrix(u_0, u_0_offset, X, Y);
+		unsigned long threads = std::max(1u, std::thread::hardware_concurrency());
+		threads = std::min(threads, std::max(K, 1ul));
+		std::vector<std::thread> workers;
+		for (unsigned long t = 0; t < threads; t++) {
+			workers.emplace_back([&, t]() {
+				for (unsigned long k = t; k < K; k += threads) {
+					waveforms[k] = p::FDTDWaveform2D(
+						u_0_expanded,
+						expandCompactMatrix(U_1[k], U_1_offsets[k], X, Y),
+						B,
+						c_0,
+						c_1,
+						c_2,
+						T,
+						T::Point(w[0], w[1])
+					);
+				}
+			});
+		}
+		for (std::thread& worker : workers) { worker.join(); }
+	}
+	return waveforms;
 }
 
 T::Matrix_2D _raisedCosine2D(
@@ -45,8 +345,35 @@ T::Matrix_2D _raisedTriangle2D(
 	return p::raisedTriangle2D(size_X, size_Y, T::Point(mu[0], mu[1]), x_a, x_b, y_a, y_b);
 }
 
+/*
+PyBind11 config.
+*/
+
 PYBIND11_MODULE(_physics, m) {
 	m.doc() = "_physics";
+	py::class_<_FDTDWorkspace>(m, "_FDTDWorkspace")
+		.def(
+			py::init<const unsigned long&, const unsigned long&, const unsigned long&, const unsigned long&>(),
+			py::arg("X"),
+			py::arg("Y"),
+			py::arg("T"),
+			py::arg("K") = 1
+		)
+		.def("gridSize", &_FDTDWorkspace::gridSize)
+		.def(
+			"render",
+			&_FDTDWorkspace::render,
+			py::arg("u_0"),
+			py::arg("u_0_offset"),
+			py::arg("U_1"),
+			py::arg("U_1_offsets"),
+			py::arg("c_0"),
+			py::arg("c_1"),
+			py::arg("c_2"),
+			py::arg("w"),
+			py::arg("c_3") = 0.
+		)
+		.def("setBoundary", &_FDTDWorkspace::setBoundary);
 	m.def("_circularAmplitudes", &p::circularAmplitudes);
 	m.def("_circularChladniPattern", &p::circularChladniPattern);
 	m.def("_circularSeries", &p::circularSeries);
@@ -54,6 +381,7 @@ PYBIND11_MODULE(_physics, m) {
 	m.def("_equilateralTriangleSeries", &p::equilateralTriangleSeries);
 	m.def("_FDTDUpdate2D", &p::FDTDUpdate2D);
 	m.def("_FDTDWaveform2D", &_FDTDWaveform2D);
+	m.def("_FDTDWaveforms2D", &_FDTDWaveforms2D);
 	m.def("_raisedCosine1D", &p::raisedCosine1D);
 	m.def("_raisedCosine2D", &_raisedCosine2D);
 	m.def("_raisedTriangle1D", &p::raisedTriangle1D);
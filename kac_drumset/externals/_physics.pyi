@@ -10,6 +10,26 @@ Matrix_2D: TypeAlias = list[list[float]] | npt.NDArray[np.float64]
 BooleanImage: TypeAlias = list[list[int]] | npt.NDArray[np.int8]
 
 
+class _FDTDWorkspace:
+	def __init__(self, X: int, Y: int, T: int, K: int = 1) -> None: ...
+	def gridSize(self) -> tuple[int, int]: ...
+
+	def render(
+		self,
+		u_0: npt.NDArray[np.float64],
+		u_0_offset: tuple[int, ...],
+		U_1: npt.NDArray[np.float64],
+		U_1_offsets: npt.NDArray[np.int64],
+		c_0: float,
+		c_1: float,
+		c_2: float,
+		w: tuple[int, int],
+		c_3: float = 0.,
+	) -> npt.NDArray[np.float64]: ...
+
+	def setBoundary(self, mask: npt.NDArray[np.int8]) -> None: ...
+
+
 def _circularAmplitudes(r: float, theta: float, S: Matrix_2D) -> list[list[float]]: ...
 def _circularChladniPattern(n: float, m: float, H: int, tolerance: float) -> list[list[float]]: ...
 def _circularSeries(N: int, M: int) -> list[list[float]]: ...
@@ -27,7 +47,9 @@ def _FDTDUpdate2D(
 ) -> list[list[float]]: ...
 def _FDTDWaveform2D(
 	u_0: Matrix_2D,
+	u_0_offset: tuple[int, ...],
 	u_1: Matrix_2D,
+	u_1_offset: tuple[int, ...],
 	B: BooleanImage,
 	c_0: float,
 	c_1: float,
@@ -35,6 +57,18 @@ def _FDTDWaveform2D(
 	T: int,
 	w: tuple[float, float],
 ) -> list[float]: ...
+def _FDTDWaveforms2D(
+	u_0: Matrix_2D,
+	u_0_offset: tuple[int, ...],
+	U_1: list[Matrix_2D],
+	U_1_offsets: list[tuple[int, ...]],
+	B: BooleanImage,
+	c_0: float,
+	c_1: float,
+	c_2: float,
+	T: int,
+	w: tuple[float, float],
+) -> list[list[float]]: ...
 def _raisedCosine1D(size: int, mu: float, sigma: float) -> list[float]: ...
 def _raisedCosine2D(size_X: int, size_Y: int, mu: tuple[float, float], sigma: float) -> list[list[float]]: ...
 def _raisedTriangle1D(size: int, mu: float, a: float, b: float) -> list[float]: ...
@@ -1,26 +1,63 @@
+from .canonical import canonicalPolygon, DuplicateFilter, shapeHash
 from .ellipse import Circle, Ellipse
-from .isospectrality import weylCondition
-from .lines import isColinear, largestVector, lineIntersection
-from .random_polygon import ConvexPolygon, IrregularStar, TravellingSalesmanPolygon, UnitRectangle
+from .isospectrality import (
+	dirichletEigenvalues,
+	EigenvalueIndex,
+	heatTraceInvariants,
+	IsospectralityIndex,
+	weylCondition,
+)
+from .lines import (
+	findIntersections,
+	isColinear,
+	largestVector,
+	lineIntersection,
+	lineIntersections,
+	LineIntersection,
+)
+from .mask_cache import MaskCache
+from .random_polygon import (
+	generatePolygons,
+	ConvexPolygon,
+	IrregularStar,
+	TravellingSalesmanPolygon,
+	UnitRectangle,
+)
 from .polygon import Polygon
+from .shape_bank import ShapeBank
+from .shape_collection import ShapeCollection
 from .types import Shape, ShapeSettings
 
 
 __all__ = [
 	# External Methods
+	'findIntersections',
 	'isColinear',
 	'largestVector',
 	'lineIntersection',
+	'lineIntersections',
 	# Methods
+	'canonicalPolygon',
+	'dirichletEigenvalues',
+	'generatePolygons',
+	'heatTraceInvariants',
+	'shapeHash',
 	'weylCondition',
 	# Classes
 	'Circle',
 	'ConvexPolygon',
+	'DuplicateFilter',
+	'EigenvalueIndex',
 	'IrregularStar',
+	'IsospectralityIndex',
+	'MaskCache',
+	'ShapeBank',
+	'ShapeCollection',
 	'TravellingSalesmanPolygon',
 	'UnitRectangle',
 	# Types
 	'Ellipse',
+	'LineIntersection',
 	'Polygon',
 	'Shape',
 	'ShapeSettings',
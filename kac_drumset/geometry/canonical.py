@@ -0,0 +1,115 @@
+'''
+This file contains methods for reducing shapes to a canonical form, which are used to detect duplicate shapes.
+'''
+
+# core
+import hashlib
+import json
+from typing import cast
+
+# dependencies
+import numpy as np 			# maths
+import numpy.typing as npt	# typing for numpy
+
+# src
+from .ellipse import Ellipse
+from .polygon import Polygon
+from .types import Shape
+
+__all__ = [
+	# methods
+	'canonicalPolygon',
+	'shapeHash',
+	# classes
+	'DuplicateFilter',
+]
+
+
+def canonicalPolygon(vertices: npt.NDArray[np.float64], tolerance: float = 1e-6) -> npt.NDArray[np.int64]:
+	'''
+	Reduce a polygon to a canonical form, which is invariant to translation, scale, rotation, reflection and the order of
+	its vertices. Akin to the normalisation of a generated polygon, the largest vector of the polygon is centred at the
+	origin and aligned with the x axis, such that it has a length of 1. Every alignment of every largest vector (within
+	tolerance), as well as their reflections, is then quantised to the tolerance, oriented counterclockwise, and rotated
+	cyclically to begin at its lexicographically smallest vertex. The smallest of these candidates is the canonical form.
+	output:
+		The quantised vertices of the canonical polygon, with the shape (N, 2), such that vertices * tolerance ∈ [-1, 1].
+	'''
+	assert vertices.ndim == 2 and vertices.shape[1] == 2, \
+		'canonicalPolygon() only supports an input of shape (n, 2).'
+	N = vertices.shape[0]
+	D = np.linalg.norm(vertices[:, np.newaxis, :] - vertices[np.newaxis, :, :], axis=2)
+	longest = D.max()
+	candidates: list[npt.NDArray[np.int64]] = []
+	for i, j in np.argwhere(D >= longest * (1. - tolerance)):
+		# i -> j and j -> i are both visited, and cover both alignments of each largest vector
+		d = (vertices[j] - vertices[i]) / D[i, j]
+		R = np.array([[d[0], d[1]], [-d[1], d[0]]]) / D[i, j]
+		V = (vertices - 0.5 * (vertices[i] + vertices[j])) @ R.T
+		for reflection in [1., -1.]:
+			Q = np.round(V * [1., reflection] / tolerance).astype(np.int64)
+			# orient the polygon counterclockwise
+			if np.sum(Q[:, 0] * np.roll(Q[:, 1], -1) - np.roll(Q[:, 0], -1) * Q[:, 1]) < 0:
+				Q = Q[::-1]
+			# choose the smallest cyclic rotation of the vertices
+			rotations = Q[(np.arange(N)[:, np.newaxis] + np.arange(N)[np.newaxis, :]) % N].reshape(N, 2 * N)
+			candidates.append(rotations[np.lexsort(rotations.T[::-1])[0]])
+	C = np.stack(candidates)
+	return cast(npt.NDArray[np.int64], C[np.lexsort(C.T[::-1])[0]].reshape(N, 2))
+
+
+def shapeHash(shape: Shape, tolerance: float = 1e-6) -> str:
+	'''
+	Hash the canonical form of a shape. Polygons are hashed using canonicalPolygon(), ellipses using the quantised ratio of
+	their axes, whilst any other shape is hashed using its labels. Shapes which differ by less than the tolerance are
+	hashed equally, unless their quantised forms are separated by the boundary of a quantisation step.
+	'''
+	h = hashlib.blake2b(digest_size=16)
+	if isinstance(shape, Polygon):
+		h.update(b'polygon')
+		h.update(canonicalPolygon(shape.vertices, tolerance).tobytes())
+	elif isinstance(shape, Ellipse):
+		h.update(b'ellipse')
+		ratio = min(shape.major, shape.minor) / max(shape.major, shape.minor)
+		h.update(np.array([round(ratio / tolerance)], dtype=np.int64).tobytes())
+	else:
+		h.update(type(shape).__name__.encode())
+		h.update(json.dumps(shape.__getLabels__(), sort_keys=True).encode())
+	return h.hexdigest()
+
+
+class DuplicateFilter():
+	'''
+	A record of the canonical hash of every shape seen so far, which is used to reject duplicate shapes.
+	'''
+
+	tolerance: float	# tolerance used when hashing shapes
+	_seen: set[str]		# hashes of every shape seen so far
+
+	def __init__(self, tolerance: float = 1e-6) -> None:
+		'''
+		input:
+			tolerance	shapes whose canonical forms differ by less than the tolerance are considered duplicates
+		'''
+		self.tolerance = tolerance
+		self._seen = set()
+
+	def __contains__(self, shape: object) -> bool:
+		''' Determine whether a shape has been seen before. '''
+		return isinstance(shape, Shape) and shapeHash(shape, self.tolerance) in self._seen
+
+	def __len__(self) -> int:
+		''' The amount of unique shapes seen so far. '''
+		return len(self._seen)
+
+	def add(self, shape: Shape) -> bool:
+		''' Record a shape, and return whether or not it is unique. '''
+		key = shapeHash(shape, self.tolerance)
+		if key in self._seen:
+			return False
+		self._seen.add(key)
+		return True
+
+	def clear(self) -> None:
+		''' Forget every shape seen so far. '''
+		self._seen.clear()
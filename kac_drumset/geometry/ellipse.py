@@ -6,11 +6,11 @@ This file contains the fixed geometric types used as part of this package.
 import math					# maths
 
 # dependencies
-import cv2					# image processing
 import numpy as np 			# maths
 import numpy.typing as npt	# typing for numpy
 
 # src
+from ..externals._geometry import _drawEllipse, _drawEllipseCoverage
 from .types import Shape, ShapeSettings
 
 __all__ = [
@@ -24,17 +24,25 @@ class Ellipse(Shape):
 	A base class for an ellipse, instantiated with two foci.
 	'''
 
+	__slots__ = ('_centroid', '_major', '_minor')
+
 	_centroid: tuple[float, float]	# center of the ellipse
-	major: float					# length across the x axis
-	minor: float					# length across the y axis
+	_major: float					# length across the x axis
+	_minor: float					# length across the y axis
 
 	class Settings(ShapeSettings, total=False):
 		''' Settings to be used when generating. '''
 		major: float				# length across the x axis
 		minor: float				# length across the y axis (randomly generated when minor = 0.)
 
-	def __init__(self, major: float = 1., minor: float = 0., centroid: tuple[float, float] = (0., 0.)) -> None:
-		minor = minor or np.random.uniform(0., 1.)
+	def __init__(
+		self,
+		major: float = 1.,
+		minor: float = 0.,
+		centroid: tuple[float, float] = (0., 0.),
+		rng: np.random.Generator | None = None,
+	) -> None:
+		minor = minor or (rng or np.random).uniform(0., 1.)
 		if (major >= minor):
 			self.major = major
 			self.minor = minor
@@ -53,7 +61,8 @@ class Ellipse(Shape):
 
 	@area.setter
 	def area(self, a: float) -> None:
-		epsilon = self.major / self.minor
+		# the aspect ratio is preserved, such that major * minor = a / π
+		epsilon = (self.major / self.minor) ** 0.5
 		scaled_a = ((a / np.pi) ** 0.5)
 		self.major = scaled_a * epsilon
 		self.minor = scaled_a / epsilon
@@ -68,6 +77,44 @@ class Ellipse(Shape):
 	@centroid.setter
 	def centroid(self, value: tuple[float, float]) -> None:
 		self._centroid = value
+		self._invalidate('boundingBox')
+
+	'''
+	Getters and setters for major and minor. Derived quantities of the ellipse are cached until either axis is updated.
+	'''
+	@property
+	def major(self) -> float:
+		return self._major
+
+	@major.setter
+	def major(self, value: float) -> None:
+		self._major = value
+		self._invalidate()
+
+	@property
+	def minor(self) -> float:
+		return self._minor
+
+	@minor.setter
+	def minor(self, value: float) -> None:
+		self._minor = value
+		self._invalidate()
+
+	@property
+	def boundingBox(self) -> tuple[tuple[float, float], tuple[float, float]]:
+		''' The axis aligned bounding box of the ellipse, returned as ((x_min, y_min), (x_max, y_max)). '''
+		return self._cached('boundingBox', lambda: (
+			(self.centroid[0] - self.major, self.centroid[1] - self.minor),
+			(self.centroid[0] + self.major, self.centroid[1] + self.minor),
+		))
+
+	@property
+	def perimeter(self) -> float:
+		''' Ramanujan's second approximation of the perimeter of an ellipse. '''
+		def perimeter() -> float:
+			h: float = ((self.major - self.minor) / (self.major + self.minor)) ** 2.
+			return math.pi * (self.major + self.minor) * (1. + (3. * h / (10. + math.sqrt(4. - 3. * h))))
+		return self._cached('perimeter', perimeter)
 
 	def __getLabels__(self) -> dict[str, list[float | int]]:
 		'''
@@ -75,35 +122,47 @@ class Ellipse(Shape):
 		'''
 		return {'major': [self.major], 'minor': [self.minor]}
 
-	def draw(self, grid_size: int) -> npt.NDArray[np.int8]:
+	def arePointsInside(self, P: npt.NDArray[np.float64]) -> npt.NDArray[np.bool_]:
+		'''
+		Determines for each point p in an array with the shape (n, 2) if p ∈ E, including boundaries.
+		'''
+		assert P.ndim == 2 and P.shape[1] == 2, 'arePointsInside() only supports an input of shape (n, 2).'
+		major_2: float = self.major ** 2.
+		minor_2: float = self.minor ** 2.
+		return (((P[:, 0] - self.centroid[0]) ** 2) * minor_2) \
+			+ (((P[:, 1] - self.centroid[1]) ** 2) * major_2) <= (major_2 * minor_2)
+
+	def draw(self, grid_size: int, out: npt.NDArray[np.int8] | None = None) -> npt.NDArray[np.int8]:
 		'''
 		This function creates a boolean mask of a manifold on a grid with dimensions R^(grid_size). The input shape is always
-		normalised to the domain R^G before being drawn.
-		'''
-		half_grid = round((grid_size - 1) / 2)
-		return cv2.circle(
-			np.zeros((grid_size, grid_size), np.int8),
-			(half_grid, half_grid),
-			half_grid,
-			(1, 0, 0),
-			-1,
-		).astype(np.int8) if self.major == self.minor else cv2.ellipse(
-			np.zeros((grid_size, grid_size), np.int8),
-			(half_grid, half_grid),
-			# transposing maintains that mask[x, y] works as intended
-			(round(half_grid * self.minor / self.major), half_grid),
-			0,
-			0,
-			360,
-			(1, 0, 0),
-			thickness=-1,
-		).astype(np.int8)
+		normalised to the domain R^G before being drawn. The mask is optionally written into the preallocated buffer out.
+		'''
+		out = np.empty((grid_size, grid_size), np.int8) if out is None else out
+		assert out.shape == (grid_size, grid_size), 'draw() requires a buffer of shape (grid_size, grid_size).'
+		# the major axis spans the first axis of the mask, such that mask[x, y] works as intended
+		_drawEllipse((0.5, 0.5), (0.5, 0.5 * self.minor / self.major), out)
+		return out
+
+	def drawCoverage(
+		self,
+		grid_size: int,
+		supersample: int = 4,
+		out: npt.NDArray[np.float64] | None = None,
+	) -> npt.NDArray[np.float64]:
+		'''
+		This function calculates the fraction of each cell on a grid with dimensions R^(grid_size) that is covered by the
+		manifold, using supersample^2 samples per cell. The input shape is normalised in the same manner as draw().
+		'''
+		out = np.empty((grid_size, grid_size), np.float64) if out is None else out
+		assert out.shape == (grid_size, grid_size), 'drawCoverage() requires a buffer of shape (grid_size, grid_size).'
+		_drawEllipseCoverage((0.5, 0.5), (0.5, 0.5 * self.minor / self.major), supersample, out)
+		return out
 
 	def eccentricity(self) -> float:
 		'''
 		The ratio between the focal distance and the major axis.
 		'''
-		return math.sqrt(1. - (self.minor ** 2. / self.major ** 2.))
+		return self._cached('eccentricity', lambda: math.sqrt(1. - (self.minor ** 2. / self.major ** 2.)))
 
 	def foci(self) -> tuple[tuple[float, float], tuple[float, float]]:
 		'''
@@ -128,18 +187,36 @@ class Ellipse(Shape):
 		return (((p[0] - self.centroid[0]) ** 2) * minor_2) \
 			+ (((p[1] - self.centroid[1]) ** 2) * major_2) <= (major_2 * minor_2)
 
+	def samplePoints(self, n: int, rng: np.random.Generator | None = None) -> npt.NDArray[np.float64]:
+		'''
+		Draw n points uniformly distributed within the ellipse, by scaling points drawn uniformly within the unit disk.
+		'''
+		r = np.sqrt((rng or np.random).uniform(0., 1., n))
+		theta = (rng or np.random).uniform(0., 2. * np.pi, n)
+		return np.stack([
+			self.centroid[0] + self.major * r * np.cos(theta),
+			self.centroid[1] + self.minor * r * np.sin(theta),
+		], axis=1)
+
 
 class Circle(Ellipse):
 	'''
 	A base class for a circle, instantiated with a radius.
 	'''
 
+	__slots__ = ()
+
 	class Settings(ShapeSettings, total=False):
 		''' Settings to be used when generating. '''
 		r: float			# radius (randomly generated when r = 0)
 
-	def __init__(self, r: float = 0., centroid: tuple[float, float] = (0., 0.)) -> None:
-		r = r or np.random.uniform(0., 1.)
+	def __init__(
+		self,
+		r: float = 0.,
+		centroid: tuple[float, float] = (0., 0.),
+		rng: np.random.Generator | None = None,
+	) -> None:
+		r = r or (rng or np.random).uniform(0., 1.)
 		super().__init__(r, r, centroid)
 
 	'''
@@ -2,10 +2,330 @@
 Methods to derive spectral geometry properties.
 '''
 
+# core
+import os
+from typing import cast, Iterable, Sequence
+
+# dependencies
+import numpy as np 			# maths
+import numpy.typing as npt	# typing for numpy
+
 # src
+from .mask_cache import MaskCache
+from .polygon import Polygon
 from .types import Shape
 
-__all__ = ['weylCondition']
+__all__ = [
+	'dirichletEigenvalues',
+	'heatTraceInvariants',
+	'EigenvalueIndex',
+	'IsospectralityIndex',
+	'weylCondition',
+]
+
+
+def dirichletEigenvalues(
+	S: Shape,
+	k: int = 20,
+	grid_size: int = 32,
+	mask_cache: MaskCache | None = None,
+) -> npt.NDArray[np.float64]:
+	'''
+	Approximate the first k eigenvalues of the Dirichlet Laplacian of a shape, using the five-point finite difference
+	Laplacian over the mask produced by Shape.draw(). Each eigenvalue λ is normalised by the area A of the mask, such that
+	λA is invariant to the scale of the shape.
+	input:
+		S			the shape to analyse
+		k			the number of eigenvalues
+		grid_size	the size of the mask, which determines the accuracy of the approximation
+		mask_cache	an optional cache used to reuse the mask of the shape
+	'''
+	B = (mask_cache.draw(S, grid_size) if mask_cache is not None else S.draw(grid_size)).astype(np.bool_)
+	N = int(np.count_nonzero(B))
+	assert N >= k, \
+		'dirichletEigenvalues() requires a mask containing at least k cells, consider increasing grid_size.'
+	# index each cell inside the shape, such that each neighbour outside of the shape is a Dirichlet boundary
+	cell = np.full((grid_size + 2, grid_size + 2), -1, dtype=np.int64)
+	cell[1:-1, 1:-1][B] = np.arange(N)
+	L = np.diag(np.full(N, 4.))
+	rows = cell[1:-1, 1:-1][B]
+	for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+		neighbours = cell[1 + dx:grid_size + 1 + dx, 1 + dy:grid_size + 1 + dy][B]
+		inside = neighbours >= 0
+		L[rows[inside], neighbours[inside]] = -1.
+	return np.linalg.eigvalsh(L)[:k] * N
+
+
+class EigenvalueIndex():
+	'''
+	An approximate nearest neighbour index over the first k eigenvalues of a large collection of shapes. Eigenvalues are
+	stored in a memory-mapped matrix on disk, and are partitioned into inverted lists using k-means, such that each query
+	only scans the lists whose centroids are nearest to it. Until the index is built, queries are answered exactly.
+	'''
+
+	eigenvalues: np.memmap[tuple[int, int], np.dtype[np.float32]]	# memory-mapped eigenvalues, with the shape (N, k)
+	grid_size: int												# size of the masks used to compute eigenvalues
+	path: str													# location of the eigenvalues on disk
+	_centroids: npt.NDArray[np.float32] | None					# centroid of each inverted list
+	_offsets: npt.NDArray[np.int64] | None						# start of each inverted list in _order
+	_order: npt.NDArray[np.int64] | None						# shapes sorted by inverted list
+
+	def __init__(self, path: str, N: int | None = None, k: int = 20, grid_size: int = 32) -> None:
+		'''
+		input:
+			path		the location of the eigenvalues (.npy), which is opened when N is None
+			N			the number of shapes, which creates an index of empty eigenvalues at path
+			k			the number of eigenvalues stored for each shape
+			grid_size	the size of the masks used to compute eigenvalues
+		'''
+		self.grid_size = grid_size
+		self.path = path
+		self._centroids = None
+		self._offsets = None
+		self._order = None
+		if N is None:
+			self.eigenvalues = np.lib.format.open_memmap(path, mode='r+')
+			if os.path.exists(self._ivfPath()):
+				with np.load(self._ivfPath()) as ivf:
+					self._centroids = ivf['centroids']
+					self._offsets = ivf['offsets']
+					self._order = ivf['order']
+		else:
+			self.eigenvalues = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=(N, k))
+
+	def __len__(self) -> int:
+		''' The number of shapes stored in the index. '''
+		return len(self.eigenvalues)
+
+	def build(self, n_lists: int | None = None, iterations: int = 10, sample_size: int = 65536) -> None:
+		'''
+		Partition the eigenvalues into inverted lists using k-means, and save the partition alongside the eigenvalues.
+		input:
+			n_lists		the number of inverted lists, which defaults to √N
+			iterations	the number of iterations of Lloyd's algorithm
+			sample_size	the number of shapes used to train the centroids
+		'''
+		N = len(self)
+		n_lists = max(1, min(N, n_lists if n_lists is not None else int(np.sqrt(N))))
+		rng = np.random.default_rng()
+		sample = np.asarray(self.eigenvalues[np.sort(rng.choice(N, min(N, max(sample_size, n_lists)), replace=False))])
+		centroids = sample[rng.choice(sample.shape[0], n_lists, replace=False)]
+		for _ in range(iterations):
+			assignment = self._nearestCentroids(sample, centroids, 1)[:, 0]
+			counts = np.bincount(assignment, minlength=n_lists)
+			sums = np.zeros_like(centroids, dtype=np.float64)
+			np.add.at(sums, assignment, sample)
+			# empty lists keep their previous centroid
+			centroids = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centroids).astype(np.float32)
+		assignment = np.concatenate([
+			self._nearestCentroids(np.asarray(self.eigenvalues[n:n + sample_size]), centroids, 1)[:, 0]
+			for n in range(0, N, sample_size)
+		])
+		self._centroids = centroids
+		self._order = np.argsort(assignment, kind='stable')
+		self._offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=n_lists))])
+		np.savez(self._ivfPath(), centroids=self._centroids, offsets=self._offsets, order=self._order)
+
+	def compute(self, shapes: Iterable[Shape], start: int = 0, mask_cache: MaskCache | None = None) -> None:
+		'''
+		Compute and store the eigenvalues of a collection of shapes, in order, beginning at the index start. This
+		invalidates any previously built partition, which should be rebuilt once every shape has been computed.
+		'''
+		k = self.eigenvalues.shape[1]
+		for n, S in enumerate(shapes, start):
+			self.eigenvalues[n] = dirichletEigenvalues(S, k, self.grid_size, mask_cache)
+		self.eigenvalues.flush()
+		self._centroids = None
+		self._offsets = None
+		self._order = None
+		if os.path.exists(self._ivfPath()):
+			os.remove(self._ivfPath())
+
+	def query(
+		self,
+		q: Shape | npt.NDArray[np.float64],
+		n: int = 10,
+		n_probe: int = 8,
+	) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+		'''
+		Find the n shapes whose eigenvalues are closest to those of a shape, or to a given set of k eigenvalues.
+		input:
+			q		the query shape or eigenvalues
+			n		the number of neighbours
+			n_probe	the number of inverted lists scanned
+		output:
+			The indices of the nearest shapes and the euclidean distance between their eigenvalues, in ascending order.
+		'''
+		k = self.eigenvalues.shape[1]
+		x = (dirichletEigenvalues(q, k, self.grid_size) if isinstance(q, Shape) else q).astype(np.float32)
+		if self._centroids is None or self._offsets is None or self._order is None:
+			candidates = np.arange(len(self))
+		else:
+			lists = self._nearestCentroids(x[np.newaxis, :], self._centroids, n_probe)[0]
+			candidates = np.sort(np.concatenate([self._order[self._offsets[m]:self._offsets[m + 1]] for m in lists]))
+		distances = np.linalg.norm(np.asarray(self.eigenvalues[candidates]) - x, axis=1).astype(np.float64)
+		nearest = np.argsort(distances, kind='stable')[:n]
+		return candidates[nearest], distances[nearest]
+
+	def _ivfPath(self) -> str:
+		''' The location of the inverted lists on disk. '''
+		return f'{os.path.splitext(self.path)[0]}.ivf.npz'
+
+	@staticmethod
+	def _nearestCentroids(
+		X: npt.NDArray[np.float32],
+		centroids: npt.NDArray[np.float32],
+		n: int,
+	) -> npt.NDArray[np.int64]:
+		''' Find the indices of the n nearest centroids to each row of X. '''
+		D = (X ** 2).sum(axis=1)[:, None] - 2. * X @ centroids.T + (centroids ** 2).sum(axis=1)[None, :]
+		n = min(n, centroids.shape[0])
+		nearest = np.argpartition(D, n - 1, axis=1)[:, :n]
+		order = np.argsort(np.take_along_axis(D, nearest, axis=1), axis=1)
+		return cast(npt.NDArray[np.int64], np.take_along_axis(nearest, order, axis=1))
+
+
+def heatTraceInvariants(S: Shape) -> tuple[float, float, float]:
+	'''
+	Calculate the first three coefficients of the asymptotic expansion of the heat trace of a shape with Dirichlet
+	boundary conditions, Z(t) ~ A / 4πt - L / 8√(πt) + c, which are equal for any two isospectral shapes. For polygons,
+	c = Σ (π² - θ²) / 24πθ over every interior angle θ, whereas for smooth simply connected shapes c = 1 / 6.
+	Kac, M. (1966). Can one hear the shape of a drum?
+	van den Berg, M., & Srisatkunarajah, S. (1990). Heat equation for a region in R2 with a polygonal boundary.
+	output:
+		(area, perimeter, c)
+	'''
+	if not isinstance(S, Polygon):
+		return S.area, S.perimeter, 1. / 6.
+	# calculate each interior angle from the turning angle at each vertex, which sum to ±2π depending on orientation
+	e = np.roll(S.vertices, -1, axis=0) - S.vertices
+	e_prev = np.roll(e, 1, axis=0)
+	turn = np.arctan2(e_prev[:, 0] * e[:, 1] - e_prev[:, 1] * e[:, 0], np.sum(e_prev * e, axis=1))
+	theta = np.pi - turn * np.sign(np.sum(turn))
+	c = float(np.sum((np.pi ** 2 - theta ** 2) / (24. * np.pi * theta)))
+	return S.area, S.perimeter, c
+
+
+class IsospectralityIndex():
+	'''
+	A screening index used to find candidate isospectral pairs amongst a large collection of shapes. Each shape is reduced
+	to its heat trace invariants, and two shapes are considered candidates when every invariant agrees to within
+	|a - b| <= atol + rtol * max(|a|, |b|). Candidate pairs are found by sweeping along the invariant which best separates
+	the collection, such that only the shapes within tolerance along that invariant are ever compared.
+	'''
+
+	atol: npt.NDArray[np.float64]					# absolute tolerance of each invariant
+	rtol: npt.NDArray[np.float64]					# relative tolerance of each invariant
+	_blocks: list[npt.NDArray[np.float64]]			# invariants of each batch of shapes added to the index
+	_invariants: npt.NDArray[np.float64] | None		# concatenated invariants, with the shape (n, 3)
+	_sweep: tuple[int, npt.NDArray[np.int64]] | None	# sweep dimension and the order of the shapes along it
+
+	def __init__(
+		self,
+		shapes: Iterable[Shape] = [],
+		atol: float | Sequence[float] = 0.,
+		rtol: float | Sequence[float] = 1e-6,
+	) -> None:
+		'''
+		input:
+			shapes	an optional collection of shapes used to initialise the index
+			atol	the absolute tolerance of each invariant, (area, perimeter, c)
+			rtol	the relative tolerance of each invariant, (area, perimeter, c)
+		'''
+		self.atol = np.broadcast_to(np.array(atol, dtype=np.float64), (3,)).copy()
+		self.rtol = np.broadcast_to(np.array(rtol, dtype=np.float64), (3,)).copy()
+		self._blocks = []
+		self._invariants = None
+		self._sweep = None
+		self.add(shapes)
+
+	def __len__(self) -> int:
+		''' The amount of shapes stored in the index. '''
+		return len(self.invariants)
+
+	@property
+	def invariants(self) -> npt.NDArray[np.float64]:
+		''' The heat trace invariants of every shape in the index, with the shape (n, 3). '''
+		if self._invariants is None:
+			self._invariants = np.concatenate(self._blocks) if self._blocks else np.empty((0, 3))
+			self._blocks = [self._invariants]
+		return self._invariants
+
+	def add(self, shapes: Iterable[Shape]) -> None:
+		''' Add a collection of shapes to the index, in order. '''
+		self.addInvariants(np.array([heatTraceInvariants(S) for S in shapes], dtype=np.float64).reshape(-1, 3))
+
+	def addInvariants(self, invariants: npt.NDArray[np.float64]) -> None:
+		''' Add precomputed heat trace invariants, with the shape (n, 3), to the index. '''
+		assert invariants.ndim == 2 and invariants.shape[1] == 3, \
+			'IsospectralityIndex.addInvariants() only supports an input of shape (n, 3).'
+		if invariants.shape[0] == 0:
+			return
+		self._blocks.append(np.asarray(invariants, dtype=np.float64))
+		self._invariants = None
+		self._sweep = None
+
+	def candidates(self, chunk_size: int = 65536) -> npt.NDArray[np.int64]:
+		'''
+		Find every pair of shapes whose invariants agree within tolerance.
+		input:
+			chunk_size	the amount of shapes swept at once, which bounds the memory used by each comparison
+		output:
+			An array with the shape (k, 2), containing the sorted indices (i, j), i < j, of each candidate pair.
+		'''
+		X = self.invariants
+		d, order = self._sweepOrder()
+		x = X[order, d]
+		# the last position along the sweep which may be within tolerance of each shape
+		hi = np.searchsorted(x, x + self._window()[d], side='right')
+		pairs = [np.empty((0, 2), dtype=np.int64)]
+		for start in range(0, x.shape[0], chunk_size):
+			i = np.arange(start, min(start + chunk_size, x.shape[0]))
+			counts = hi[i] - i - 1
+			i_a = np.repeat(i, counts)
+			i_b = i_a + 1 + np.arange(i_a.shape[0]) - np.repeat(np.cumsum(counts) - counts, counts)
+			a = order[i_a]
+			b = order[i_b]
+			keep = self._withinTolerance(X[a], X[b])
+			pairs.append(np.sort(np.stack([a[keep], b[keep]], axis=1), axis=1))
+		out = np.concatenate(pairs)
+		return out[np.lexsort((out[:, 1], out[:, 0]))]
+
+	def query(self, S: Shape) -> npt.NDArray[np.int64]:
+		''' Find the indices of every shape in the index whose invariants agree with those of S within tolerance. '''
+		X = self.invariants
+		d, order = self._sweepOrder()
+		q = np.array(heatTraceInvariants(S), dtype=np.float64)
+		x = X[order, d]
+		window = self._window(q)[d]
+		i = order[np.searchsorted(x, q[d] - window, side='left'):np.searchsorted(x, q[d] + window, side='right')]
+		return np.sort(i[self._withinTolerance(X[i], q[np.newaxis, :])])
+
+	def _sweepOrder(self) -> tuple[int, npt.NDArray[np.int64]]:
+		''' Choose the invariant with the most distinct values relative to its tolerance, and sort the shapes along it. '''
+		if self._sweep is None:
+			X = self.invariants
+			spread = np.ptp(X, axis=0) if X.shape[0] > 0 else np.zeros(3)
+			with np.errstate(divide='ignore', invalid='ignore'):
+				separation = np.where(spread > 0., spread / self._window(), 0.)
+			d = int(np.argmax(separation))
+			self._sweep = (d, np.argsort(X[:, d], kind='stable'))
+		return self._sweep
+
+	def _window(self, q: npt.NDArray[np.float64] | None = None) -> npt.NDArray[np.float64]:
+		''' The largest difference in each invariant that may be within tolerance of any shape in the index. '''
+		X = self.invariants
+		m = np.abs(X).max(axis=0) if X.shape[0] > 0 else np.zeros(3)
+		if q is not None:
+			m = np.maximum(m, np.abs(q))
+		return self.atol + self.rtol * m
+
+	def _withinTolerance(self, a: npt.NDArray[np.float64], b: npt.NDArray[np.float64]) -> npt.NDArray[np.bool_]:
+		''' Compare two arrays of invariants, with the shape (n, 3), row by row. '''
+		return cast(
+			npt.NDArray[np.bool_],
+			np.all(np.abs(a - b) <= self.atol + self.rtol * np.maximum(np.abs(a), np.abs(b)), axis=1),
+		)
 
 
 def weylCondition(S_1: Shape, S_2: Shape) -> bool:
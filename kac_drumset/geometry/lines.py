@@ -3,6 +3,7 @@ Import functions from external C++ library, housed in geometry/lines.hpp.
 '''
 
 # core
+from enum import IntEnum
 from typing import Literal
 
 # dependencies
@@ -10,15 +11,49 @@ import numpy as np 			# maths
 import numpy.typing as npt	# typing for numpy
 
 # src
-from ..externals._geometry import _isColinear, _largestVector, _lineIntersection
+from ..externals._geometry import (
+	_findIntersections,
+	_isColinear,
+	_largestVector,
+	_lineIntersection,
+	_lineIntersections,
+	_lineIntersectionsAllPairs,
+)
 
 __all__ = [
+	'findIntersections',
 	'isColinear',
 	'largestVector',
 	'lineIntersection',
+	'lineIntersections',
+	'LineIntersection',
 ]
 
 
+class LineIntersection(IntEnum):
+	'''
+	The types of intersection returned by lineIntersections(), as defined by lineIntersection().
+	'''
+
+	NONE = 0
+	INTERSECT = 1
+	VERTEX = 2
+	ADJACENT = 3
+	COLINEAR = 4
+
+
+def findIntersections(vertices: npt.NDArray[np.float64]) -> npt.NDArray[np.int64]:
+	'''
+	Find every pair of intersecting edges of a polygon using a sweep line, where edge i connects vertex i to vertex i + 1.
+	Adjacent edges are only considered to intersect when the polygon folds back on itself.
+	output:
+		An array with the shape (k, 2), containing the sorted indices (i, j), i < j, of each pair of intersecting edges.
+	'''
+	assert vertices.ndim == 2 and vertices.shape[1] == 2, \
+		'findIntersections() only supports an input of shape (n, 2).'
+	return np.array(_findIntersections(vertices), dtype=np.int64).reshape(-1, 2)
+
+
 def isColinear(vertices: npt.NDArray[np.float64]) -> bool:
 	'''
 	Determines whether or not a given set of three vertices are colinear.
@@ -30,8 +65,9 @@ def isColinear(vertices: npt.NDArray[np.float64]) -> bool:
 
 def largestVector(vertices: npt.NDArray[np.float64]) -> tuple[float, tuple[int, int]]:
 	'''
-	This function tests each pair of vertices in a given set of points to find the largest vector, and returns the length
-	of the vector and its indices.
+	This function finds the largest vector between any two of a given set of points, and returns the length of the vector
+	and its indices. The search is performed in O(N log N) using the rotating calipers method on the convex hull of the
+	points, and when multiple vectors are equally large the lowest indices (i, j), i < j, are returned.
 	'''
 	assert vertices.ndim == 2 and vertices[0].shape[0] == 2, \
 		'largestVector() only supports an input of shape (n, 2).'
@@ -68,3 +104,29 @@ def lineIntersection(A: npt.NDArray[np.float64], B: npt.NDArray[np.float64]) ->
 		'lineIntersection() only supports an input of A and B with shapes (2, 2).'
 	out = _lineIntersection(A, B)
 	return out[0], np.array(out[1])
+
+
+def lineIntersections(A: npt.NDArray[np.float64], B: npt.NDArray[np.float64] | None = None) -> tuple[
+	npt.NDArray[np.int8],
+	npt.NDArray[np.float64],
+]:
+	'''
+	A vectorised lineIntersection(), which natively classifies the intersection of each pair of line segments (A[n], B[n]).
+	When B is omitted, every pair of line segments (A[i], A[j]), i < j, is classified instead, in the order given by
+	np.triu_indices(n, 1).
+	input
+		A, B - Arrays of line segments with the shape (n, 2, 2).
+	output
+		type -
+			An array with the shape (n,), or (n * (n - 1) / 2,) when comparing all pairs, where each value is a
+			LineIntersection.
+		point -
+			An array with the shape (n, 2), or (n * (n - 1) / 2, 2), containing the point of each intersection.
+	'''
+	assert A.ndim == 3 and A.shape[1:] == (2, 2), \
+		'lineIntersections() only supports an input of A with shape (n, 2, 2).'
+	if B is None:
+		return _lineIntersectionsAllPairs(A)
+	assert B.shape == A.shape, \
+		'lineIntersections() only supports an input of A and B with equal shapes (n, 2, 2).'
+	return _lineIntersections(A, B)
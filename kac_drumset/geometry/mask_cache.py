@@ -0,0 +1,133 @@
+'''
+This file contains a cache for the rasterised boolean masks produced by Shape.draw().
+'''
+
+# core
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import tempfile
+
+# dependencies
+import numpy as np 			# maths
+import numpy.typing as npt	# typing for numpy
+
+# src
+from .ellipse import Ellipse
+from .polygon import Polygon
+from .types import Shape
+
+__all__ = [
+	'MaskCache',
+]
+
+
+class MaskCache():
+	'''
+	A least recently used cache of the boolean masks produced by Shape.draw(), keyed by the geometry of a shape and the
+	size of the grid. Masks are stored bit-packed, and can optionally be persisted to a directory on disk, such that they
+	are shared between processes and sessions.
+	'''
+
+	cache_dir: str | None							# directory used to persist masks to disk
+	max_size: int									# maximum number of masks stored in memory
+	_masks: OrderedDict[str, npt.NDArray[np.uint8]]	# bit-packed masks, ordered by recent use
+
+	def __init__(self, max_size: int = 1024, cache_dir: str | None = None) -> None:
+		'''
+		input:
+			max_size	the maximum amount of masks stored in memory
+			cache_dir	an optional directory used to store masks on disk
+		'''
+		self.cache_dir = cache_dir
+		self.max_size = max_size
+		self._masks = OrderedDict()
+		if self.cache_dir is not None:
+			os.makedirs(self.cache_dir, exist_ok=True)
+
+	def __len__(self) -> int:
+		''' The amount of masks stored in memory. '''
+		return len(self._masks)
+
+	def clear(self) -> None:
+		''' Empty the in-memory cache. Masks stored on disk are left untouched. '''
+		self._masks.clear()
+
+	def draw(self, shape: Shape, grid_size: int, out: npt.NDArray[np.int8] | None = None) -> npt.NDArray[np.int8]:
+		'''
+		Draw the mask of a shape, reusing a cached mask when the same shape has already been drawn at this grid size. The
+		mask is optionally written into the preallocated buffer out. Masks on disk are written atomically, and any mask which
+		cannot be read from disk is treated as a cache miss and redrawn.
+		'''
+		key = MaskCache.key(shape, grid_size)
+		path = os.path.join(self.cache_dir, f'{key}.npy') if self.cache_dir is not None else None
+		packed = self._masks.get(key)
+		if packed is None and path is not None:
+			packed = _loadMask(path, grid_size)
+		if packed is None:
+			# cold draw
+			out = shape.draw(grid_size, out)
+			packed = np.packbits(out.astype(np.bool_))
+			if path is not None:
+				_saveMask(path, packed)
+		else:
+			mask = np.unpackbits(packed, count=grid_size * grid_size).reshape(grid_size, grid_size).view(np.int8)
+			if out is None:
+				out = mask
+			else:
+				out[:] = mask
+		self._store(key, packed)
+		return out
+
+	@staticmethod
+	def key(shape: Shape, grid_size: int) -> str:
+		'''
+		Hash the geometry of a shape and the size of the grid. Polygons and ellipses are hashed using their raw defining
+		parameters, whilst any other shape is hashed using its labels.
+		'''
+		h = hashlib.blake2b(digest_size=16)
+		h.update(str(grid_size).encode())
+		if isinstance(shape, Polygon):
+			h.update(b'polygon')
+			h.update(np.ascontiguousarray(shape.vertices, dtype=np.float64).tobytes())
+		elif isinstance(shape, Ellipse):
+			h.update(b'ellipse')
+			h.update(np.array([shape.major, shape.minor], dtype=np.float64).tobytes())
+		else:
+			h.update(type(shape).__name__.encode())
+			h.update(json.dumps(shape.__getLabels__(), sort_keys=True).encode())
+		return h.hexdigest()
+
+	def _store(self, key: str, packed: npt.NDArray[np.uint8]) -> None:
+		''' Insert a mask into memory, evicting the least recently used mask when the cache is full. '''
+		if self.max_size <= 0:
+			return
+		self._masks[key] = packed
+		self._masks.move_to_end(key)
+		while len(self._masks) > self.max_size:
+			self._masks.popitem(last=False)
+
+
+def _loadMask(path: str, grid_size: int) -> npt.NDArray[np.uint8] | None:
+	''' Load a bit-packed mask from disk, returning None when the mask is missing, incomplete or otherwise unreadable. '''
+	try:
+		packed = np.load(path)
+	except (EOFError, OSError, ValueError):
+		return None
+	return packed if packed.dtype == np.uint8 and packed.shape == (-(-grid_size * grid_size // 8),) else None
+
+
+def _saveMask(path: str, packed: npt.NDArray[np.uint8]) -> None:
+	'''
+	Save a bit-packed mask to disk. The mask is written to a temporary file in the same directory, which then atomically
+	replaces path, such that other processes never read a partially written mask.
+	'''
+	fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+	try:
+		with os.fdopen(fd, 'wb') as f:
+			np.save(f, packed)
+		os.replace(tmp, path)
+	except BaseException:
+		os.remove(tmp)
+		raise
@@ -6,20 +6,16 @@ This file contains the fixed geometric type Polygon.
 from typing import cast
 
 # dependencies
-import cv2					# image processing
 import numpy as np 			# maths
 import numpy.typing as npt	# typing for numpy
 
 # src
 from ..externals._geometry import (
-	_isConvex,
-	_isPointInsideConvexPolygon,
-	_isPointInsidePolygon,
-	_isSimple,
+	_drawPolygon,
+	_drawPolygonCoverage,
 	_normalisePolygon,
-	_polygonArea,
-	_polygonCentroid,
-	_scalePolygonByArea,
+	_Polygon,
+	_triangulatePolygon,
 )
 from .types import Shape, ShapeSettings
 
@@ -33,7 +29,10 @@ class Polygon(Shape):
 	A base class for a polygon, instantiated with an array of vertices.
 	'''
 
-	_convex: bool						# is the polygon convex or not?
+	__slots__ = ('_native', '_triangles', '_vertices')
+
+	_native: _Polygon | None			# persistent native copy of the polygon, created when first used
+	_triangles: npt.NDArray[np.int64] | None	# cached triangulation of the polygon, stored as vertex indices
 	_vertices: npt.NDArray[np.float64]	# cartesian products representing the vertices of a shape
 
 	class Settings(ShapeSettings, total=False):
@@ -51,11 +50,14 @@ class Polygon(Shape):
 	@property
 	def area(self) -> float:
 		''' An implementation of the polygon area algorithm derived using Green's Theorem. '''
-		return _polygonArea(self.vertices)
+		return self._nativePolygon().area()
 
 	@area.setter
 	def area(self, a: float) -> None:
-		self._vertices = np.array(_scalePolygonByArea(self.vertices, a))
+		native = self._nativePolygon()
+		native.scaleByArea(a)
+		self._vertices = np.array(native.vertices())
+		self._invalidate()
 
 	'''
 	Getters and setters for centroid. Setting centroid translates the polygon about the plane.
@@ -64,17 +66,24 @@ class Polygon(Shape):
 	@property
 	def centroid(self) -> tuple[float, float]:
 		''' This algorithm is used to calculate the geometric centroid of a 2D polygon. '''
-		return cast(tuple[float, float], tuple(_polygonCentroid(self.vertices)))
+		return cast(tuple[float, float], tuple(self._nativePolygon().centroid()))
 
 	@centroid.setter
 	def centroid(self, c: tuple[float, float]) -> None:
 		centroid = self.centroid
-		self._vertices[:, 0] += c[0] - centroid[0]
-		self._vertices[:, 1] += c[1] - centroid[1]
+		d = (c[0] - centroid[0], c[1] - centroid[1])
+		self._nativePolygon().translate(d)
+		# vertices which are shared with a ShapeCollection are copied before being modified
+		if not self._vertices.flags.writeable:
+			self._vertices = self._vertices.copy()
+		self._vertices[:, 0] += d[0]
+		self._vertices[:, 1] += d[1]
+		self._invalidate('boundingBox')
 
 	'''
-	Getters and setters for convex and vertices. This setup maintains that convex is a cached variable, that updates
-	whenever the vertices are updated.
+	Getters and setters for vertices. The first geometric method called after setting the vertices creates a persistent
+	native polygon, such that geometric methods do not need to convert the vertices on each call. The vertices should
+	therefore only be updated using the setter, or the setters for area and centroid.
 	'''
 
 	@property
@@ -84,57 +93,72 @@ class Polygon(Shape):
 	@vertices.setter
 	def vertices(self, v: npt.NDArray[np.float64]) -> None:
 		self._vertices = v
-		self._convex = _isConvex(v)
+		self._native = None
+		self._triangles = None
+		self._invalidate()
 		assert self.vertices.ndim == 2 and self.vertices.shape[1] == 2, 'Array of vertices is not the correct shape: (n, 2)'
 		assert self.N() >= 3, 'A polygon must have three vertices.'
 
+	@property
+	def boundingBox(self) -> tuple[tuple[float, float], tuple[float, float]]:
+		''' The axis aligned bounding box of the polygon, returned as ((x_min, y_min), (x_max, y_max)). '''
+		return self._cached('boundingBox', lambda: (
+			(float(self.vertices[:, 0].min()), float(self.vertices[:, 1].min())),
+			(float(self.vertices[:, 0].max()), float(self.vertices[:, 1].max())),
+		))
+
+	@property
+	def perimeter(self) -> float:
+		''' The sum of the lengths of each edge of the polygon. '''
+		return self._cached('perimeter', lambda: float(np.hypot(
+			*(np.roll(self.vertices, -1, axis=0) - self.vertices).T,
+		).sum()))
+
 	def __getLabels__(self) -> dict[str, list[float | int]]:
 		'''
 		This method should be used to return the metadata about the current shape.
 		'''
 		return {'N': [self.N()], 'vertices': self.vertices.tolist()}
 
+	def arePointsInside(self, P: npt.NDArray[np.float64]) -> npt.NDArray[np.bool_]:
+		'''
+		Determines for each point p in an array with the shape (n, 2) if p ∈ P, including boundaries.
+		'''
+		assert P.ndim == 2 and P.shape[1] == 2, 'arePointsInside() only supports an input of shape (n, 2).'
+		return self._nativePolygon().arePointsInside(P)
+
 	def convex(self) -> bool:
 		'''
-		Determine whether or not the polygon is convex. The convexity of the polygon is cached when the vertices are set.
+		Determine whether or not the polygon is convex. The convexity of the polygon is cached until the vertices are set.
 		This is to save time when computing other Class methods such as draw() and isPointInside().
 		'''
-		return self._convex
+		return self._nativePolygon().convex()
 
-	def draw(self, grid_size: int) -> npt.NDArray[np.int8]:
+	def draw(self, grid_size: int, out: npt.NDArray[np.int8] | None = None) -> npt.NDArray[np.int8]:
 		'''
 		This function creates a boolean mask of a manifold on a grid with dimensions R^(grid_size). The input shape is always
-		normalised to the domain R^G before being drawn.
-		'''
-		# transposing maintains that mask[x, y] works as intended
-		return cv2.fillConvexPoly(
-			np.zeros((grid_size, grid_size), 'int8'),
-			np.array(
-				[
-					[round(y * (grid_size - 1)), round(x * (grid_size - 1))]
-					for [x, y] in (
-						self.vertices if self.vertices.min() == 0. and self.vertices.max() == 1. else _normalisePolygon(
-							self.vertices,
-							False,
-						)
-					)
-				],
-				'int32',
-			),
-			(1, 0, 0),
-		).astype(np.int8) if self.convex() else cv2.fillPoly(
-			np.zeros((grid_size, grid_size), 'int8'),
-			[np.array([
-				[round(y * (grid_size - 1)), round(x * (grid_size - 1))]
-				for [x, y] in (
-					self.vertices if self.vertices.min() == 0. and self.vertices.max() == 1. else _normalisePolygon(
-						self.vertices,
-						False,
-					)
-				)
-			])],
-			(1, 0, 0),
-		).astype(np.int8)
+		normalised to the domain R^G before being drawn. The mask is optionally written into the preallocated buffer out.
+		'''
+		out = np.empty((grid_size, grid_size), np.int8) if out is None else out
+		assert out.shape == (grid_size, grid_size), 'draw() requires a buffer of shape (grid_size, grid_size).'
+		# the first axis of the mask spans the x coordinate, such that mask[x, y] works as intended
+		_drawPolygon(self._unitVertices(), out)
+		return out
+
+	def drawCoverage(
+		self,
+		grid_size: int,
+		supersample: int = 4,
+		out: npt.NDArray[np.float64] | None = None,
+	) -> npt.NDArray[np.float64]:
+		'''
+		This function calculates the fraction of each cell on a grid with dimensions R^(grid_size) that is covered by the
+		manifold, using supersample^2 samples per cell. The input shape is normalised in the same manner as draw().
+		'''
+		out = np.empty((grid_size, grid_size), np.float64) if out is None else out
+		assert out.shape == (grid_size, grid_size), 'drawCoverage() requires a buffer of shape (grid_size, grid_size).'
+		_drawPolygonCoverage(self._unitVertices(), supersample, out)
+		return out
 
 	def N(self) -> int:
 		'''
@@ -146,10 +170,46 @@ class Polygon(Shape):
 		'''
 		Determines if a given point p ∈ P, including boundaries.
 		'''
-		return _isPointInsideConvexPolygon(p, self.vertices) if self.convex() else _isPointInsidePolygon(p, self.vertices)
+		return self._nativePolygon().isPointInside(p)
+
+	def samplePoints(self, n: int, rng: np.random.Generator | None = None) -> npt.NDArray[np.float64]:
+		'''
+		Draw n points uniformly distributed within the polygon. The polygon is triangulated, a triangle is chosen for each
+		point relative to its area, and the point is then drawn uniformly within that triangle.
+		'''
+		# the triangulation is stored as indices, such that it remains valid when the polygon is scaled or translated
+		if self._triangles is None:
+			self._triangles = np.array(
+				[[0, i, i + 1] for i in range(1, self.N() - 1)] if self.convex() else _triangulatePolygon(self.vertices),
+				dtype=np.int64,
+			)
+		a, b, c = (self.vertices[self._triangles[:, i]] for i in range(3))
+		areas = np.abs((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+		t = (rng or np.random).choice(areas.shape[0], size=n, p=areas / areas.sum())
+		r_1 = np.sqrt((rng or np.random).uniform(0., 1., (n, 1)))
+		r_2 = (rng or np.random).uniform(0., 1., (n, 1))
+		return (1. - r_1) * a[t] + r_1 * (1. - r_2) * b[t] + r_1 * r_2 * c[t]
 
 	def simple(self) -> bool:
 		'''
-		Determine whether or not the polygon is simple by checking for intersections.
+		Determine whether or not the polygon is simple by checking for intersections. The result is cached until the vertices
+		are set.
+		'''
+		return self._nativePolygon().simple()
+
+	def _nativePolygon(self) -> _Polygon:
+		'''
+		Return the persistent native polygon, which is created from the vertices when first used.
+		'''
+		if self._native is None:
+			self._native = _Polygon(self._vertices)
+		return self._native
+
+	def _unitVertices(self) -> list[list[float]] | npt.NDArray[np.float64]:
+		'''
+		Return the vertices normalised to the unit interval, as used when drawing the polygon.
 		'''
-		return _isSimple(self.vertices)
+		return self.vertices if self.vertices.min() == 0. and self.vertices.max() == 1. else _normalisePolygon(
+			self.vertices,
+			False,
+		)
@@ -7,12 +7,14 @@ import random
 
 # dependencies
 import numpy as np 			# maths
+import numpy.typing as npt	# typing for numpy
 
 # src
 from ..externals._geometry import (
 	_generateConvexPolygon,
 	_generateIrregularStar,
 	_generatePolygon,
+	_generatePolygons,
 	_generateUnitRectangle,
 	# _generateUnitTriangle,
 	_normaliseConvexPolygon,
@@ -22,6 +24,9 @@ from .polygon import Polygon
 from .types import ShapeSettings
 
 __all__ = [
+	# methods
+	'generatePolygons',
+	# classes
 	'ConvexPolygon',
 	'IrregularStar',
 	'TravellingSalesmanPolygon',
@@ -35,14 +40,16 @@ class ConvexPolygon(Polygon):
 	Generate convex shapes according to Pavel Valtr's 1995 algorithm.
 	'''
 
+	__slots__ = ()
+
 	class Settings(ShapeSettings, total=False):
 		''' Settings to be used when generating. '''
 		N: int				# number of vertices (randomly generated when N < 3)
 		max_vertices: int	# maximum number of vertices when generating
 
-	def __init__(self, N: int = 0, max_vertices: int = 10) -> None:
+	def __init__(self, N: int = 0, max_vertices: int = 10, rng: np.random.Generator | None = None) -> None:
 		super().__init__(
-			_normaliseConvexPolygon(_generateConvexPolygon(N if N > 2 else random.randint(3, max_vertices)), True),
+			_normaliseConvexPolygon(_generateConvexPolygon(_vertexCount(N, max_vertices, rng), _nativeSeed(rng)), True),
 		)
 
 
@@ -53,13 +60,15 @@ class IrregularStar(Polygon):
 	polygons are generated this way.
 	'''
 
+	__slots__ = ()
+
 	class Settings(ShapeSettings, total=False):
 		''' Settings to be used when generating. '''
 		N: int				# number of vertices (randomly generated when N < 3)
 		max_vertices: int	# maximum number of vertices when generating
 
-	def __init__(self, N: int = 0, max_vertices: int = 10) -> None:
-		super().__init__(_generateIrregularStar(N if N > 2 else random.randint(3, max_vertices)))
+	def __init__(self, N: int = 0, max_vertices: int = 10, rng: np.random.Generator | None = None) -> None:
+		super().__init__(_generateIrregularStar(_vertexCount(N, max_vertices, rng), _nativeSeed(rng)))
 		self.vertices = np.array(
 			_normaliseConvexPolygon(self.vertices, True) if self.convex() else _normaliseSimplePolygon(self.vertices, True),
 		)
@@ -69,18 +78,20 @@ class TravellingSalesmanPolygon(Polygon):
 	'''
 	This algorithm is based on a method of eliminating self-intersections in a polygon by using the Lin and Kerningham
 	'2-opt' moves. Such a move eliminates an intersection between two edges by reversing the order of the vertices between
-	the edges. Intersecting edges are detected using a simple sweep through the vertices and then one intersection is
-	chosen at random to eliminate after each sweep.
+	the edges. Intersecting edges are detected using a sweep line, after which the intersections are eliminated in a random
+	order, such that every move made during one sweep is applied to a disjoint range of vertices.
 	van Leeuwen, J., & Schoone, A. A. (1982). Untangling a traveling salesman tour in the plane.
 	'''
 
+	__slots__ = ()
+
 	class Settings(ShapeSettings, total=False):
 		''' Settings to be used when generating. '''
 		N: int				# number of vertices (randomly generated when N < 3)
 		max_vertices: int	# maximum number of vertices when generating
 
-	def __init__(self, N: int = 0, max_vertices: int = 10) -> None:
-		super().__init__(_generatePolygon(N if N > 2 else random.randint(3, max_vertices)))
+	def __init__(self, N: int = 0, max_vertices: int = 10, rng: np.random.Generator | None = None) -> None:
+		super().__init__(_generatePolygon(_vertexCount(N, max_vertices, rng), _nativeSeed(rng)))
 		self.vertices = np.array(
 			_normaliseConvexPolygon(self.vertices, True) if self.convex() else _normaliseSimplePolygon(self.vertices, True),
 		)
@@ -91,14 +102,16 @@ class UnitRectangle(Polygon):
 	Define a rectangle with unit area and an aspect ration epsilon.
 	'''
 
+	__slots__ = ('epsilon',)
+
 	epsilon: float
 
 	class Settings(ShapeSettings, total=False):
 		''' Settings to be used when generating. '''
 		epsilon: float		# aspect ratio (randomly generated when epsilon = 0)
 
-	def __init__(self, epsilon: float = 0.) -> None:
-		self.epsilon = epsilon or np.random.uniform(0., 1.)
+	def __init__(self, epsilon: float = 0., rng: np.random.Generator | None = None) -> None:
+		self.epsilon = epsilon or (rng or np.random).uniform(0., 1.)
 		super().__init__(_generateUnitRectangle(self.epsilon))
 
 	def __getLabels__(self) -> dict[str, list[float | int]]:
@@ -108,6 +121,40 @@ class UnitRectangle(Polygon):
 		return {'epsilon': [self.epsilon], 'N': [self.N()], 'vertices': self.vertices.tolist()}
 
 
+def generatePolygons(
+	polygon: type[Polygon],
+	K: int,
+	N: int = 0,
+	max_vertices: int = 10,
+	seed: int | None = None,
+	start: int = 0,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]:
+	'''
+	Generate K random polygons of a given class in a single call, which is parallelised across all available cores. Each
+	polygon is generated and normalised exactly as when instantiating the class, and the output is stored as a structure of
+	arrays.
+	input:
+		polygon = the class of the random polygons.
+		K = number of polygons.
+		N = number of vertices (randomly generated for each polygon when N < 3).
+		max_vertices = maximum number of vertices when generating.
+		seed = when given, the kth polygon is generated using a random engine keyed by (seed, start + k).
+		start = the index of the first polygon, such that a seeded sequence can be generated in any number of parts.
+	output:
+		vertices = the vertices of each polygon, zero padded to the shape (K, N_max, 2).
+		N = the number of vertices of each polygon, with the shape (K,).
+	'''
+
+	method = {
+		ConvexPolygon: 'convex',
+		IrregularStar: 'irregular_star',
+		TravellingSalesmanPolygon: 'travelling_salesman',
+	}.get(polygon)
+	assert method is not None, \
+		'generatePolygons() only supports ConvexPolygon, IrregularStar and TravellingSalesmanPolygon.'
+	return _generatePolygons(method, K, N, max_vertices, seed, start)
+
+
 # class UnitTriangle(Polygon):
 # 	'''
 # 	Define a triangle with unit area. For any point (r, θ) where θ ∈ [0, π / 2] and r ∈ [0, 1], the corresponding
@@ -133,3 +180,15 @@ class UnitRectangle(Polygon):
 # 		This method should be used to return the metadata about the current shape.
 # 		'''
 # 		return {'r': [self.r], 'N': [self.N], 'theta': [self.theta], 'vertices': self.vertices.tolist()}
+
+
+def _nativeSeed(rng: np.random.Generator | None) -> int | None:
+	''' Draw the seed used by a native polygon generator, which is seeded from the operating system when rng is None. '''
+	return int(rng.integers(2 ** 63)) if rng is not None else None
+
+
+def _vertexCount(N: int, max_vertices: int, rng: np.random.Generator | None) -> int:
+	''' Determine the number of vertices of a random polygon, which is randomly generated when N < 3. '''
+	if N > 2:
+		return N
+	return int(rng.integers(3, max_vertices + 1)) if rng is not None else random.randint(3, max_vertices)
@@ -0,0 +1,172 @@
+'''
+This file contains a memory-mapped bank of pregenerated polygons, used to share shapes between samplers and processes.
+'''
+
+# core
+import json
+import os
+from typing import Any, Iterable, Iterator
+
+# dependencies
+import numpy as np 			# maths
+import numpy.typing as npt	# typing for numpy
+
+# src
+from .polygon import Polygon
+from .random_polygon import ConvexPolygon, generatePolygons, IrregularStar, TravellingSalesmanPolygon
+from .types import ShapeSettings
+
+__all__ = [
+	'ShapeBank',
+]
+
+
+class ShapeBank():
+	'''
+	A bank of pregenerated polygons stored on disk as a directory of memory-mapped arrays. The vertices of every polygon
+	are stored as one ragged array, alongside their offsets, and the centroids and bit-packed masks of each polygon at a
+	given grid size H can optionally be stored too. As every array is memory-mapped, loading a shape by index is nearly
+	free, and every process which opens the same bank shares one copy of it in the page cache.
+	'''
+
+	centroids: npt.NDArray[np.float64] | None	# centroid of each polygon, with the shape (K, 2)
+	H: int | None								# size of the grid used to draw each mask
+	masks: npt.NDArray[np.uint8] | None			# bit-packed mask of each polygon, with the shape (K, ⌈H² / 8⌉)
+	offsets: npt.NDArray[np.int64]				# index of the first vertex of each polygon, with the shape (K + 1,)
+	path: str									# directory containing the bank
+	shape: str									# name of the class used to generate the bank
+	vertices: npt.NDArray[np.float64]			# vertices of every polygon, with the shape (ΣN, 2)
+
+	def __init__(self, path: str) -> None:
+		'''
+		Open an existing shape bank.
+		input:
+			path	the directory containing the bank
+		'''
+		self.path = path
+		with open(os.path.join(path, 'meta.json')) as f:
+			meta = json.load(f)
+		self.H = meta['H']
+		self.shape = meta['shape']
+		self.offsets = np.load(os.path.join(path, 'offsets.npy'), mmap_mode='r')
+		self.vertices = np.load(os.path.join(path, 'vertices.npy'), mmap_mode='r')
+		self.centroids = np.load(os.path.join(path, 'centroids.npy'), mmap_mode='r') if meta['centroids'] else None
+		self.masks = np.load(os.path.join(path, 'masks.npy'), mmap_mode='r') if self.H is not None else None
+
+	def __getitem__(self, i: int) -> Polygon:
+		''' Load a polygon from the bank. '''
+		return Polygon(self.getVertices(i))
+
+	def __iter__(self) -> Iterator[Polygon]:
+		''' Iterate over every polygon in the bank. '''
+		for i in range(len(self)):
+			yield self[i]
+
+	def __len__(self) -> int:
+		''' The amount of polygons stored in the bank. '''
+		return len(self.offsets) - 1
+
+	@staticmethod
+	def create(
+		path: str,
+		shapes: Iterable[Polygon],
+		K: int,
+		H: int | None = None,
+		centroids: bool = True,
+		shape: str = 'Polygon',
+	) -> 'ShapeBank':
+		'''
+		Write a collection of polygons to a new shape bank. The masks are streamed to disk as each shape is drawn, such that
+		only the vertices are held in memory whilst the bank is being written.
+		input:
+			path		the directory used to store the bank
+			shapes		the polygons stored in the bank
+			K			the amount of polygons stored in the bank
+			H			the size of the grid used to draw each mask (masks are not stored when H is None)
+			centroids	should the centroid of each polygon be stored?
+			shape		the name of the class used to generate the polygons
+		'''
+		os.makedirs(path, exist_ok=True)
+		vertices: list[npt.NDArray[np.float64]] = []
+		offsets = np.zeros(K + 1, dtype=np.int64)
+		C = np.lib.format.open_memmap(
+			os.path.join(path, 'centroids.npy'), mode='w+', dtype=np.float64, shape=(K, 2),
+		) if centroids else None
+		M = np.lib.format.open_memmap(
+			os.path.join(path, 'masks.npy'), mode='w+', dtype=np.uint8, shape=(K, (H * H + 7) // 8),
+		) if H is not None else None
+		B = np.zeros((H, H), dtype=np.int8) if H is not None else None
+		k = -1
+		for k, S in enumerate(shapes):
+			assert k < K, 'ShapeBank.create() received more than K shapes.'
+			vertices.append(np.asarray(S.vertices, dtype=np.float64))
+			offsets[k + 1] = offsets[k] + S.N()
+			if C is not None:
+				C[k] = S.centroid
+			if M is not None and B is not None and H is not None:
+				M[k] = np.packbits(S.draw(H, out=B).astype(np.bool_))
+		assert k + 1 == K, 'ShapeBank.create() received fewer than K shapes.'
+		np.save(os.path.join(path, 'offsets.npy'), offsets)
+		np.save(os.path.join(path, 'vertices.npy'), np.concatenate(vertices) if vertices else np.empty((0, 2)))
+		for memmap in [C, M]:
+			if memmap is not None:
+				memmap.flush()
+		with open(os.path.join(path, 'meta.json'), 'w') as f:
+			json.dump({'centroids': centroids, 'H': H, 'K': K, 'shape': shape}, f)
+		return ShapeBank(path)
+
+	@staticmethod
+	def generate(
+		path: str,
+		polygon: type[Polygon],
+		K: int,
+		H: int | None = None,
+		centroids: bool = True,
+		shape_settings: ShapeSettings | None = None,
+		chunk_size: int = 4096,
+	) -> 'ShapeBank':
+		'''
+		Generate K random polygons of a given class and write them to a new shape bank. Random polygons which are supported
+		by generatePolygons() are generated natively in parallel, in chunks, whilst any other class is instantiated once
+		per shape using its shape_settings.
+		'''
+		settings: dict[str, Any] = dict(shape_settings or {})
+
+		def shapes() -> Iterator[Polygon]:
+			if polygon in [ConvexPolygon, IrregularStar, TravellingSalesmanPolygon]:
+				for start in range(0, K, chunk_size):
+					V, N = generatePolygons(
+						polygon,
+						min(chunk_size, K - start),
+						settings.get('N', 0),
+						settings.get('max_vertices', 10),
+					)
+					for v, n in zip(V, N):
+						yield Polygon(v[:n])
+			else:
+				for _ in range(K):
+					yield polygon(**settings)
+
+		return ShapeBank.create(path, shapes(), K, H, centroids, polygon.__name__)
+
+	def getCentroid(self, i: int) -> tuple[float, float]:
+		''' Load the centroid of a polygon, which is calculated when the bank does not store centroids. '''
+		if self.centroids is None:
+			return self[i].centroid
+		return (float(self.centroids[i, 0]), float(self.centroids[i, 1]))
+
+	def getMask(self, i: int, out: npt.NDArray[np.int8] | None = None) -> npt.NDArray[np.int8]:
+		'''
+		Unpack the mask of a polygon, optionally into the preallocated buffer out. The mask is identical to the output of
+		Shape.draw(H).
+		'''
+		assert self.masks is not None and self.H is not None, 'ShapeBank.getMask() requires a bank which stores masks.'
+		mask = np.unpackbits(self.masks[i], count=self.H * self.H).reshape(self.H, self.H).view(np.int8)
+		if out is None:
+			return mask
+		out[:] = mask
+		return out
+
+	def getVertices(self, i: int) -> npt.NDArray[np.float64]:
+		''' Load the vertices of a polygon, as a read-only view of the bank. '''
+		return self.vertices[self.offsets[i]:self.offsets[i + 1]]
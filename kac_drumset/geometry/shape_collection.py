@@ -0,0 +1,127 @@
+'''
+This file contains a container which stores many shapes in contiguous arrays.
+'''
+
+# core
+from typing import Any, Iterable, Iterator
+
+# dependencies
+import numpy as np 			# maths
+import numpy.typing as npt	# typing for numpy
+
+# src
+from .ellipse import Circle, Ellipse
+from .polygon import Polygon
+from .types import Shape
+
+__all__ = [
+	'ShapeCollection',
+]
+
+# the kind of each shape stored in a collection
+_POLYGON = 0
+_ELLIPSE = 1
+_CIRCLE = 2
+
+
+class ShapeCollection():
+	'''
+	A collection of shapes stored as a structure of contiguous arrays, rather than as a list of individual objects. The
+	vertices of every polygon are stored as one ragged array, alongside their offsets, whilst the axes and centroids of
+	every ellipse are stored as arrays with the shape (E, 2). Indexing the collection returns a lightweight view of a
+	shape, which supports the full Shape API and shares its vertices with the collection. Views are copy-on-write, such
+	that transforming a view never modifies the collection.
+	'''
+
+	axes: npt.NDArray[np.float64]		# major and minor axes of each ellipse, with the shape (E, 2)
+	centroids: npt.NDArray[np.float64]	# centroid of each ellipse, with the shape (E, 2)
+	index: npt.NDArray[np.int64]		# index of each shape amongst the shapes of the same kind, with the shape (K,)
+	kinds: npt.NDArray[np.int8]			# kind of each shape (polygon, ellipse or circle), with the shape (K,)
+	offsets: npt.NDArray[np.int64]		# index of the first vertex of each polygon, with the shape (P + 1,)
+	vertices: npt.NDArray[np.float64]	# vertices of every polygon, with the shape (ΣN, 2)
+
+	def __init__(self, shapes: Iterable[Shape] = []) -> None:
+		'''
+		Pack a collection of shapes into contiguous arrays. Polygons are stored using their vertices, such that subclasses of
+		Polygon are returned as an instance of Polygon, and similarly subclasses of Ellipse (other than Circle) are returned
+		as an instance of Ellipse.
+		'''
+		kinds: list[int] = []
+		index: list[int] = []
+		vertices: list[npt.NDArray[np.float64]] = []
+		offsets: list[int] = [0]
+		axes: list[tuple[float, float]] = []
+		centroids: list[tuple[float, float]] = []
+		for S in shapes:
+			if isinstance(S, Polygon):
+				kinds.append(_POLYGON)
+				index.append(len(vertices))
+				vertices.append(np.asarray(S.vertices, dtype=np.float64))
+				offsets.append(offsets[-1] + S.N())
+			else:
+				assert isinstance(S, Ellipse), 'ShapeCollection only supports instances of Polygon and Ellipse.'
+				kinds.append(_CIRCLE if isinstance(S, Circle) else _ELLIPSE)
+				index.append(len(axes))
+				axes.append((S.major, S.minor))
+				centroids.append(S.centroid)
+		self.kinds = np.array(kinds, dtype=np.int8)
+		self.index = np.array(index, dtype=np.int64)
+		self.offsets = np.array(offsets, dtype=np.int64)
+		self.vertices = np.concatenate(vertices) if vertices else np.empty((0, 2), dtype=np.float64)
+		self.axes = np.array(axes, dtype=np.float64).reshape(-1, 2)
+		self.centroids = np.array(centroids, dtype=np.float64).reshape(-1, 2)
+
+	def __getitem__(self, i: int) -> Shape:
+		''' Return a view of a shape in the collection. '''
+		j = int(self.index[i])
+		if self.kinds[i] == _POLYGON:
+			return self.getPolygon(j)
+		if self.kinds[i] == _CIRCLE:
+			return Circle(float(self.axes[j, 0]), (float(self.centroids[j, 0]), float(self.centroids[j, 1])))
+		return Ellipse(
+			float(self.axes[j, 0]),
+			float(self.axes[j, 1]),
+			(float(self.centroids[j, 0]), float(self.centroids[j, 1])),
+		)
+
+	def __iter__(self) -> Iterator[Shape]:
+		''' Iterate over a view of every shape in the collection. '''
+		for i in range(len(self)):
+			yield self[i]
+
+	def __len__(self) -> int:
+		''' The amount of shapes stored in the collection. '''
+		return len(self.kinds)
+
+	@property
+	def nbytes(self) -> int:
+		''' The amount of memory used by the arrays of the collection. '''
+		arrays: list[npt.NDArray[Any]] = [self.axes, self.centroids, self.index, self.kinds, self.offsets, self.vertices]
+		return sum(A.nbytes for A in arrays)
+
+	@staticmethod
+	def fromPolygons(vertices: npt.NDArray[np.float64], offsets: npt.NDArray[np.int64]) -> 'ShapeCollection':
+		'''
+		Create a collection of polygons directly from a ragged array of vertices and their offsets, such as the arrays of a
+		ShapeBank, without copying the vertices.
+		'''
+		assert vertices.ndim == 2 and vertices.shape[1] == 2, 'Array of vertices is not the correct shape: (n, 2)'
+		assert offsets.ndim == 1 and offsets[-1] == vertices.shape[0], 'The offsets do not match the array of vertices.'
+		collection = ShapeCollection()
+		collection.kinds = np.full(len(offsets) - 1, _POLYGON, dtype=np.int8)
+		collection.index = np.arange(len(offsets) - 1, dtype=np.int64)
+		collection.offsets = offsets
+		collection.vertices = vertices
+		return collection
+
+	def getPolygon(self, j: int) -> Polygon:
+		'''
+		Return a view of the jth polygon in the collection, whose vertices are a read-only view of the collection. The native
+		polygon and the cache of the view are only created when first used.
+		'''
+		v = self.vertices[self.offsets[j]:self.offsets[j + 1]]
+		v.flags.writeable = False
+		# bypass Polygon.__init__(), which copies the vertices
+		P = Polygon.__new__(Polygon)
+		P.vertices = v
+		return P
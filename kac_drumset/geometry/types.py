@@ -4,7 +4,7 @@ This file contains the abstract base class for every two-dimensional shape.
 
 # core
 from abc import ABC, abstractmethod
-from typing import TypedDict
+from typing import Any, Callable, TypedDict, TypeVar, cast
 
 # dependencies
 import numpy as np 			# maths
@@ -15,6 +15,8 @@ __all__ = [
 	'ShapeSettings',
 ]
 
+_T = TypeVar('_T')
+
 
 class ShapeSettings(TypedDict, total=False):
 	''' Placeholder for custom ShapeSettings. '''
@@ -26,6 +28,10 @@ class Shape(ABC):
 	An abstract base class for a two dimensional manifold in Euclidean geometry.
 	'''
 
+	__slots__ = ('_cache',)
+
+	_cache: dict[str, Any]	# derived quantities of the shape, created lazily and cleared whenever the shape changes
+
 	def __init__(self) -> None:
 		pass
 
@@ -60,11 +66,47 @@ class Shape(ABC):
 		'''
 		pass
 
+	@property
+	@abstractmethod
+	def boundingBox(self) -> tuple[tuple[float, float], tuple[float, float]]:
+		'''
+		The axis aligned bounding box of a 2D manifold, returned as ((x_min, y_min), (x_max, y_max)).
+		'''
+		pass
+
+	@property
+	@abstractmethod
+	def perimeter(self) -> float:
+		'''
+		Calculate the length of the boundary of a 2D manifold.
+		'''
+		pass
+
+	@abstractmethod
+	def arePointsInside(self, P: npt.NDArray[np.float64]) -> npt.NDArray[np.bool_]:
+		'''
+		Determines for each point p in an array with the shape (n, 2) if p ∈ S, including boundaries.
+		'''
+		pass
+
 	@abstractmethod
-	def draw(self, grid_size: int) -> npt.NDArray[np.int8]:
+	def draw(self, grid_size: int, out: npt.NDArray[np.int8] | None = None) -> npt.NDArray[np.int8]:
 		'''
 		This function creates a boolean mask of a manifold on a grid with dimensions R^(grid_size). The input shape is always
-		normalised to the domain R^G before being drawn.
+		normalised to the domain R^G before being drawn. The mask is optionally written into the preallocated buffer out.
+		'''
+		pass
+
+	@abstractmethod
+	def drawCoverage(
+		self,
+		grid_size: int,
+		supersample: int = 4,
+		out: npt.NDArray[np.float64] | None = None,
+	) -> npt.NDArray[np.float64]:
+		'''
+		This function calculates the fraction of each cell on a grid with dimensions R^(grid_size) that is covered by the
+		manifold, using supersample^2 samples per cell. The input shape is normalised in the same manner as draw().
 		'''
 		pass
 
@@ -74,3 +116,35 @@ class Shape(ABC):
 		Determines if a given point p ∈ P, including boundaries.
 		'''
 		pass
+
+	@abstractmethod
+	def samplePoints(self, n: int, rng: np.random.Generator | None = None) -> npt.NDArray[np.float64]:
+		'''
+		Draw n points uniformly distributed within the shape, returned as an array with the shape (n, 2). The points are
+		drawn using rng when it is given, or otherwise using the global numpy random state.
+		'''
+		pass
+
+	def _cached(self, key: str, f: Callable[[], _T]) -> _T:
+		'''
+		Return a derived quantity of the shape, which is calculated using f() when first requested and then cached until
+		the shape is next changed.
+		'''
+		# the cache is only created once a derived quantity is first requested, such that views of shapes are lightweight
+		if not hasattr(self, '_cache'):
+			self._cache = {}
+		if key not in self._cache:
+			self._cache[key] = f()
+		return cast(_T, self._cache[key])
+
+	def _invalidate(self, *keys: str) -> None:
+		'''
+		Clear the given derived quantities from the cache, or every derived quantity when no keys are given.
+		'''
+		if not hasattr(self, '_cache'):
+			return
+		if keys:
+			for key in keys:
+				self._cache.pop(key, None)
+		else:
+			self._cache.clear()
@@ -3,10 +3,20 @@ from ..externals._physics import (
 	besselJZero,
 )
 from .fdtd import (
+	CompactMatrix,
+	CompactMatrixBatch,
 	FDTD_2D,
+	FDTDWorkspace,
 	FDTDWaveform2D,
+	FDTDWaveforms2D,
 	raisedCosine,
+	raisedCosineBatch,
+	raisedCosineBatchCompact,
+	raisedCosineCompact,
 	raisedTriangle,
+	raisedTriangleBatch,
+	raisedTriangleBatchCompact,
+	raisedTriangleCompact,
 )
 from .modes import (
 	circularAmplitudes,
@@ -18,6 +28,8 @@ from .modes import (
 	rectangularChladniPattern,
 	rectangularSeries,
 	WaveEquationWaveform2D,
+	WaveEquationWaveformBatch2D,
+	WaveEquationWaveforms2D,
 )
 
 __all__ = [
@@ -30,12 +42,25 @@ __all__ = [
 	'equilateralTriangleAmplitudes',
 	'equilateralTriangleSeries',
 	'FDTDWaveform2D',
+	'FDTDWaveforms2D',
 	'raisedCosine',
+	'raisedCosineBatch',
+	'raisedCosineBatchCompact',
+	'raisedCosineCompact',
 	'raisedTriangle',
+	'raisedTriangleBatch',
+	'raisedTriangleBatchCompact',
+	'raisedTriangleCompact',
 	'rectangularAmplitudes',
 	'rectangularChladniPattern',
 	'rectangularSeries',
 	'WaveEquationWaveform2D',
+	'WaveEquationWaveformBatch2D',
+	'WaveEquationWaveforms2D',
 	# classes
 	'FDTD_2D',
+	'FDTDWorkspace',
+	# types
+	'CompactMatrix',
+	'CompactMatrixBatch',
 ]
@@ -2,6 +2,10 @@
 Import FDTD functions from external C++ library and configure python type conversions.
 '''
 
+# core
+import math
+from typing import Any, cast, TypeAlias
+
 # dependencies
 import numpy as np 			# maths
 import numpy.typing as npt	# typing for numpy
@@ -10,6 +14,8 @@ import numpy.typing as npt	# typing for numpy
 from ..externals._physics import (
 	_FDTDUpdate2D,
 	_FDTDWaveform2D,
+	_FDTDWaveforms2D,
+	_FDTDWorkspace,
 	_raisedCosine1D,
 	_raisedCosine2D,
 	_raisedTriangle1D,
@@ -19,12 +25,28 @@ from ..externals._physics import (
 __all__ = [
 	# methods
 	'FDTDWaveform2D',
+	'FDTDWaveforms2D',
 	'raisedCosine',
+	'raisedCosineBatch',
+	'raisedCosineBatchCompact',
+	'raisedCosineCompact',
 	'raisedTriangle',
+	'raisedTriangleBatch',
+	'raisedTriangleBatchCompact',
+	'raisedTriangleCompact',
 	# classes
 	'FDTD_2D',
+	'FDTDWorkspace',
+	# types
+	'CompactMatrix',
+	'CompactMatrixBatch',
 ]
 
+# a matrix which is zero outside of a dense window, stored alongside the index of the first element of the window
+CompactMatrix: TypeAlias = tuple[npt.NDArray[np.float64], tuple[int, ...]]
+# a batch of K compact matrices, whose windows share the shape (K, W_0, ...) alongside offsets with the shape (K, D)
+CompactMatrixBatch: TypeAlias = tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]
+
 
 class FDTD_2D():
 	'''
@@ -136,9 +158,99 @@ class FDTD_2D():
 			raise StopIteration
 
 
+class FDTDWorkspace():
+	'''
+	A reusable workspace for simulating a 2 dimensional FDTD scheme. The workspace owns the grids, the boundary conditions
+	and the waveforms of every simulation, which are allocated once for a maximum grid size, such that it can be reused
+	for any amount of drums and strikes without allocating memory. Each lane of the workspace owns a pair of grids, and
+	the lanes of a batch are simulated in parallel.
+	workspace = FDTDWorkspace((X, Y), T, lanes=K)
+	workspace.setBoundary(B)
+	waveform = workspace.render(u_0, u_1, c_0, c_1, c_2, w)
+	The waveforms returned by render() and renderBatch() are a view of the workspace, and are overwritten by the next
+	render.
+	'''
+
+	_native: _FDTDWorkspace		# persistent native workspace
+	lanes: int					# maximum amount of waveforms simulated by one render
+	size: tuple[int, int]		# maximum size of the boundary conditions
+	T: int						# length of each waveform in samples
+
+	def __init__(self, size: tuple[int, int], T: int, lanes: int = 1) -> None:
+		'''
+		Allocate the workspace.
+		input:
+			size = maximum size of the boundary conditions (X, Y).
+			T = length of each waveform in samples.
+			lanes = maximum amount of waveforms simulated by one render.
+		'''
+
+		assert lanes > 0, 'FDTDWorkspace() requires at least one lane.'
+		self._native = _FDTDWorkspace(size[0], size[1], T, lanes)
+		self.lanes = lanes
+		self.size = size
+		self.T = T
+
+	def gridSize(self) -> tuple[int, int]:
+		''' The size of the current boundary conditions. '''
+		X, Y = self._native.gridSize()
+		return X, Y
+
+	def render(
+		self,
+		u_0: npt.NDArray[np.float64] | CompactMatrix,
+		u_1: npt.NDArray[np.float64] | CompactMatrix,
+		c_0: float,
+		c_1: float,
+		c_2: float,
+		w: tuple[int, int],
+		c_3: float = 0.,
+	) -> npt.NDArray[np.float64]:
+		'''
+		Generate a waveform for the current boundary conditions. See FDTDWaveform2D() for a parameter description, except
+		that the waveform is sampled at the grid index w. When c_3 is nonzero, the diagonal neighbours of each cell are
+		weighted by c_3, such that the scheme uses a compact 9-point stencil.
+		output:
+			waveform = W[n], with the shape (T,).
+		'''
+
+		window, offset = _asCompact(u_1)
+		waveforms = self.renderBatch(u_0, (window[np.newaxis], np.array([offset])), c_0, c_1, c_2, w, c_3)
+		return waveforms[0, :]
+
+	def renderBatch(
+		self,
+		u_0: npt.NDArray[np.float64] | CompactMatrix,
+		U_1: npt.NDArray[np.float64] | list[CompactMatrix] | CompactMatrixBatch,
+		c_0: float,
+		c_1: float,
+		c_2: float,
+		w: tuple[int, int],
+		c_3: float = 0.,
+	) -> npt.NDArray[np.float64]:
+		'''
+		Generate a batch of waveforms for the current boundary conditions, such as one waveform per strike location. See
+		FDTDWaveforms2D() for a parameter description, except that the waveforms are sampled at the grid index w, and see
+		render() for a description of c_3.
+		output:
+			waveforms = W[k, n], with the shape (K, T).
+		'''
+
+		U_1 = U_1 if isinstance(U_1, tuple) else _asBatch(U_1)
+		return self._native.render(*_asCompact(u_0), *U_1, c_0, c_1, c_2, w, c_3)[:U_1[0].shape[0]]
+
+	def setBoundary(self, B: npt.NDArray[np.int8]) -> None:
+		'''
+		Copy the boundary conditions of a drum into the workspace. B may be any size up to FDTDWorkspace.size, and its
+		outermost cells are always fixed.
+		'''
+
+		self._native.setBoundary(B)
+
+
 def FDTDWaveform2D(
-	u_0: npt.NDArray[np.float64],
-	u_1: npt.NDArray[np.float64],
+	u_0: npt.NDArray[np.float64] | CompactMatrix,
+	u_1: npt.NDArray[np.float64] | CompactMatrix,
 	B: npt.NDArray[np.int8],
 	c_0: float,
 	c_1: float,
@@ -147,7 +259,9 @@ def FDTDWaveform2D(
 	w: tuple[float, float],
 ) -> npt.NDArray[np.float64]:
 	'''
-	Generates a waveform using a 2 dimensional FDTD scheme. See `fdtd.hpp` for a parameter description.
+	Generates a waveform using a 2 dimensional FDTD scheme. See `fdtd.hpp` for a parameter description. The initial
+	conditions can be given as compact matrices, which are expanded natively to the size of B, such that a local
+	excitation is never stored as a full grid.
 	input:
 		u_0 = initial fdtd grid at t = 0.
 		u_1 = initial fdtd grid at t = 1.
@@ -164,7 +278,51 @@ def FDTDWaveform2D(
 			) + c_1 * u_n_x_y - c_2 * (u_n-1_x_y) ∀ u ∈ R^2
 	'''
 
-	return np.array(_FDTDWaveform2D(u_0, u_1, B, c_0, c_1, c_2, T, w))
+	return np.array(_FDTDWaveform2D(*_asCompact(u_0), *_asCompact(u_1), B, c_0, c_1, c_2, T, w))
+
+
+def FDTDWaveforms2D(
+	u_0: npt.NDArray[np.float64] | CompactMatrix,
+	U_1: npt.NDArray[np.float64] | list[CompactMatrix] | CompactMatrixBatch,
+	B: npt.NDArray[np.int8],
+	c_0: float,
+	c_1: float,
+	c_2: float,
+	T: int,
+	w: tuple[float, float],
+) -> npt.NDArray[np.float64]:
+	'''
+	Generates a batch of waveforms for the same drum using a 2 dimensional FDTD scheme, such as one waveform per strike
+	location. Each waveform is equal to FDTDWaveform2D(u_0, U_1[k], ...), and the batch is simulated in parallel.
+	input:
+		u_0 = initial fdtd grid at t = 0, shared by every waveform.
+		U_1 = initial fdtd grids at t = 1, with the shape (K, X, Y), or a list or batch of K compact matrices.
+		B = boundary conditions.
+		c_0 = first fdtd coefficient related to the decay term and the courant number.
+		c_1 = second fdtd coefficient related to the decay term and the courant number.
+		c_2 = third fdtd coefficient related to the decay term.
+		T = length of simulation in samples.
+		w = the coordinate at which the waveforms are sampled ∈ ℝ^2, [0. 1.].
+	output:
+		waveforms = W[k, n], with the shape (K, T).
+	'''
+
+	if isinstance(U_1, np.ndarray):
+		assert U_1.ndim == 3 and U_1.shape[1:] == B.shape, \
+			'FDTDWaveforms2D() only supports initial conditions with the shape (K, X, Y).'
+	compact = [(window, tuple(offset)) for window, offset in zip(*U_1)] if isinstance(U_1, tuple) \
+		else [_asCompact(u_1) for u_1 in U_1]
+	return np.array(_FDTDWaveforms2D(
+		*_asCompact(u_0),
+		[window for window, _ in compact],
+		[offset for _, offset in compact],
+		B,
+		c_0,
+		c_1,
+		c_2,
+		T,
+		w,
+	)).reshape(len(compact), T)
 
 
 def raisedCosine(
@@ -194,6 +352,81 @@ def raisedCosine(
 	))
 
 
+def raisedCosineBatch(
+	matrix_size: tuple[int, ...],
+	mu: npt.ArrayLike,
+	sigma: npt.ArrayLike = 0.5,
+) -> npt.NDArray[np.float64]:
+	'''
+	Creates a batch of K raised cosine distributions using broadcasting, such that the kth distribution is equal to
+	raisedCosine(matrix_size, mu[k], sigma[k]).
+	input:
+		matrix_size = A tuple representing the size of each matrix.
+		μ = The centre of each distribution, with the shape (K, D).
+		σ = The radius of each distribution, as a scalar or with the shape (K,).
+	output:
+		distributions with the shape (K, *matrix_size).
+	'''
+
+	centres, widths = _batchParameters(matrix_size, mu, sigma)
+	return _raisedCosines(matrix_size, [np.arange(n)[np.newaxis] for n in matrix_size], centres, widths)
+
+
+def raisedCosineBatchCompact(
+	matrix_size: tuple[int, ...],
+	mu: npt.ArrayLike,
+	sigma: npt.ArrayLike = 0.5,
+) -> CompactMatrixBatch:
+	'''
+	Creates a batch of K raised cosine distributions using broadcasting, stored as a batch of compact matrices. Every
+	window spans 2⌈max(σ)⌉ + 1 elements along each axis, starting at ⌈μ - σ⌉, and is zero outside of the matrix.
+	input:
+		matrix_size = A tuple representing the size of each matrix.
+		μ = The centre of each distribution, with the shape (K, D).
+		σ = The radius of each distribution, as a scalar or with the shape (K,).
+	output:
+		windows = the support of each distribution, with the shape (K, W, ...).
+		offsets = the index of windows[k, 0] in the kth matrix, with the shape (K, D).
+	'''
+
+	centres, widths = _batchParameters(matrix_size, mu, sigma)
+	offsets = np.ceil(centres - widths[:, np.newaxis]).astype(np.int64)
+	W = 2 * math.ceil(widths.max(initial=0.)) + 1
+	return _raisedCosines(
+		matrix_size,
+		[offsets[:, d, np.newaxis] + np.arange(W) for d in range(len(matrix_size))],
+		centres,
+		widths,
+	), offsets
+
+
+def raisedCosineCompact(
+	matrix_size: tuple[int, ...],
+	mu: tuple[float] | tuple[float, float],
+	sigma: float = 0.5,
+) -> CompactMatrix:
+	'''
+	Creates a raised cosine distribution centred at mu, stored as a compact matrix. The window spans only the support of
+	the distribution, |x - μ| ≤ σ, such that the cost is independent of the size of the matrix.
+	input:
+		matrix_size = A tuple representing the size of the full matrix.
+		μ = The coordinate used to represent the centre of the cosine distribution.
+		σ = The radius of the distribution.
+	output:
+		window = raisedCosine(matrix_size, mu, sigma) restricted to its support.
+		offset = the index of window[0] in the full matrix.
+	'''
+
+	offset, size = _window(matrix_size, [(m - sigma, m + sigma) for m in mu])
+	if not all(size):
+		return np.zeros(size), offset
+	return raisedCosine(
+		size,
+		cast(tuple[float, float], tuple(m - o for m, o in zip(mu, offset))),
+		sigma,
+	), offset
+
+
 def raisedTriangle(
 	matrix_size: tuple[int, ...],
 	mu: tuple[float] | tuple[float, float],
@@ -244,3 +477,188 @@ def raisedTriangle(
 			y_ab[0],
 			y_ab[1],
 		))
+
+
+def raisedTriangleBatch(
+	matrix_size: tuple[int, ...],
+	mu: npt.ArrayLike,
+	x_ab: npt.ArrayLike | None = None,
+	y_ab: npt.ArrayLike | None = None,
+) -> npt.NDArray[np.float64]:
+	'''
+	Calculate a batch of K triangular distributions using broadcasting, such that the kth distribution is equal to
+	raisedTriangle(matrix_size, mu[k], x_ab[k], y_ab[k]).
+	input:
+		size = the size of each matrix.
+		μ = the maxima of each triangle, with the shape (K, D).
+		x_ab = minimum and maximum x value for each distribution, with the shape (2,) or (K, 2).
+		y_ab = minimum and maximum y value for each distribution, with the shape (2,) or (K, 2).
+	output:
+		distributions with the shape (K, *matrix_size).
+	'''
+
+	centres, ab = _batchTriangleParameters(matrix_size, mu, x_ab, y_ab)
+	return _raisedTriangles(matrix_size, [np.arange(n)[np.newaxis] for n in matrix_size], centres, ab)
+
+
+def raisedTriangleBatchCompact(
+	matrix_size: tuple[int, ...],
+	mu: npt.ArrayLike,
+	x_ab: npt.ArrayLike | None = None,
+	y_ab: npt.ArrayLike | None = None,
+) -> CompactMatrixBatch:
+	'''
+	Calculate a batch of K triangular distributions using broadcasting, stored as a batch of compact matrices. Every window
+	spans ⌈max(b - a)⌉ + 1 elements along each axis, starting at ⌈a⌉, and is zero outside of the matrix.
+	input:
+		size = the size of each matrix.
+		μ = the maxima of each triangle, with the shape (K, D).
+		x_ab = minimum and maximum x value for each distribution, with the shape (2,) or (K, 2).
+		y_ab = minimum and maximum y value for each distribution, with the shape (2,) or (K, 2).
+	output:
+		windows = the support of each distribution, with the shape (K, W_x, ...).
+		offsets = the index of windows[k, 0] in the kth matrix, with the shape (K, D).
+	'''
+
+	centres, ab = _batchTriangleParameters(matrix_size, mu, x_ab, y_ab)
+	offsets = np.ceil(ab[:, :, 0]).astype(np.int64)
+	W = [math.ceil((ab[:, d, 1] - ab[:, d, 0]).max(initial=0.)) + 1 for d in range(len(matrix_size))]
+	return _raisedTriangles(
+		matrix_size,
+		[offsets[:, d, np.newaxis] + np.arange(W[d]) for d in range(len(matrix_size))],
+		centres,
+		ab,
+	), offsets
+
+
+def raisedTriangleCompact(
+	matrix_size: tuple[int, ...],
+	mu: tuple[float] | tuple[float, float],
+	x_ab: tuple[float, float] | None = None,
+	y_ab: tuple[float, float] | None = None,
+) -> CompactMatrix:
+	'''
+	Calculate a one or two dimensional triangular distribution, stored as a compact matrix. The window spans only the
+	support of the distribution, a ≤ x ≤ b, such that the cost is independent of the size of the matrix.
+	input:
+		size = the size of the full matrix.
+		μ = a cartesian point representing the maxima of the triangle.
+		x_ab = minimum and maximum x value for the distribution.
+		y_ab = minimum and maximum y value for the distribution.
+	output:
+		window = raisedTriangle(matrix_size, mu, x_ab, y_ab) restricted to its support.
+		offset = the index of window[0] in the full matrix.
+	'''
+
+	ab = [x_ab or (0, matrix_size[0] - 1), y_ab or (0, matrix_size[-1] - 1)][:len(mu)]
+	offset, size = _window(matrix_size, ab)
+	if not all(size):
+		return np.zeros(size), offset
+	return raisedTriangle(
+		size,
+		cast(tuple[float, float], tuple(m - o for m, o in zip(mu, offset))),
+		*[(a - o, b - o) for (a, b), o in zip(ab, offset)],
+	), offset
+
+
+def _asCompact(u: npt.NDArray[np.float64] | CompactMatrix) -> CompactMatrix:
+	''' Represent a dense matrix as a compact matrix, whose window is the entire matrix. '''
+	return u if isinstance(u, tuple) else (u, (0, 0))
+
+
+def _asBatch(U: npt.NDArray[np.float64] | list[CompactMatrix]) -> CompactMatrixBatch:
+	'''
+	Represent a batch of dense matrices, or a list of compact matrices, as a batch of compact matrices. Compact windows
+	of different sizes are zero padded to a common size.
+	'''
+	if isinstance(U, np.ndarray):
+		return U, np.zeros((U.shape[0], U.ndim - 1), dtype=np.int64)
+	size = tuple(max(window.shape[d] for window, _ in U) for d in range(2)) if U else (0, 0)
+	windows = np.zeros((len(U), *size))
+	for k, (window, _) in enumerate(U):
+		windows[k, :window.shape[0], :window.shape[1]] = window
+	return windows, np.array([offset for _, offset in U], dtype=np.int64).reshape(len(U), 2)
+
+
+def _batchAxis(x: npt.NDArray[Any], d: int, D: int) -> npt.NDArray[Any]:
+	''' Reshape an array with the shape (K, n) such that it broadcasts along the dth of D axes. '''
+	return x.reshape(x.shape[0], *[x.shape[1] if i == d else 1 for i in range(D)])
+
+
+def _batchParameters(
+	matrix_size: tuple[int, ...],
+	mu: npt.ArrayLike,
+	sigma: npt.ArrayLike,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+	''' Validate the centres and widths of a batch of distributions, broadcasting the widths to the shape (K,). '''
+	centres = np.asarray(mu, dtype=np.float64).reshape(-1, len(matrix_size))
+	assert len(matrix_size) <= 2, 'Batched distributions only support one or two dimensional inputs.'
+	return centres, np.broadcast_to(np.asarray(sigma, dtype=np.float64), centres.shape[:1])
+
+
+def _batchTriangleParameters(
+	matrix_size: tuple[int, ...],
+	mu: npt.ArrayLike,
+	x_ab: npt.ArrayLike | None,
+	y_ab: npt.ArrayLike | None,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+	''' Validate the maxima and bounds of a batch of triangles, broadcasting the bounds to the shape (K, D, 2). '''
+	centres, _ = _batchParameters(matrix_size, mu, 0.)
+	ab = np.stack([
+		np.broadcast_to(np.asarray(bounds if bounds is not None else (0, n - 1), dtype=np.float64), (centres.shape[0], 2))
+		for n, bounds in zip(matrix_size, [x_ab, y_ab])
+	], axis=1)
+	assert np.all(ab[:, :, 0] <= centres) and np.all(ab[:, :, 1] >= centres)
+	return centres, ab
+
+
+def _inside(matrix_size: tuple[int, ...], axes: list[npt.NDArray[np.int64]]) -> npt.NDArray[np.bool_]:
+	''' Determine which coordinates of a batch of windows lie inside of the matrix. '''
+	D = len(matrix_size)
+	inside = np.ones((1, *[1] * D), dtype=np.bool_)
+	for d, (n, x) in enumerate(zip(matrix_size, axes)):
+		inside = inside & _batchAxis((x >= 0) & (x < n), d, D)
+	return inside
+
+
+def _raisedCosines(
+	matrix_size: tuple[int, ...],
+	axes: list[npt.NDArray[np.int64]],
+	mu: npt.NDArray[np.float64],
+	sigma: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+	''' Evaluate a batch of raised cosine distributions at the coordinates of each axis, with the shape (K, n_d). '''
+	D = len(matrix_size)
+	l2 = np.sqrt(sum(_batchAxis((x - mu[:, d, np.newaxis]) ** 2, d, D) for d, x in enumerate(axes)))
+	sigma = sigma.reshape(-1, *[1] * D)
+	return np.where((l2 <= sigma) & _inside(matrix_size, axes), 0.5 * (np.cos(np.pi * l2 / sigma) + 1.), 0.)
+
+
+def _raisedTriangles(
+	matrix_size: tuple[int, ...],
+	axes: list[npt.NDArray[np.int64]],
+	mu: npt.NDArray[np.float64],
+	ab: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+	''' Evaluate a batch of triangular distributions at the coordinates of each axis, with the shape (K, n_d). '''
+	D = len(matrix_size)
+	out = np.ones((mu.shape[0], *[1] * D))
+	with np.errstate(divide='ignore', invalid='ignore'):
+		for d, x in enumerate(axes):
+			a, m, b = ab[:, d, 0, np.newaxis], mu[:, d, np.newaxis], ab[:, d, 1, np.newaxis]
+			out = out * _batchAxis(np.select(
+				[(x < a) | (x > b), x <= m],
+				[0., (x - a) / (m - a)],
+				1. - (x - m) / (b - m),
+			), d, D)
+	return np.where(_inside(matrix_size, axes), out, 0.)
+
+
+def _window(
+	matrix_size: tuple[int, ...],
+	support: list[tuple[float, float]],
+) -> tuple[tuple[int, ...], tuple[int, ...]]:
+	''' Calculate the offset and size of the smallest window of a matrix containing the support [a, b] of each axis. '''
+	lower = tuple(max(0, math.ceil(a)) for a, _ in support)
+	upper = tuple(min(n - 1, math.floor(b)) for n, (_, b) in zip(matrix_size, support))
+	return lower, tuple(max(0, b - a + 1) for a, b in zip(lower, upper))
@@ -29,6 +29,8 @@ __all__ = [
 	'rectangularChladniPattern',
 	'rectangularSeries',
 	'WaveEquationWaveform2D',
+	'WaveEquationWaveformBatch2D',
+	'WaveEquationWaveforms2D',
 ]
 
 
@@ -189,3 +191,86 @@ def WaveEquationWaveform2D(
 	'''
 
 	return np.array(_WaveEquationWaveform2D(F, A, d, k, T))
+
+
+def WaveEquationWaveforms2D(
+	F: npt.NDArray[np.float64],
+	A: npt.NDArray[np.float64],
+	d: float,
+	k: float,
+	T: int,
+) -> npt.NDArray[np.float64]:
+	'''
+	Calculate a closed form solution to the 2D wave equation for multiple sets of amplitudes, such as one set per pickup
+	position. The frequency and decay basis is computed once and shared by every channel.
+	input:
+		F = frequencies (hertz)
+		A = amplitudes ∈ [0, 1], with the shape (P, N, M)
+		d = decay
+		k = sample length
+		T = length of simulation
+	output:
+		waveforms = W[p, t] ∈ A_p * e^dt * sin(ωt) / max(A) * NM
+	'''
+
+	assert A.ndim == 3 and A.shape[1:] == F.shape, \
+		'WaveEquationWaveforms2D() only supports amplitudes with the shape (P, N, M).'
+	A = A.reshape(A.shape[0], -1)
+	A_max = np.abs(A).max()
+	if A_max == 0.:
+		return np.zeros((A.shape[0], T))
+	return _modalSynthesis(F, A / (A_max * A.shape[1]), d, k, T)
+
+
+def WaveEquationWaveformBatch2D(
+	F: npt.NDArray[np.float64],
+	A: npt.NDArray[np.float64],
+	d: float,
+	k: float,
+	T: int,
+) -> npt.NDArray[np.float64]:
+	'''
+	Calculate a closed form solution to the 2D wave equation for a batch of excitations of the same drum, such as one set
+	of amplitudes per strike location. Unlike WaveEquationWaveforms2D(), each excitation is normalised independently, such
+	that W[b] is equal to WaveEquationWaveform2D(F, A[b], d, k, T), or WaveEquationWaveforms2D(F, A[b], d, k, T) when the
+	amplitudes are defined per pickup.
+	input:
+		F = frequencies (hertz)
+		A = amplitudes ∈ [0, 1], with the shape (B, N, M) or (B, P, N, M)
+		d = decay
+		k = sample length
+		T = length of simulation
+	output:
+		waveforms = W[b, t] or W[b, p, t] ∈ A_b * e^dt * sin(ωt) / max(A_b) * NM
+	'''
+
+	assert A.ndim in [3, 4] and A.shape[-2:] == F.shape, \
+		'WaveEquationWaveformBatch2D() only supports amplitudes with the shape (B, N, M) or (B, P, N, M).'
+	A_max = np.abs(A.reshape(A.shape[0], -1)).max(axis=1)
+	# silent excitations are rendered as silence
+	A_max[A_max == 0.] = np.inf
+	A = A / (A_max * F.size).reshape(-1, *([1] * (A.ndim - 1)))
+	W = _modalSynthesis(F, A.reshape(-1, F.size), d, k, T)
+	return W.reshape(*A.shape[:-2], T)
+
+
+def _modalSynthesis(
+	F: npt.NDArray[np.float64],
+	A: npt.NDArray[np.float64],
+	d: float,
+	k: float,
+	T: int,
+) -> npt.NDArray[np.float64]:
+	'''
+	Sum the damped eigenmodes for each row of normalised amplitudes A, with the shape (R, NM), sharing the frequency and
+	decay basis between every row.
+	'''
+
+	W = np.zeros((A.shape[0], T))
+	omega = 2. * np.pi * k * F.ravel()
+	# the basis is built in blocks to bound its memory footprint
+	block = 4096
+	for t_0 in range(0, T, block):
+		t = np.arange(t_0, min(t_0 + block, T), dtype=np.float64)
+		W[:, t_0:t_0 + t.shape[0]] = A @ (np.sin(np.outer(omega, t)) * np.exp(d * t))
+	return W
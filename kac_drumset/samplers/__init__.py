@@ -1,11 +1,16 @@
 from .bessel_model import BesselModel
-from .fdtd_model import FDTDModel
+from .fdtd_model import FDTDModel, PreparedDrum
 from .lamé_model import LaméModel
+from .parallel import generateParallel
 from .poisson_model import PoissonModel
 
 __all__ = [
+	# methods
+	'generateParallel',
+	# classes
 	'BesselModel',
 	'FDTDModel',
 	'LaméModel',
 	'PoissonModel',
+	'PreparedDrum',
 ]
@@ -0,0 +1,48 @@
+'''
+This file contains utilities shared by the samplers when generating a batch of samples.
+'''
+
+# core
+from typing import Sequence, TypeAlias
+
+# dependencies
+import numpy as np 			# maths
+import numpy.typing as npt	# typing for numpy
+
+__all__ = [
+	# methods
+	'groupByDrum',
+	'setBatchLabels',
+	# types
+	'BatchLabels',
+]
+
+# the labels of each sample in a batch, stored by column, such that labels[key][b] are the labels of the bth sample
+BatchLabels: TypeAlias = dict[str, list[list[float | int]]]
+
+
+def groupByDrum(indices: Sequence[int] | npt.NDArray[np.int64], strikes_per_shape: int = 5) -> list[list[int]]:
+	'''
+	Group the positions of a batch of sample indices by the drum used to generate them, such that the ith sample is a
+	strike of the drum i // strikes_per_shape. The positions within each group are sorted by their sample index, and the
+	groups are returned in order of their first sample index. The indices must be unique, as each drum is prepared once
+	per group.
+	'''
+
+	order = np.argsort(np.asarray(indices), kind='stable')
+	assert np.all(np.diff(np.asarray(indices)[order]) != 0), 'A batch of samples must not contain duplicate indices.'
+	groups: dict[int, list[int]] = {}
+	for b in order:
+		groups.setdefault(int(indices[b]) // strikes_per_shape, []).append(int(b))
+	return list(groups.values())
+
+
+def setBatchLabels(labels: BatchLabels, b: int, B: int, sample: dict[str, list[float | int]]) -> None:
+	'''
+	Store the labels of the bth sample in a batch of size B. Each column is created when it is first encountered.
+	'''
+
+	for key, value in sample.items():
+		if key not in labels:
+			labels[key] = [[] for _ in range(B)]
+		labels[key][b] = value
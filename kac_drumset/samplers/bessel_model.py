@@ -2,13 +2,24 @@
 This sampler is used to produce a linear model of a circular membrane.
 '''
 
+# core
+from typing import Sequence
+
 # dependencies
 import numpy as np 			# maths
 import numpy.typing as npt	# typing for numpy
 
 # src
 from kac_prediction.dataset import classLocalsToKwargs, AudioSampler, SamplerSettings
-from ..physics import circularAmplitudes, circularSeries, WaveEquationWaveform2D
+from ..physics import (
+	circularAmplitudes,
+	circularSeries,
+	WaveEquationWaveform2D,
+	WaveEquationWaveformBatch2D,
+	WaveEquationWaveforms2D,
+)
+from .batch import BatchLabels, groupByDrum, setBatchLabels
+from .seeding import sampleGenerator
 
 __all__ = [
 	'BesselModel',
@@ -26,12 +37,16 @@ class BesselModel(AudioSampler):
 	M: int							# number of mth modes
 	N: int							# number of nth modes
 	p: float						# material density of the simulated drum membrane (kg/m^2)
+	pickups: list[tuple[float, float]]	# pickup locations in polar coordinates
+	seed: int | None				# seed from which the random state of each sample is derived
+	strikes_per_shape: int			# how many samples are generated for each drum?
 	t: float						# tension at rest (N/m)
 	# model inferences
 	c: float						# wavespeed (m/s)
 	decay: float					# decay constant
 	F: npt.NDArray[np.float64]		# array of eigenfrequencies
 	k: float						# sample length (ms)
+	pickup_modes: npt.NDArray[np.float64]	# the eigenmodes evaluated at each pickup location
 	series: npt.NDArray[np.float64]	# array of eigenmodes z_nm
 	# drum properties
 	L: float						# diameter of the drum (m)
@@ -48,6 +63,9 @@ class BesselModel(AudioSampler):
 		amplitude: float			# maximum amplitude of the simulation ∈ [0, 1]
 		decay_time: float			# how long will the simulation take to decay? (seconds)
 		material_density: float		# material density of the simulated drum membrane (kg/m^2)
+		pickups: list[tuple[float, float]]	# polar pickup locations, rendered as one channel each
+		seed: int | None			# seed from which the random state of each sample is derived
+		strikes_per_shape: int		# how many samples are generated for each drum?
 		tension: float				# tension at rest (N/m)
 
 	def __init__(
@@ -59,6 +77,9 @@ class BesselModel(AudioSampler):
 		amplitude: float = 1.,
 		decay_time: float = 2.,
 		material_density: float = 0.2,
+		pickups: list[tuple[float, float]] | None = None,
+		seed: int | None = None,
+		strikes_per_shape: int = 5,
 		tension: float = 2000.,
 	) -> None:
 		'''
@@ -72,25 +93,70 @@ class BesselModel(AudioSampler):
 		self.M = M
 		self.N = N
 		self.p = material_density
+		self.pickups = pickups or []
+		self.seed = seed
+		self.strikes_per_shape = strikes_per_shape
 		self.t = tension
 		# initialise inferences
 		self.c = (self.t / self.p) ** 0.5
 		self.k = 1. / self.sample_rate
 		self.decay = -1 * self.k * 6 * np.log(10) / self.d_60
 		self.series = circularSeries(N, M)
+		self.pickup_modes = np.array([circularAmplitudes(*pickup, self.series) for pickup in self.pickups])
+
+	def generateBatch(self, indices: Sequence[int] | npt.NDArray[np.int64]) -> tuple[npt.NDArray[np.float64], BatchLabels]:
+		'''
+		Generate a batch of samples, such that waveforms[b] and labels[key][b] are equal to the output of updateProperties(i),
+		generateWaveform() and getLabels() for i = indices[b]. Each drum is always initialised by its first strike, such that
+		when a seed is given any subset of indices reproduces a serial run, and every strike of a drum is then synthesised
+		together, sharing one modal basis.
+		output:
+			waveforms	with the shape (B, T), or (B, P, T) when pickups are defined
+			labels		the labels of each sample, stored by column
+		'''
+
+		waveforms = np.zeros((len(indices), len(self.pickups), self.length) if self.pickups else (len(indices), self.length))
+		labels: BatchLabels = {}
+		for group in groupByDrum(indices, self.strikes_per_shape):
+			A = []
+			for n, b in enumerate(group):
+				i = int(indices[b])
+				if n == 0 and i % self.strikes_per_shape != 0:
+					self.updateProperties(i - i % self.strikes_per_shape)
+				self.updateProperties(i)
+				A.append(self.a * circularAmplitudes(*self.strike, self.series))
+				setBatchLabels(labels, b, len(indices), self.getLabels())
+			waveforms[group] = WaveEquationWaveformBatch2D(
+				self.F,
+				np.array(A)[:, np.newaxis] * self.pickup_modes if self.pickups else np.array(A),
+				self.decay,
+				self.k,
+				self.length,
+			)
+		return waveforms, labels
 
 	def generateWaveform(self) -> None:
 		'''
-		Using additive synthesis, generate the waveform for the linear model.
+		Using additive synthesis, generate the waveform for the linear model. When pickups are defined, one channel is
+		rendered per pickup, such that the waveform has the shape (P, T).
 		'''
 
-		self.waveform = WaveEquationWaveform2D(
-			self.F,
-			self.a * circularAmplitudes(*self.strike, self.series),
-			self.decay,
-			self.k,
-			self.length,
-		)
+		if self.pickups:
+			self.waveform = WaveEquationWaveforms2D(
+				self.F,
+				self.a * circularAmplitudes(*self.strike, self.series) * self.pickup_modes,
+				self.decay,
+				self.k,
+				self.length,
+			)
+		else:
+			self.waveform = WaveEquationWaveform2D(
+				self.F,
+				self.a * circularAmplitudes(*self.strike, self.series),
+				self.decay,
+				self.k,
+				self.length,
+			)
 
 	def getLabels(self) -> dict[str, list[float | int]]:
 		'''
@@ -101,15 +167,17 @@ class BesselModel(AudioSampler):
 
 	def updateProperties(self, i: int | None = None) -> None:
 		'''
-		For every five drum samples generated, update the size of the drum. And for every drum sample generated update the
-		strike location - the first strike location is always the centroid.
+		For every strikes_per_shape drum samples generated, update the size of the drum. And for every drum sample generated
+		update the strike location - the first strike location is always the centroid. The random state of the ith sample is
+		derived from (seed, i) when a seed is given.
 		'''
 
-		if i is None or i % 5 == 0:
+		rng = sampleGenerator(self.seed, i)
+		if i is None or i % self.strikes_per_shape == 0:
 			# initialise a random drum size and strike location in the centroid of the drum.
-			self.L = np.random.uniform(0.1, 2.)
+			self.L = rng.uniform(0.1, 2.)
 			self.F = self.series * self.c / self.L
 			self.strike = (0., 0.)
 		else:
 			# otherwise update the strike location to be a random location.
-			self.strike = (np.random.uniform(-1., 1.), np.random.uniform(0., np.pi))
+			self.strike = (rng.uniform(-1., 1.), rng.uniform(0., np.pi))
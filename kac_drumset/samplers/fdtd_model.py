@@ -4,7 +4,10 @@ generated polygon, which is used to define the boundary conditions, and a finite
 '''
 
 # core
+from collections import OrderedDict
+import inspect
 import math
+from typing import Any, Literal, Sequence
 
 # dependencies
 import numpy as np 			# maths
@@ -12,35 +15,89 @@ import numpy.typing as npt	# typing for numpy
 
 # src
 from kac_prediction.dataset import classLocalsToKwargs, AudioSampler, SamplerSettings
-from ..geometry import Shape, ShapeSettings
-from ..physics import FDTDWaveform2D, raisedCosine
+from ..geometry import DuplicateFilter, MaskCache, Shape, ShapeBank, shapeHash, ShapeSettings
+from ..physics import (
+	CompactMatrix,
+	CompactMatrixBatch,
+	FDTDWorkspace,
+	raisedCosineBatchCompact,
+	raisedCosineCompact,
+)
+from .batch import BatchLabels, groupByDrum, setBatchLabels
+from .resample import resample
+from .seeding import sampleGenerator
 
 __all__ = [
 	'FDTDModel',
+	'PreparedDrum',
 ]
 
+# how many of the most recently accepted drum shapes are remembered when duplicate drum shapes are rejected
+_REMEMBERED_SHAPES = 64
+
+
+class PreparedDrum():
+	'''
+	A drum shape which has been prepared for simulation, such that its boundary conditions and listening location are
+	calculated once and then reused for every strike of the drum. The boundary conditions may be cropped from the zero
+	padded grid of size (H + 2, H + 2), in which case origin is the index of B[0, 0] within that grid.
+	'''
+
+	B: npt.NDArray[np.int8]			# boolean matrix defining the boundary conditions of the drum, zero padded
+	centroid: tuple[float, float]	# centroid of the drum, which is used as the first strike location
+	origin: tuple[int, int]			# index of B[0, 0] within the zero padded grid
+	shape: Shape					# the shape of the drum
+	w: tuple[float, float]			# sample point of the 2D surface
+
+	def __init__(
+		self,
+		shape: Shape,
+		B: npt.NDArray[np.int8],
+		centroid: tuple[float, float],
+		w: tuple[float, float],
+		origin: tuple[int, int] = (0, 0),
+	) -> None:
+		self.B = B
+		self.centroid = centroid
+		self.origin = origin
+		self.shape = shape
+		self.w = w
+
 
 class FDTDModel(AudioSampler):
 	'''
-	This class creates a 2D simulation of an arbitrarily shaped drum, calculated using a FDTD scheme.
+	This class creates a 2D simulation of an arbitrarily shaped drum, calculated using a FDTD scheme. When a bandwidth is
+	given, the simulation is run at the lowest internal rate, in steps of 100 Hz, which supports that bandwidth, and is
+	then band-limited resampled to the sample rate.
 	'''
 
 	# user-defined variables
 	a: float						# maximum amplitude of the simulation ∈ [0, 1]
 	arbitrary_shape: type[Shape]	# what shape should the drum be in?
+	bandwidth: float | None			# bandwidth of the simulation (Hz), which decouples its rate from the sample rate
 	d_60: float						# decay time (seconds)
 	L: float						# size of the drum, spanning both the horizontal and vertical axes (m)
+	mask_cache: MaskCache | None	# cache of the rasterised drum shapes
 	max_vertices: int				# maximum amount of vertices for a given drum
 	p: float						# material density of the simulated drum membrane (kg/m^2)
+	shape_bank: ShapeBank | None	# pregenerated drum shapes, used instead of arbitrary_shape
+	shape_filter: DuplicateFilter | None	# record of every drum shape generated so far, used to reject duplicates
 	shape_settings: ShapeSettings	# the class settings for a given drum shape
+	shapes: OrderedDict[int, Shape]	# the accepted shapes of the most recent drums, when duplicate drum shapes are rejected
+	stencil: Literal['5-point', '9-point']	# finite difference stencil used to approximate the laplacian
 	strike_width: float				# width of the drum strike (m)
+	seed: int | None				# seed from which the random state of each sample is derived
+	strikes_per_shape: int			# how many samples are generated for each drum shape?
 	t: float						# tension at rest (N/m)
 	# FDTD inferences
+	alpha: float					# weight of the diagonal neighbours in the laplacian
 	c: float						# wavespeed (m/s)
 	cfl: float						# courant number
 	gamma: float					# scaled wavespeed (1/s)
 	H: int							# number of grid points across each dimension, for the domain U ∈ [0, 1]
 	h: float						# length of each grid step
+	internal_length: int			# length of the simulation in samples
+	internal_rate: int				# sample rate of the simulation (Hz)
 	k: float						# sample length (ms)
 	sigma: float					# strike width relative to H
 	sigma_2: float					# sigma ** 2
@@ -48,12 +105,12 @@ class FDTDModel(AudioSampler):
 	c_0: float						# first coefficient
 	c_1: float						# second coefficient
 	c_2: float						# third coefficient
-	u_0: npt.NDArray[np.float64]	# initial conditions for each simulation
+	c_3: float						# fourth coefficient, related to the diagonal neighbours of the 9-point stencil
+	u_0: CompactMatrix				# initial conditions for each simulation, which are zero everywhere
+	workspace: FDTDWorkspace		# buffers of every simulation, which are reused for every drum and strike
 	# drum properties
-	B: npt.NDArray[np.int8]			# boolean matrix define the boundary conditions for the drum
-	shape: Shape					# the shape of the drum
+	drum: PreparedDrum				# the current drum, which is prepared once per drum shape
 	strike: tuple[float, float]		# where is the drum struck?
-	w: tuple[float, float]			# sample point of the 2D surface
 
 	class Settings(SamplerSettings, total=False):
 		'''
@@ -63,11 +120,19 @@ class FDTDModel(AudioSampler):
 
 		amplitude: float				# maximum amplitude of the simulation ∈ [0, 1]
 		arbitrary_shape: type[Shape]	# what shape should the drum be in?
+		bandwidth: float | None			# bandwidth of the simulation (Hz), which decouples its rate from the sample rate
 		decay_time: float				# how long will the simulation take to decay? (seconds)
+		dedup_tolerance: float | None	# tolerance used to reject duplicate drum shapes (None allows duplicates)
 		drum_size: float				# size of the drum, spanning both the horizontal and vertical axes (m)
+		mask_cache_dir: str | None		# directory used to store rasterised drum shapes on disk
+		mask_cache_size: int			# how many rasterised drum shapes are kept in memory?
 		material_density: float			# material density of the simulated drum membrane (kg/m^2)
+		shape_bank: str | None			# directory of a pregenerated shape bank, used instead of arbitrary_shape
 		shape_settings: ShapeSettings	# the class generator settings for a given drum shape
+		stencil: Literal['5-point', '9-point']	# finite difference stencil used to approximate the laplacian
 		strike_width: float				# width of the drum strike (m)
+		seed: int | None				# seed from which the random state of each sample is derived
+		strikes_per_shape: int			# how many samples are generated for each drum shape?
 		tension: float					# tension at rest (N/m)
 
 	def __init__(
@@ -76,11 +141,19 @@ class FDTDModel(AudioSampler):
 		sample_rate: int,
 		arbitrary_shape: type[Shape],
 		amplitude: float = 1.,
+		bandwidth: float | None = None,
 		decay_time: float = 2.,
+		dedup_tolerance: float | None = None,
 		drum_size: float = 0.3,
+		mask_cache_dir: str | None = None,
+		mask_cache_size: int = 0,
 		material_density: float = 0.2,
+		shape_bank: str | None = None,
 		shape_settings: ShapeSettings | None = None,
+		stencil: Literal['5-point', '9-point'] = '5-point',
 		strike_width: float = 0.01,
+		seed: int | None = None,
+		strikes_per_shape: int = 5,
 		tension: float = 2000.,
 	) -> None:
 		'''
@@ -94,77 +167,280 @@ class FDTDModel(AudioSampler):
 		# initialise user defined variables
 		self.a = amplitude
 		self.arbitrary_shape = arbitrary_shape
+		self.bandwidth = bandwidth
 		self.d_60 = decay_time
 		self.L = drum_size
+		self.mask_cache = MaskCache(mask_cache_size, mask_cache_dir) if mask_cache_size > 0 or mask_cache_dir else None
 		self.p = material_density
+		self.shape_bank = ShapeBank(shape_bank) if shape_bank is not None else None
+		self.shape_filter = DuplicateFilter(dedup_tolerance) if dedup_tolerance is not None else None
 		self.shape_settings = shape_settings or {}
+		self.shapes = OrderedDict()
+		self.stencil = stencil
 		self.strike_width = strike_width
+		self.seed = seed
+		self.strikes_per_shape = strikes_per_shape
 		self.t = tension
+		# a shape whose every instance has the same canonical form, such as a circle, can never produce a unique drum shape
+		assert dedup_tolerance is None or len({
+			shapeHash(self._arbitraryShape(np.random.default_rng(n)), dedup_tolerance) for n in range(8)
+		}) > 1, 'FDTDModel can only reject duplicate drum shapes when the arbitrary_shape has more than one canonical form.'
 		# initialise inferences
-		self.k = 1 / self.sample_rate
+		assert stencil in ['5-point', '9-point'], 'FDTDModel only supports a 5-point or 9-point stencil.'
+		assert bandwidth is None or bandwidth > 0., 'The bandwidth of FDTDModel must be positive.'
+		# The simulation is run at the lowest rate whose passband, 0.4 * internal_rate, spans the bandwidth, and is then
+		# resampled to the sample rate, such that the grid and the amount of steps are independent of the sample rate. The
+		# rate is rounded up to a multiple of 100 Hz, such that its reduced ratio to the sample rate, L / M, remains small,
+		# as does the amount of polyphase filters used to resample the output.
+		self.internal_rate = self.sample_rate if bandwidth is None else min(100 * math.ceil(bandwidth / 40), self.sample_rate)
+		self.internal_length = math.ceil(self.length * self.internal_rate / self.sample_rate)
+		self.k = 1 / self.internal_rate
 		self.c = (self.t / self.p) ** 0.5
 		self.gamma = self.c / self.L
-		self.H = math.floor((1 / (2 ** 0.5)) / (self.gamma * self.k))
+		# The laplacian is approximated by δ_Δ + α * h^2 * δ_xx * δ_yy, such that α = 0 is the 5-point stencil, and α = 1/6
+		# is the isotropic 9-point stencil, whose truncation error (h^2 / 12) * Δ^2 is independent of direction. Given the
+		# spatial frequencies p = sin^2(βh / 2) ∈ [0, 1], the scheme is stable when λ^2 * (p_x + p_y - 4α * p_x * p_y) ≤ 1,
+		# which is maximised at p_x = p_y = 1, such that λ ≤ (2 - 4α)^-0.5. The grid is the densest that is stable.
+		self.alpha = 1 / 6 if stencil == '9-point' else 0.
+		self.H = math.floor(((2 - 4 * self.alpha) ** -0.5) / (self.gamma * self.k))
 		self.h = 1 / self.H
 		self.cfl = self.gamma * self.k / self.h
 		self.sigma = self.H * strike_width / self.L
 		self.sigma_2 = max(self.sigma ** 2., 1.)
-		# FDTD update coefficients
+		# FDTD update coefficients, whereby the edges, centre and diagonals of the stencil are weighted by
+		# λ^2 * (1 - 2α), 2 - λ^2 * (4 - 4α) and λ^2 * α respectively.
 		log_decay = self.k * 6 * np.log(10) / self.d_60
-		self.c_0 = (self.cfl ** 2) / (1 + log_decay)
-		self.c_1 = (2 - 4 * (self.cfl ** 2)) / (1 + log_decay)
+		self.c_0 = (self.cfl ** 2) * (1 - 2 * self.alpha) / (1 + log_decay)
+		self.c_1 = (2 - 4 * (1 - self.alpha) * (self.cfl ** 2)) / (1 + log_decay)
 		self.c_2 = (1 - log_decay) / (1 + log_decay)
-		self.u_0 = np.zeros((self.H + 2, self.H + 2))
+		self.c_3 = (self.cfl ** 2) * self.alpha / (1 + log_decay)
+		self.u_0 = (np.zeros((0, 0)), (0, 0))
+		self.workspace = FDTDWorkspace((self.H + 2, self.H + 2), self.internal_length, self.strikes_per_shape)
+
+	'''
+	Getters for the properties of the current drum.
+	'''
+
+	@property
+	def B(self) -> npt.NDArray[np.int8]:
+		return self.drum.B
+
+	@property
+	def shape(self) -> Shape:
+		return self.drum.shape
+
+	@property
+	def w(self) -> tuple[float, float]:
+		return self.drum.w
+
+	def generateBatch(self, indices: Sequence[int] | npt.NDArray[np.int64]) -> tuple[npt.NDArray[np.float64], BatchLabels]:
+		'''
+		Generate a batch of samples, such that waveforms[b] and labels[key][b] are equal to the output of updateProperties(i),
+		generateWaveform() and getLabels() for i = indices[b]. Each drum is always initialised by its first strike, such that
+		when a seed is given any subset of indices reproduces a serial run. Every strike of a drum is then simulated in
+		parallel by one native call, using the lanes of the workspace.
+		output:
+			waveforms	with the shape (B, T)
+			labels		the labels of each sample, stored by column
+		'''
+
+		waveforms = np.zeros((len(indices), self.length))
+		labels: BatchLabels = {}
+		for group in groupByDrum(indices, self.strikes_per_shape):
+			strikes: list[tuple[float, float]] = []
+			for n, b in enumerate(group):
+				i = int(indices[b])
+				if n == 0 and i % self.strikes_per_shape != 0:
+					self.updateProperties(i - i % self.strikes_per_shape)
+				self.updateProperties(i)
+				strikes.append(self.strike)
+				setBatchLabels(labels, b, len(indices), self.getLabels())
+			self.workspace.setBoundary(self.B)
+			waveforms[group] = self._resample(self.workspace.renderBatch(
+				self.u_0,
+				self._excitations(strikes),
+				self.c_0,
+				self.c_1,
+				self.c_2,
+				self._listeningIndex(),
+				self.c_3,
+			))
+		return waveforms, labels
 
 	def generateWaveform(self) -> None:
 		''' Calculate the FDTD for a 2D polygon. '''
 
-		if hasattr(self, 'shape'):
-			self.waveform = FDTDWaveform2D(
+		if hasattr(self, 'drum'):
+			self.workspace.setBoundary(self.B)
+			self.waveform = self._resample(self.workspace.render(
 				self.u_0,
-				np.pad(self.a * raisedCosine(
-					(self.H, self.H),
-					((self.strike[0] + 1) * 0.5 * self.H, (self.strike[1] + 1) * 0.5 * self.H),
-					sigma=self.sigma,
-				) / self.sigma_2, 1, mode='constant'),
-				self.B,
+				self._excitation(),
 				self.c_0,
 				self.c_1,
 				self.c_2,
-				self.length,
-				((self.w[0] + 1) * 0.5, (self.w[1] + 1) * 0.5),
-			)
+				self._listeningIndex(),
+				self.c_3,
+			))
 
 	def getLabels(self) -> dict[str, list[float | int]]:
 		''' This method returns the labels for the FDTD. '''
 
-		if hasattr(self, 'shape'):
+		if hasattr(self, 'drum'):
 			labels = self.shape.__getLabels__()
 			labels.update({'sample_location': [*self.w], 'strike_location': [*self.strike]})
 		else:
 			labels = {}
 		return labels
 
+	def prepareDrum(
+		self,
+		shape: Shape,
+		centroid: tuple[float, float] | None = None,
+		mask: npt.NDArray[np.int8] | None = None,
+		rng: np.random.Generator | None = None,
+	) -> PreparedDrum:
+		'''
+		Prepare a drum shape for simulation, by drawing its boundary conditions and choosing its listening location. The
+		boundary conditions are cropped to the bounding box of the drum plus a one cell boundary, such that the grid spacing
+		is unchanged, but the cost of each simulation is proportional to the extent of the drum. The prepared drum can then
+		be assigned to FDTDModel.drum, and reused for any amount of strikes.
+		input:
+			shape		the shape of the drum
+			centroid	the centroid of the shape, which is calculated when not given
+			mask		the mask of the shape with the shape (H, H), which is drawn when not given
+			rng			the random generator used when the centroid is not a valid listening position
+		'''
+
+		B = np.zeros((self.H + 2, self.H + 2), np.int8)
+		if mask is not None:
+			B[1:-1, 1:-1] = mask
+		elif self.mask_cache is not None:
+			self.mask_cache.draw(shape, self.H, out=B[1:-1, 1:-1])
+		else:
+			shape.draw(self.H, out=B[1:-1, 1:-1])
+		centroid = centroid or shape.centroid
+		(x_0, x_1), (y_0, y_1) = _extent(B, 0), _extent(B, 1)
+		# if possible use the centroid as the listening position, otherwise use a random point.
+		return PreparedDrum(
+			shape,
+			B[x_0:x_1, y_0:y_1].copy(),
+			centroid,
+			_pointInside(shape, centroid, rng),
+			(x_0, y_0),
+		)
+
 	def updateProperties(self, i: int | None = None) -> None:
 		'''
-		For every five drum samples generated, update the drum shape. And for every drum sample generated update the strike
-		location - the first strike location is always the centroid.
+		For every strikes_per_shape drum samples generated, prepare a new drum shape. And for every drum sample generated
+		update the strike location - the first strike location is always the centroid. The random state of the ith sample is
+		derived from (seed, i) when a seed is given. When duplicate drum shapes are rejected, the accepted shapes of the most
+		recent drums are remembered, such that a drum whose strikes are split across batches is rebuilt identically.
 		'''
 
-		# lambda for maintaining that points are within the shape.
-		def pointInsideLambda(p: tuple[float, float]) -> tuple[float, float]:
-			while not self.shape.isPointInside(p):
-				p = (np.random.uniform(-1., 1.), np.random.uniform(-1., 1.))
-			return p
-
-		if i is None or i % 5 == 0:
-			# initialise a random drum shape and calculate the initial conditions.
-			self.shape = self.arbitrary_shape(**self.shape_settings)
-			self.B = np.pad(self.shape.draw(self.H), 1, mode='constant')
-			# if possible use the centroid as the primary listening and excitation position, otherwise use a random point.
-			centroid = self.shape.centroid
-			self.strike = pointInsideLambda(centroid)
-			self.w = pointInsideLambda(centroid)
+		rng = sampleGenerator(self.seed, i)
+		if i is None or i % self.strikes_per_shape == 0:
+			if self.shape_bank is not None:
+				# load the next drum shape from the bank, reusing its mask when it was drawn at the same size.
+				n = (i // self.strikes_per_shape) % len(self.shape_bank) if i is not None \
+					else int(rng.integers(len(self.shape_bank)))
+				self.drum = self.prepareDrum(
+					self.shape_bank[n],
+					self.shape_bank.getCentroid(n),
+					self.shape_bank.getMask(n) if self.shape_bank.H == self.H else None,
+					rng,
+				)
+			else:
+				# the drum shape is drawn using an independent generator, such that the rest of the drum is drawn identically
+				# when a shape which was already accepted is rebuilt.
+				shape_rng = np.random.default_rng(rng.integers(2 ** 63))
+				if i is not None and i // self.strikes_per_shape in self.shapes:
+					shape = self.shapes[i // self.strikes_per_shape]
+					self.shapes.move_to_end(i // self.strikes_per_shape)
+				else:
+					# initialise a random drum shape.
+					shape = self._arbitraryShape(shape_rng)
+					# reject any drum shapes which have already been generated, and remember the accepted shapes of the most recent
+					# drums, evicting the least recently used.
+					if self.shape_filter is not None:
+						attempts = 1
+						while not self.shape_filter.add(shape):
+							assert attempts < 1000, 'FDTDModel was unable to generate a unique drum shape.'
+							shape = self._arbitraryShape(shape_rng)
+							attempts += 1
+						if i is not None:
+							self.shapes[i // self.strikes_per_shape] = shape
+							if len(self.shapes) > _REMEMBERED_SHAPES:
+								self.shapes.popitem(last=False)
+				self.drum = self.prepareDrum(shape, rng=rng)
+			# if possible use the centroid as the primary excitation position, otherwise use a random point.
+			self.strike = _pointInside(self.shape, self.drum.centroid, rng)
 		else:
 			# update the strike location to be a random location.
-			self.strike = pointInsideLambda((np.random.uniform(-1., 1.), np.random.uniform(-1., 1.)))
+			self.strike = _pointInside(self.shape, rng=rng)
+
+	def _arbitraryShape(self, rng: np.random.Generator) -> Shape:
+		'''
+		Initialise a random drum shape. The random generator is only passed to shapes which accept one, such that any shape,
+		including those which are not random, can be used as the arbitrary_shape.
+		'''
+		kwargs: dict[str, Any] = {**self.shape_settings}
+		if 'rng' in inspect.signature(self.arbitrary_shape).parameters:
+			kwargs['rng'] = rng
+		return self.arbitrary_shape(**kwargs)
+
+	def _excitation(self) -> CompactMatrix:
+		'''
+		The initial conditions of the current strike, as a compact matrix within the boundary conditions of the drum, such
+		that only the support of the strike is ever calculated.
+		'''
+		window, (x, y) = raisedCosineCompact(
+			(self.H, self.H),
+			((self.strike[0] + 1) * 0.5 * self.H, (self.strike[1] + 1) * 0.5 * self.H),
+			sigma=self.sigma,
+		)
+		return self.a * window / self.sigma_2, (x + 1 - self.drum.origin[0], y + 1 - self.drum.origin[1])
+
+	def _excitations(self, strikes: list[tuple[float, float]]) -> CompactMatrixBatch:
+		''' The initial conditions of a batch of strikes, calculated by one broadcasted call. '''
+		windows, offsets = raisedCosineBatchCompact(
+			(self.H, self.H),
+			(np.array(strikes).reshape(-1, 2) + 1) * 0.5 * self.H,
+			self.sigma,
+		)
+		return self.a * windows / self.sigma_2, offsets + 1 - np.array(self.drum.origin)
+
+	def _listeningIndex(self) -> tuple[int, int]:
+		''' The index of the grid cell which contains the listening position, within the boundary conditions. '''
+		x, y = [1 + min(math.floor((w + 1) * 0.5 * self.H), self.H - 1) - o for w, o in zip(self.w, self.drum.origin)]
+		return x, y
+
+	def _resample(self, waveforms: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+		''' Copy the waveforms from the workspace, resampling them from the internal rate to the sample rate. '''
+		if self.internal_rate == self.sample_rate:
+			return waveforms.copy()
+		return resample(waveforms, self.internal_rate, self.sample_rate, self.length)
+
+
+def _extent(B: npt.NDArray[np.int8], d: int) -> tuple[int, int]:
+	'''
+	The range of the dth axis of a zero padded matrix which spans every nonzero element plus a one cell boundary. An empty
+	matrix is not cropped.
+	'''
+
+	indices = np.flatnonzero(B.any(axis=1 - d))
+	return (int(indices[0]) - 1, int(indices[-1]) + 2) if indices.size else (0, B.shape[d])
+
+
+def _pointInside(
+	shape: Shape,
+	p: tuple[float, float] | None = None,
+	rng: np.random.Generator | None = None,
+) -> tuple[float, float]:
+	'''
+	Maintain that a point is within the shape, otherwise a point is drawn uniformly from the shape.
+	'''
+
+	if p is None or not shape.isPointInside(p):
+		x, y = shape.samplePoints(1, rng)[0]
+		p = (float(x), float(y))
+	return p
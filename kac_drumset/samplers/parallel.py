@@ -0,0 +1,96 @@
+'''
+This file contains a multi-process driver used to generate a dataset in parallel.
+'''
+
+# core
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+from typing import Any, TypeAlias
+
+# dependencies
+import numpy as np 			# maths
+import numpy.typing as npt	# typing for numpy
+
+# src
+from .batch import BatchLabels
+from .bessel_model import BesselModel
+from .fdtd_model import FDTDModel
+from .lamé_model import LaméModel
+from .poisson_model import PoissonModel
+
+__all__ = [
+	'generateParallel',
+]
+
+_Sampler: TypeAlias = BesselModel | FDTDModel | LaméModel | PoissonModel
+
+# the sampler and output of each worker process, which persist between chunks
+_worker_sampler: _Sampler | None = None
+_worker_waveforms: 'np.memmap[Any, np.dtype[np.float64]] | None' = None
+
+
+def generateParallel(
+	Sampler: type[_Sampler],
+	sampler_settings: dict[str, Any],
+	dataset_size: int,
+	path: str,
+	shapes_per_chunk: int = 1,
+	workers: int | None = None,
+) -> tuple[npt.NDArray[np.float64], BatchLabels]:
+	'''
+	Generate a dataset using a pool of worker processes. The indices of the dataset are split into chunks which are aligned
+	to the strikes_per_shape of the sampler, such that every strike of a drum is generated by the same worker, and the
+	expensive setup of each drum is never repeated. Each worker instantiates the sampler once, and writes its waveforms
+	directly into a shared memory-mapped array, such that only the labels are returned to the parent process. When the
+	sampler is given a seed, the dataset is identical to a serial run, regardless of the amount of workers. The exception
+	is a FDTDModel with a dedup_tolerance, as each worker only rejects the duplicate drum shapes that it has generated.
+	input:
+		Sampler				the class of the sampler used to generate the dataset
+		sampler_settings	the settings used to instantiate the sampler
+		dataset_size		the amount of samples generated
+		path				the file used to store the waveforms (.npy)
+		shapes_per_chunk	how many drums are generated by a worker at a time?
+		workers				the amount of worker processes (defaults to the amount of cpus)
+	output:
+		waveforms	a memory-mapped array with the shape (dataset_size, T), or (dataset_size, P, T) when pickups are defined
+		labels		the labels of each sample, stored by column
+	'''
+
+	# the shape of each sample is inferred from an empty batch
+	sampler = Sampler(**sampler_settings)
+	sample_shape = sampler.generateBatch([])[0].shape[1:]
+	waveforms = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(dataset_size, *sample_shape))
+	waveforms.flush()
+	chunk_size = shapes_per_chunk * sampler.strikes_per_shape
+	chunks = [(start, min(start + chunk_size, dataset_size)) for start in range(0, dataset_size, chunk_size)]
+	labels: BatchLabels = {}
+	with ProcessPoolExecutor(
+		max_workers=min(workers or os.cpu_count() or 1, max(len(chunks), 1)),
+		initializer=_initialiseWorker,
+		initargs=(Sampler, sampler_settings, path),
+	) as pool:
+		for start, chunk_labels in pool.map(_generateChunk, chunks):
+			for key, column in chunk_labels.items():
+				labels.setdefault(key, [[] for _ in range(dataset_size)])[start:start + len(column)] = column
+	return np.lib.format.open_memmap(path, mode='r+'), labels
+
+
+def _generateChunk(chunk: tuple[int, int]) -> tuple[int, BatchLabels]:
+	''' Generate a chunk of the dataset within a worker process, and write its waveforms to the shared array. '''
+	assert _worker_sampler is not None and _worker_waveforms is not None, \
+		'generateParallel() worker was not initialised.'
+	waveforms, labels = _worker_sampler.generateBatch(range(*chunk))
+	_worker_waveforms[chunk[0]:chunk[1]] = waveforms
+	_worker_waveforms.flush()
+	return chunk[0], labels
+
+
+def _initialiseWorker(Sampler: type[_Sampler], sampler_settings: dict[str, Any], path: str) -> None:
+	''' Instantiate the sampler and open the shared array once per worker process. '''
+	global _worker_sampler, _worker_waveforms
+	# forked workers inherit the random state of the parent, and are therefore reseeded for samplers without a seed
+	np.random.seed()
+	random.seed()
+	_worker_sampler = Sampler(**sampler_settings)
+	_worker_waveforms = np.lib.format.open_memmap(path, mode='r+')
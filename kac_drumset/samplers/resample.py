@@ -0,0 +1,76 @@
+'''
+This file contains a band-limited resampler, used by the samplers to decouple the rate of a simulation from the sample
+rate of its output.
+'''
+
+# core
+from functools import lru_cache
+import math
+
+# dependencies
+import numpy as np 			# maths
+import numpy.typing as npt	# typing for numpy
+
+__all__ = [
+	'resample',
+]
+
+
+def resample(
+	waveforms: npt.NDArray[np.float64],
+	sample_rate: int,
+	target_rate: int,
+	length: int,
+	zero_crossings: int = 32,
+	rolloff: float = 0.95,
+) -> npt.NDArray[np.float64]:
+	'''
+	Resample a waveform, or a batch of waveforms, using a Kaiser windowed sinc interpolator. The cutoff of the sinc is
+	rolloff * the lower of the two nyquist frequencies, such that the output is free of aliasing when downsampling, and
+	free of images when upsampling. Samples beyond either end of the input are treated as zero. Given the reduced ratio of
+	the two sample rates, L / M, the nth output sample is interpolated from the input samples surrounding n * M / L, whose
+	weights are one of L polyphase filters, such that the output is calculated as L strided inner products.
+	input:
+		waveforms = the input waveforms, with the shape (..., T).
+		sample_rate = the sample rate of the input.
+		target_rate = the sample rate of the output.
+		length = the length of the output in samples.
+		zero_crossings = the amount of zero crossings of the sinc on either side of each output sample.
+		rolloff = the cutoff relative to the nyquist frequency.
+	output:
+		waveforms with the shape (..., length).
+	'''
+
+	out = np.zeros((*waveforms.shape[:-1], length))
+	T = waveforms.shape[-1]
+	if T == 0 or length == 0:
+		return out
+	g = math.gcd(target_rate, sample_rate)
+	L, M = target_rate // g, sample_rate // g
+	filters = _polyphaseFilters(L, M, zero_crossings, rolloff)
+	width = filters.shape[1] // 2
+	# pad the input, such that the window of input samples surrounding every output sample is in range.
+	padding = [(0, 0)] * (waveforms.ndim - 1) + [(width - 1, max((length - 1) * M // L + width + 1 - T, 0))]
+	windows = np.lib.stride_tricks.sliding_window_view(np.pad(waveforms, padding), 2 * width, axis=-1)
+	# the output samples n ≡ r (mod L) share the rth filter, and their windows are M input samples apart.
+	for r in range(min(L, length)):
+		n = len(range(r, length, L))
+		start = r * M // L
+		out[..., r::L] = windows[..., start:start + (n - 1) * M + 1:M, :] @ filters[r]
+	return out
+
+
+@lru_cache(maxsize=4)
+def _polyphaseFilters(L: int, M: int, zero_crossings: int, rolloff: float) -> npt.NDArray[np.float64]:
+	'''
+	The L polyphase filters of the interpolator, with the shape (L, 2 * width), whereby the rth filter weights the input
+	samples surrounding the output samples n ≡ r (mod L). These are cached, as they depend only upon the ratio.
+	'''
+
+	scale = rolloff * min(1., L / M)
+	width = math.ceil(zero_crossings / scale)
+	# the distance between each output sample and the input samples which surround it
+	x = (np.arange(L) * M % L / L)[:, np.newaxis] - np.arange(1 - width, width + 1)
+	filters = scale * np.sinc(scale * x) * np.i0(8. * np.sqrt(np.clip(1. - (x / width) ** 2, 0., 1.))) / np.i0(8.)
+	filters.flags.writeable = False
+	return filters
@@ -0,0 +1,24 @@
+'''
+This file contains the random state used by the samplers to generate each sample reproducibly.
+'''
+
+# dependencies
+import numpy as np 			# maths
+
+__all__ = [
+	'sampleGenerator',
+]
+
+
+def sampleGenerator(seed: int | None, i: int | None) -> np.random.Generator:
+	'''
+	Create the random generator used to generate the ith sample. When a seed is given, the generator is a counter-based
+	Philox generator keyed by (seed, i), such that every sample is reproducible regardless of which samples were generated
+	before it, or by which process. Otherwise, the generator is seeded from the global numpy random state, such that
+	np.random.seed() remains effective.
+	'''
+
+	if seed is None or i is None:
+		return np.random.default_rng(np.random.randint(2 ** 63))
+	assert seed >= 0 and i >= 0, 'The seed and the sample index must be non-negative.'
+	return np.random.Generator(np.random.Philox(key=[seed, i]))
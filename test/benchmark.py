@@ -0,0 +1,87 @@
+'''
+This file benchmarks the performance critical methods of this project against their reference implementations.
+'''
+
+# core
+import timeit
+
+# dependencies
+import numpy as np 			# maths
+
+# src
+from kac_drumset.externals._geometry import _largestVectorPairwise
+from kac_drumset.geometry import Circle, largestVector
+from kac_drumset.samplers import FDTDModel
+
+
+def benchmarkLargestVector(sizes: list[int] = [10, 100, 1000, 10000, 100000], max_time: float = 180.) -> None:
+	'''
+	Compare the rotating calipers implementation of largestVector() against an exhaustive pairwise search, using random
+	point clouds of increasing size. The pairwise search is skipped once a single run is estimated to exceed max_time.
+	'''
+
+	print('largestVector()')
+	print(f'{"N":>8} {"calipers (s)":>14} {"pairwise (s)":>14} {"speedup":>10}')
+	pairwise_time = 0.
+	for i, N in enumerate(sizes):
+		points = np.random.random((N, 2))
+		calipers = min(timeit.repeat(lambda: largestVector(points), number=1, repeat=5))
+		# the pairwise search scales quadratically, so estimate its cost from the previous run
+		if i > 0 and pairwise_time * (N / sizes[i - 1]) ** 2 > max_time:
+			print(f'{N:>8} {calipers:>14.6f} {"-":>14} {"-":>10}')
+			continue
+		pairwise_time = min(timeit.repeat(lambda: _largestVectorPairwise(points), number=1, repeat=1 if N > 1000 else 5))
+		print(f'{N:>8} {calipers:>14.6f} {pairwise_time:>14.6f} {pairwise_time / calipers:>9.1f}x')
+
+
+def benchmarkFDTDStencil(sample_rate: int = 48000, f: float = 4000., duration: float = 0.5) -> None:
+	'''
+	Compare the 5-point and 9-point stencils of FDTDModel at equal spectral accuracy. The accuracy of each scheme is
+	measured as the worst relative phase velocity error at the frequency f, across every direction. The 9-point stencil
+	is simulated at sample_rate, and the 5-point stencil is oversampled until its error is no larger.
+	'''
+
+	print('FDTDModel(stencil)')
+	print(f'{"stencil":>8} {"rate (Hz)":>10} {"H":>6} {"error":>10} {"time (s)":>10} {"speedup":>10}')
+	nine_point = FDTDModel(arbitrary_shape=Circle, duration=duration, sample_rate=sample_rate, stencil='9-point')
+	target = _dispersionError(nine_point, f)
+	rate = sample_rate
+	five_point = FDTDModel(arbitrary_shape=Circle, duration=duration, sample_rate=rate)
+	while _dispersionError(five_point, f) > target:
+		rate = round(rate * 1.05)
+		five_point = FDTDModel(arbitrary_shape=Circle, duration=duration, sample_rate=rate)
+	times = []
+	for model in [five_point, nine_point]:
+		times.append(min(timeit.repeat(lambda: model.generateBatch(range(model.strikes_per_shape)), number=1, repeat=3)))
+		print(
+			f'{model.stencil:>8} {model.sample_rate:>10} {model.H:>6} {_dispersionError(model, f):>10.2e} '
+			f'{times[-1]:>10.4f} {times[0] / times[-1]:>9.1f}x',
+		)
+
+
+def _dispersionError(model: FDTDModel, f: float, directions: int = 32) -> float:
+	'''
+	The worst relative phase velocity error of the scheme used by an FDTDModel at the frequency f. For each direction θ,
+	the numerical wavenumber β solves sin^2(ωk / 2) = λ^2 * (p_x + p_y - 4α * p_x * p_y), where p = sin^2(βh * cosθ / 2),
+	and is found by bisection. The phase velocity of the wave equation is γ = ω / β.
+	'''
+
+	omega = 2 * np.pi * f
+	theta = np.linspace(0., np.pi / 4, directions)
+	lhs = np.sin(omega * model.k / 2) ** 2
+	lower = np.zeros(directions)
+	upper = np.full(directions, np.pi / model.h)
+	for _ in range(64):
+		beta = (lower + upper) / 2
+		p_x = np.sin(beta * model.h * np.cos(theta) / 2) ** 2
+		p_y = np.sin(beta * model.h * np.sin(theta) / 2) ** 2
+		rhs = (model.cfl ** 2) * (p_x + p_y - 4 * model.alpha * p_x * p_y)
+		lower = np.where(rhs < lhs, beta, lower)
+		upper = np.where(rhs < lhs, upper, beta)
+	return float(np.abs(omega / (model.gamma * (lower + upper) / 2) - 1).max())
+
+
+if __name__ == '__main__':
+	benchmarkLargestVector()
+	benchmarkFDTDStencil()
+	exit()
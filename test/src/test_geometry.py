@@ -1,6 +1,8 @@
 # core
 import math
+import os
 import random
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 # dependencies
@@ -15,22 +17,37 @@ from kac_drumset.externals._geometry import (
 	_isConvex,
 	_isPointInsideConvexPolygon,
 	_isPointInsidePolygon,
+	_largestVectorPairwise,
 	_normaliseConvexPolygon,
 )
 from kac_drumset.geometry import (
 	# methods
+	canonicalPolygon,
+	dirichletEigenvalues,
+	findIntersections,
+	generatePolygons,
+	heatTraceInvariants,
 	isColinear,
 	largestVector,
 	lineIntersection,
+	lineIntersections,
+	shapeHash,
 	# classes
 	Circle,
 	ConvexPolygon,
+	DuplicateFilter,
+	EigenvalueIndex,
 	IrregularStar,
+	IsospectralityIndex,
+	MaskCache,
+	ShapeBank,
+	ShapeCollection,
 	TravellingSalesmanPolygon,
 	UnitRectangle,
 	# UnitTriangle,
 	# types
 	Ellipse,
+	LineIntersection,
 	Polygon,
 )
 
@@ -40,6 +57,45 @@ class GeometryTests(TestCase):
 	Tests used in conjunction with `/geometry`.
 	'''
 
+	def test_canonical(self) -> None:
+		'''
+		Test the canonical form of a shape.
+		'''
+
+		for _ in range(100):
+			polygon = ConvexPolygon()
+			theta = random.uniform(0., 2. * np.pi)
+			rotation = np.array([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]])
+			transformed = np.roll(polygon.vertices @ rotation.T * random.uniform(0.1, 10.) + np.random.random(2), 1, axis=0)
+
+			# This test asserts that the canonical form is invariant to translation, scale, rotation and vertex order.
+			self.assertTrue(np.array_equal(canonicalPolygon(polygon.vertices), canonicalPolygon(transformed)))
+
+			# This test asserts that the canonical form is invariant to reflection.
+			self.assertTrue(np.array_equal(canonicalPolygon(polygon.vertices), canonicalPolygon(transformed * [-1., 1.])))
+
+			# This test asserts that the canonical form is invariant to the orientation of the vertices.
+			self.assertTrue(np.array_equal(canonicalPolygon(polygon.vertices), canonicalPolygon(transformed[::-1])))
+
+			# This test asserts that the canonical form is bounded by the largest vector.
+			self.assertLessEqual(np.abs(canonicalPolygon(polygon.vertices, 1e-3)).max(), 1000)
+
+		# This test asserts that congruent shapes are hashed equally, whilst other shapes are not.
+		self.assertEqual(shapeHash(UnitRectangle(1.)), shapeHash(Polygon(UnitRectangle(1.).vertices[::-1] * 2.)))
+		self.assertNotEqual(shapeHash(UnitRectangle(1.)), shapeHash(UnitRectangle(2.)))
+		self.assertEqual(shapeHash(Ellipse(2., 1.)), shapeHash(Ellipse(1., 0.5)))
+		self.assertNotEqual(shapeHash(Ellipse(2., 1.)), shapeHash(Circle()))
+
+		# This test asserts that the duplicate filter only accepts unique shapes.
+		shapes = DuplicateFilter()
+		self.assertTrue(shapes.add(UnitRectangle(1.)))
+		self.assertFalse(shapes.add(Polygon(UnitRectangle(1.).vertices + 1.)))
+		self.assertTrue(shapes.add(Circle()))
+		self.assertIn(Circle(2.), shapes)
+		self.assertEqual(len(shapes), 2)
+		shapes.clear()
+		self.assertNotIn(Circle(), shapes)
+
 	def test_circle(self) -> None:
 		'''
 		Test properties of the type Circle.
@@ -58,6 +114,10 @@ class GeometryTests(TestCase):
 			self.assertTrue(C.isPointInside((r_1 * math.cos(theta), r_1 * math.sin(theta))))
 			self.assertFalse(C.isPointInside((r_2 * math.cos(theta), r_2 * math.sin(theta))))
 
+		# This test asserts that the vectorised point test agrees with isPointInside().
+		P = np.random.uniform(-2., 2., (100, 2))
+		self.assertTrue(np.array_equal(C.arePointsInside(P), [C.isPointInside((p[0], p[1])) for p in P]))
+
 		for r in [0.1, 0.25, 0.5, 1., 2.]:
 			C = Circle(r)
 
@@ -83,6 +143,10 @@ class GeometryTests(TestCase):
 			# This test asserts that the default eccentricity is 0.
 			self.assertEqual(C.eccentricity(), 0.0)
 
+			# This test asserts that the perimeter and bounding box of a circle are correct.
+			self.assertAlmostEqual(C.perimeter, 2. * np.pi * C.r)
+			self.assertEqual(C.boundingBox, ((-C.r, -C.r), (C.r, C.r)))
+
 			# This test asserts that the default focal distance is 0.
 			self.assertEqual(C.focalDistance(), 0.0)
 
@@ -261,9 +325,24 @@ class GeometryTests(TestCase):
 			# This test asserts that the centroid is within the shape.
 			self.assertTrue(E.isPointInside(E.centroid))
 
+			# This test asserts that points sampled from the ellipse lie within it.
+			self.assertTrue(E.arePointsInside(E.samplePoints(100)).all())
+
 			# This test asserts that the default eccentricity is less than 1.
 			self.assertLessEqual(E.eccentricity(), 1.)
 
+			# This test asserts that the perimeter of an ellipse is bounded by those of its inscribed and circumscribed circles.
+			self.assertLessEqual(2. * np.pi * E.minor, E.perimeter + 1e-12)
+			self.assertLessEqual(E.perimeter, 2. * np.pi * E.major + 1e-12)
+
+			# This test asserts that cached properties are updated when the shape of the ellipse changes.
+			eccentricity = E.eccentricity()
+			perimeter = E.perimeter
+			E.area = 4. * E.area
+			self.assertAlmostEqual(E.eccentricity(), eccentricity)
+			self.assertAlmostEqual(E.perimeter, 2. * perimeter)
+			E.area = E.area / 4.
+
 			# This test asserts that the default focal distance is less than 1.
 			self.assertLessEqual(E.focalDistance(), 1.)
 
@@ -277,6 +356,11 @@ class GeometryTests(TestCase):
 			E.area = random_area
 			self.assertAlmostEqual(E.area, random_area)
 
+			# This test asserts that the fractional coverage of the ellipse approximates its normalised area.
+			C = E.drawCoverage(101, supersample=8)
+			self.assertTrue(C.min() >= 0. and C.max() <= 1.)
+			self.assertAlmostEqual(C.sum() / (101 ** 2), math.pi * 0.25 * E.minor / E.major, places=3)
+
 			# This test asserts that the center of the boolean mask is always true.
 			M = E.draw(101)
 			self.assertEqual(M[50, 50], 1)
@@ -293,11 +377,106 @@ class GeometryTests(TestCase):
 			self.assertEqual(E.centroid[0], -10.)
 			self.assertEqual(E.centroid[1], -10.)
 
+	def test_isospectrality(self) -> None:
+		'''
+		Test the heat trace invariants and the isospectrality index.
+		'''
+
+		# This test asserts that the heat trace invariants of a square are correct, regardless of its orientation.
+		square = UnitRectangle(1.)
+		for vertices in [square.vertices, square.vertices[::-1]]:
+			A, L, c = heatTraceInvariants(Polygon(vertices))
+			self.assertAlmostEqual(A, 1.)
+			self.assertAlmostEqual(L, 4.)
+			self.assertAlmostEqual(c, 0.25)
+
+		# This test asserts that the corner term of a smooth shape is 1 / 6.
+		self.assertEqual(heatTraceInvariants(Circle())[2], 1. / 6.)
+
+		# This test asserts that congruent shapes are found to be candidates, whilst other shapes are not.
+		theta = random.uniform(0., 2. * np.pi)
+		rotation = np.array([[np.cos(theta), -np.sin(theta)], [np.sin(theta), np.cos(theta)]])
+		index = IsospectralityIndex([
+			square,
+			Circle(),
+			UnitRectangle(2.),
+			Polygon(np.roll(square.vertices @ rotation.T + 5., 1, axis=0)),
+		] + [ConvexPolygon() for _ in range(20)])
+		self.assertEqual(len(index), 24)
+		self.assertTrue(np.array_equal(index.candidates(), [[0, 3]]))
+		self.assertTrue(np.array_equal(index.query(square), [0, 3]))
+
+		# This test asserts that the candidate pairs match an exhaustive pairwise search.
+		index = IsospectralityIndex(atol=1e-3, rtol=0.)
+		invariants = np.random.randint(0, 10, (1000, 3)) + np.random.uniform(0., 2e-3, (1000, 3))
+		index.addInvariants(invariants[:500])
+		index.addInvariants(invariants[500:])
+		i, j = np.triu_indices(1000, 1)
+		within = np.all(np.abs(invariants[i] - invariants[j]) <= 1e-3, axis=1)
+		self.assertTrue(np.array_equal(index.candidates(chunk_size=100), np.stack([i[within], j[within]], axis=1)))
+
+		# This test asserts that the eigenvalues of a square approximate π²(m² + n²), and are invariant to scale.
+		eigenvalues = dirichletEigenvalues(square, k=4)
+		self.assertTrue(np.allclose(eigenvalues / eigenvalues[0], [1., 2.5, 2.5, 4.], rtol=0.05))
+		self.assertTrue(np.allclose(eigenvalues, np.pi ** 2 * np.array([2., 5., 5., 8.]), rtol=0.1))
+		self.assertTrue(np.array_equal(dirichletEigenvalues(Polygon(square.vertices * 3.), k=4), eigenvalues))
+
+		with TemporaryDirectory() as tmp:
+			# This test asserts that an unbuilt eigenvalue index answers queries exactly.
+			path = os.path.join(tmp, 'eigenvalues.npy')
+			index_eigenvalues = EigenvalueIndex(path, N=1000, k=4)
+			index_eigenvalues.eigenvalues[:] = np.random.random((1000, 4))
+			index_eigenvalues.compute([square], start=10)
+			nearest, distances = index_eigenvalues.query(square, n=1)
+			self.assertEqual(nearest[0], 10)
+			self.assertAlmostEqual(distances[0], 0., places=4)
+			q = np.random.random(4)
+			nearest, distances = index_eigenvalues.query(q)
+			exact = np.linalg.norm(np.asarray(index_eigenvalues.eigenvalues, dtype=np.float64) - q, axis=1)
+			self.assertTrue(np.array_equal(nearest, np.argsort(exact, kind='stable')[:10]))
+			self.assertTrue(np.all(np.diff(distances) >= 0.))
+
+			# This test asserts that a built index is exact when every inverted list is probed, and persists on disk.
+			index_eigenvalues.build(n_lists=16)
+			self.assertTrue(np.array_equal(index_eigenvalues.query(q, n_probe=16)[0], nearest))
+			self.assertTrue(np.array_equal(EigenvalueIndex(path).query(q, n_probe=16)[0], nearest))
+
 	def test_lines(self) -> None:
 		'''
 		Test properties of lines and curves.
 		'''
 
+		# This test asserts that findIntersections() reports the crossing edges of a bowtie.
+		self.assertTrue(np.array_equal(
+			findIntersections(np.array([[0., 0.], [1., 1.], [1., 0.], [0., 1.]])),
+			np.array([[0, 2]]),
+		))
+
+		# This test asserts that findIntersections() reports nothing for a simple polygon.
+		self.assertEqual(findIntersections(np.array([[0., 0.], [0., 1.], [1., 1.], [1., 0.]])).shape, (0, 2))
+
+		# This test asserts that findIntersections() reports adjacent edges that fold back on one another, as well as
+		# polygons which touch themselves.
+		self.assertTrue(np.array_equal(
+			findIntersections(np.array([[0., 0.], [2., 0.], [1., 0.], [1., 1.]])),
+			np.array([[0, 1], [0, 2]]),
+		))
+		self.assertTrue(np.array_equal(
+			findIntersections(np.array([[0., 0.], [2., 0.], [2., 2.], [1., 0.], [0., 2.]])),
+			np.array([[0, 2], [0, 3]]),
+		))
+
+		# This test asserts that findIntersections() agrees with a pairwise comparison of every pair of edges.
+		for _ in range(100):
+			V = np.random.uniform(0., 1., (20, 2))
+			pairwise = [
+				[i, j] for i in range(20) for j in range(i + 2, 20) if (i, j) != (0, 19) and lineIntersection(
+					np.array([V[i], V[i + 1]]),
+					np.array([V[j], V[(j + 1) % 20]]),
+				)[0] != 'none'
+			]
+			self.assertTrue(np.array_equal(findIntersections(V), np.array(pairwise).reshape(-1, 2)))
+
 		# This test asserts that lineIntersection() correctly reports none.
 		does_it_cross, cross_point = lineIntersection(
 			np.array([[0., 0.], [1., 0.]]),
@@ -411,6 +590,79 @@ class GeometryTests(TestCase):
 		self.assertEqual(does_it_cross, 'none')
 		self.assertTrue(cross_point[0] == 0. and cross_point[1] == 0.)
 
+		# This test asserts that lineIntersections() matches lineIntersection() for each pair of line segments.
+		segments = np.random.randint(0, 3, (40, 2, 2)).astype(np.float64)
+		types, points = lineIntersections(segments[:20], segments[20:])
+		self.assertEqual(types.shape, (20,))
+		self.assertEqual(points.shape, (20, 2))
+		for n in range(20):
+			does_it_cross, cross_point = lineIntersection(segments[n], segments[n + 20])
+			self.assertEqual(LineIntersection(types[n]).name.lower(), does_it_cross)
+			self.assertTrue(np.array_equal(points[n], cross_point, equal_nan=True))
+
+		# This test asserts that lineIntersections() compares every pair of line segments when B is omitted.
+		types, points = lineIntersections(segments)
+		self.assertEqual(types.shape, (780,))
+		for k, (i, j) in enumerate(zip(*np.triu_indices(40, 1))):
+			does_it_cross, cross_point = lineIntersection(segments[i], segments[j])
+			self.assertEqual(LineIntersection(types[k]).name.lower(), does_it_cross)
+			self.assertTrue(np.array_equal(points[k], cross_point, equal_nan=True))
+
+		# This test asserts that largestVector() matches an exhaustive pairwise search, including the indices of tied and
+		# duplicate points.
+		for _ in range(1000):
+			for points in [
+				np.random.random((random.randint(1, 50), 2)),
+				np.random.randint(0, 4, (random.randint(1, 50), 2)).astype(np.float64),
+			]:
+				LV = largestVector(points)
+				LV_pairwise = _largestVectorPairwise(points)
+				self.assertAlmostEqual(LV[0], LV_pairwise[0])
+				self.assertEqual(LV[1], LV_pairwise[1])
+
+	def test_mask_cache(self) -> None:
+		'''
+		Test the rasterised mask cache.
+		'''
+
+		with TemporaryDirectory() as cache_dir:
+			cache = MaskCache(max_size=2, cache_dir=cache_dir)
+			shapes = [Circle(), Ellipse(minor=0.5), IrregularStar(), TravellingSalesmanPolygon()]
+			for S in shapes:
+				M = cache.draw(S, 64)
+
+				# This test asserts that a cached mask is identical to the mask drawn by the shape.
+				self.assertEqual(M.dtype, np.int8)
+				self.assertTrue(np.array_equal(M, S.draw(64)))
+				self.assertTrue(np.array_equal(cache.draw(S, 64), M))
+
+				# This test asserts that the cache is keyed by the size of the grid.
+				self.assertEqual(cache.draw(S, 32).shape, (32, 32))
+
+			# This test asserts that the in-memory cache never exceeds its maximum size.
+			self.assertEqual(len(cache), 2)
+
+			# This test asserts that masks are persisted to disk and can be recovered by a new cache.
+			self.assertEqual(len(os.listdir(cache_dir)), len(shapes) * 2)
+			cache = MaskCache(max_size=0, cache_dir=cache_dir)
+			for S in shapes:
+				self.assertTrue(np.array_equal(cache.draw(S, 64), S.draw(64)))
+			self.assertEqual(len(cache), 0)
+
+			# This test asserts that a mask which is truncated on disk is treated as a cache miss, and is then repaired.
+			path = os.path.join(cache_dir, f'{MaskCache.key(shapes[0], 64)}.npy')
+			with open(path, 'r+b') as f:
+				f.truncate(os.path.getsize(path) // 2)
+			self.assertTrue(np.array_equal(cache.draw(shapes[0], 64), shapes[0].draw(64)))
+			self.assertTrue(np.array_equal(MaskCache(cache_dir=cache_dir).draw(shapes[0], 64), shapes[0].draw(64)))
+			self.assertEqual(len(os.listdir(cache_dir)), len(shapes) * 2)
+
+		# This test asserts that equal geometries share the same key, whilst different geometries do not.
+		P = IrregularStar()
+		self.assertEqual(MaskCache.key(P, 64), MaskCache.key(Polygon(P.vertices.copy()), 64))
+		self.assertNotEqual(MaskCache.key(P, 64), MaskCache.key(P, 32))
+		self.assertNotEqual(MaskCache.key(Circle(0.5), 64), MaskCache.key(Circle(0.25), 64))
+
 	def test_random_polygon(self) -> None:
 		'''
 		Stress test multiple properties of random polygons.
@@ -467,6 +719,9 @@ class GeometryTests(TestCase):
 				for p in polygon.vertices:
 					self.assertTrue(_isPointInsidePolygon(p, polygon.vertices))
 
+				# This test asserts that points sampled from the polygon lie within it.
+				self.assertTrue(polygon.arePointsInside(polygon.samplePoints(10)).all())
+
 				if polygon.convex():
 					# This test asserts that all supposedly convex polygons are in fact convex. As a result, if this test passes, we
 					# can assume that the _generateConvexPolygon() function works as intended.
@@ -516,6 +771,163 @@ class GeometryTests(TestCase):
 				polygon.area = np.pi
 				self.assertAlmostEqual(polygon.area, np.pi)
 
+				# This test asserts that the cached properties of a polygon agree with a newly constructed polygon after it has
+				# been transformed.
+				copy = Polygon(polygon.vertices.copy())
+				self.assertAlmostEqual(polygon.area, copy.area)
+				self.assertAlmostEqual(polygon.centroid[0], copy.centroid[0])
+				self.assertAlmostEqual(polygon.centroid[1], copy.centroid[1])
+				self.assertEqual(polygon.convex(), copy.convex())
+				self.assertEqual(polygon.simple(), copy.simple())
+				points = polygon.samplePoints(100)
+				self.assertTrue(np.array_equal(polygon.arePointsInside(points), copy.arePointsInside(points)))
+
+		for P in [
+			ConvexPolygon,
+			IrregularStar,
+			TravellingSalesmanPolygon,
+		]:
+			vertices, N = generatePolygons(P, 100, max_vertices=20)
+
+			# This test asserts that a batch of polygons is stored as a zero padded structure of arrays.
+			self.assertEqual(vertices.shape, (100, N.max(), 2))
+			self.assertTrue(np.all(N >= 3) and np.all(N <= 20))
+
+			for k in range(100):
+				polygon = Polygon(vertices[k, :N[k]])
+
+				# This test asserts that each polygon in the batch is simple, normalised and correctly padded.
+				self.assertTrue(polygon.simple())
+				self.assertEqual(polygon.vertices.min(), -1.)
+				self.assertEqual(polygon.vertices.max(), 1.)
+				self.assertTrue(np.all(vertices[k, N[k]:] == 0.))
+
+				# This test asserts that a mask drawn into a strided buffer is identical to a newly allocated mask.
+				M = polygon.draw(101)
+				B = np.zeros((103, 103), np.int8)
+				polygon.draw(101, out=B[1:-1, 1:-1])
+				self.assertTrue(np.array_equal(B[1:-1, 1:-1], M))
+				self.assertEqual(B.sum(), M.sum())
+
+				# This test asserts that the fractional coverage of a polygon is bounded, and reduces to its mask when each cell
+				# is sampled only at its centre.
+				C = polygon.drawCoverage(101)
+				self.assertTrue(C.min() >= 0. and C.max() <= 1.)
+				self.assertTrue(np.array_equal(polygon.drawCoverage(101, supersample=1), M))
+
+			# This test asserts that a seeded batch of polygons can be generated in parts, and that a random polygon is
+			# reproducible given a seeded generator.
+			V_1, N_1 = generatePolygons(P, 10, max_vertices=20, seed=1)
+			V_2, N_2 = generatePolygons(P, 6, max_vertices=20, seed=1, start=4)
+			self.assertTrue(np.array_equal(N_1[4:], N_2))
+			self.assertTrue(np.array_equal(V_1[4:, :N_2.max()], V_2))
+			self.assertTrue(np.array_equal(
+				P(rng=np.random.default_rng(1)).vertices,
+				P(rng=np.random.default_rng(1)).vertices,
+			))
+
+		# This test asserts that travelling salesman polygons with many vertices are simple.
+		for _ in range(5):
+			polygon = TravellingSalesmanPolygon(N=200)
+			self.assertEqual(polygon.N(), 200)
+			self.assertTrue(polygon.simple())
+			self.assertEqual(findIntersections(polygon.vertices).shape, (0, 2))
+
+	def test_shape_bank(self) -> None:
+		'''
+		Test the memory-mapped shape bank.
+		'''
+
+		with TemporaryDirectory() as tmp:
+			shapes = [ConvexPolygon(), IrregularStar(), UnitRectangle()]
+			bank = ShapeBank.create(os.path.join(tmp, 'bank'), shapes, 3, H=31)
+
+			# This test asserts that the bank stores every shape, its centroid and its mask.
+			self.assertEqual(len(bank), 3)
+			for i, shape in enumerate(shapes):
+				self.assertTrue(np.array_equal(bank.getVertices(i), shape.vertices))
+				self.assertTrue(np.array_equal(bank[i].vertices, shape.vertices))
+				self.assertEqual(bank.getCentroid(i), shape.centroid)
+				self.assertTrue(np.array_equal(bank.getMask(i), shape.draw(31)))
+				out = np.ones((31, 31), dtype=np.int8)
+				bank.getMask(i, out=out)
+				self.assertTrue(np.array_equal(out, shape.draw(31)))
+
+			# This test asserts that the bank is memory-mapped, and can be reopened.
+			self.assertIsInstance(bank.vertices, np.memmap)
+			self.assertEqual(ShapeBank(os.path.join(tmp, 'bank')).getCentroid(2), shapes[2].centroid)
+
+			# This test asserts that a bank can be generated natively, with the same properties as each class.
+			polygons: list[type[Polygon]] = [ConvexPolygon, UnitRectangle]
+			for P in polygons:
+				bank = ShapeBank.generate(os.path.join(tmp, P.__name__), P, 10, centroids=False, chunk_size=4)
+				self.assertEqual(len(bank), 10)
+				self.assertEqual(bank.shape, P.__name__)
+				self.assertIsNone(bank.masks)
+				for shape in bank:
+					self.assertTrue(shape.convex())
+
+	def test_shape_collection(self) -> None:
+		'''
+		Test the contiguous collection of shapes, and the slots of each shape.
+		'''
+
+		convex = ConvexPolygon()
+		star = IrregularStar()
+		shapes = [convex, Circle(0.5, (1., 1.)), star, Ellipse(2., 1.), UnitRectangle()]
+		collection = ShapeCollection(shapes)
+
+		# This test asserts that shapes do not allocate an instance dictionary.
+		for shape in shapes:
+			self.assertFalse(hasattr(shape, '__dict__'))
+
+		# This test asserts that the collection stores every shape contiguously, and returns views which are equal to each
+		# shape.
+		self.assertEqual(len(collection), 5)
+		self.assertEqual(collection.vertices.shape, (sum(S.N() for S in shapes if isinstance(S, Polygon)), 2))
+		for shape, view in zip(shapes, collection):
+			self.assertEqual(view.__getLabels__(), shape.__getLabels__() if not isinstance(shape, Polygon) else {
+				'N': [shape.N()],
+				'vertices': shape.vertices.tolist(),
+			})
+			self.assertAlmostEqual(view.area, shape.area)
+			self.assertTrue(np.allclose(view.centroid, shape.centroid))
+			self.assertEqual(view.boundingBox, shape.boundingBox)
+			self.assertTrue(np.array_equal(view.draw(31), shape.draw(31)))
+		self.assertIsInstance(collection[0], Polygon)
+		self.assertIsInstance(collection[1], Circle)
+		self.assertIsInstance(collection[3], Ellipse)
+
+		# This test asserts that a view of a polygon is lightweight, such that its native polygon and cache are only created
+		# when a geometric method is first called.
+		view = collection[0]
+		assert isinstance(view, Polygon)
+		self.assertIsNone(view._native)
+		self.assertFalse(hasattr(view, '_cache'))
+		view.N()
+		view.vertices
+		self.assertIsNone(view._native)
+		self.assertTrue(view.isPointInside(view.centroid))
+		self.assertIsNotNone(view._native)
+		view.boundingBox
+		self.assertTrue(hasattr(view, '_cache'))
+
+		# This test asserts that a view of a polygon shares its vertices with the collection, and is copied on write.
+		view = collection[0]
+		assert isinstance(view, Polygon)
+		self.assertTrue(np.shares_memory(view.vertices, collection.vertices))
+		view.centroid = (1., 1.)
+		view.area = 2.
+		self.assertFalse(np.shares_memory(view.vertices, collection.vertices))
+		self.assertTrue(np.allclose(view.centroid, (1., 1.)))
+		self.assertTrue(np.array_equal(collection[0].__getLabels__()['vertices'], convex.vertices))
+
+		# This test asserts that a collection can be created from a ragged array of vertices without copying.
+		from_polygons = ShapeCollection.fromPolygons(collection.vertices, collection.offsets)
+		self.assertEqual(len(from_polygons), 4 - 1)
+		self.assertTrue(np.shares_memory(from_polygons.vertices, collection.vertices))
+		self.assertTrue(np.array_equal(from_polygons[1].__getLabels__()['vertices'], star.vertices))
+
 	def test_unit_polygon(self) -> None:
 		'''
 		Test used in conjunction with ./unit_polygons.py.
@@ -533,6 +945,17 @@ class GeometryTests(TestCase):
 			self.assertEqual(R.area, 1.)
 			self.assertEqual(R.centroid, (0., 0.))
 
+			# This test asserts that the perimeter and bounding box of the UnitRectangle are correct.
+			self.assertAlmostEqual(R.perimeter, 2. * (epsilon + (1. / epsilon)))
+			self.assertEqual(R.boundingBox, ((-epsilon / 2., -0.5 / epsilon), (epsilon / 2., 0.5 / epsilon)))
+
+			# This test asserts that the cached bounding box follows a translation, and the perimeter follows scaling.
+			R.centroid = (1., 2.)
+			self.assertAlmostEqual(R.boundingBox[0][0], 1. - (epsilon / 2.))
+			self.assertAlmostEqual(R.boundingBox[1][1], 2. + (0.5 / epsilon))
+			R.area = 4.
+			self.assertAlmostEqual(R.perimeter, 4. * (epsilon + (1. / epsilon)))
+
 		# Test the vertices and area of the UnitTriangle for varying r, theta.
 		# for [r, theta] in [
 		# 	(0.5, np.pi / 2.),
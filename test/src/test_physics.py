@@ -11,9 +11,17 @@ from kac_drumset.physics import (
 	equilateralTriangleAmplitudes,
 	FDTDWaveform2D,
 	raisedCosine,
+	raisedCosineBatch,
+	raisedCosineBatchCompact,
+	raisedCosineCompact,
 	raisedTriangle,
+	raisedTriangleBatch,
+	raisedTriangleBatchCompact,
+	raisedTriangleCompact,
 	rectangularAmplitudes,
+	WaveEquationWaveforms2D,
 	FDTD_2D,
+	FDTDWorkspace,
 )
 
 
@@ -37,6 +45,14 @@ class PhysicsTests(TestCase):
 					places=14,
 				)
 
+		# This test asserts that a waveform is rendered for every set of amplitudes, using a shared basis.
+		A = np.stack([circularAmplitudes(0.5, np.pi / 4., series), np.zeros(series.shape)])
+		W = WaveEquationWaveforms2D(series * 100., A, 0., 1. / 48000., 1000)
+		self.assertEqual(W.shape, (2, 1000))
+		self.assertLessEqual(W.max(), 1.)
+		self.assertGreaterEqual(W.min(), -1.)
+		self.assertEqual(np.abs(W[1]).max(), 0.)
+
 	def test_fdtd(self) -> None:
 		'''
 		Tests used in conjunction with `fdtd.hpp`.
@@ -70,6 +86,70 @@ class PhysicsTests(TestCase):
 		self.assertLessEqual(waveform.max(), 1.)
 		self.assertGreaterEqual(waveform.min(), -1.)
 
+		# This test asserts that compact initial conditions produce the same waveform as the full grid.
+		window, (x, y) = raisedCosineCompact((8, 8), (3., 3.))
+		compact = FDTDWaveform2D(
+			u_0=(np.zeros((0, 0)), (0, 0)),
+			u_1=(window, (x + 1, y + 1)),
+			B=B,
+			c_0=c_0,
+			c_1=c_1,
+			c_2=c_2,
+			T=20,
+			w=(0.5, 0.5),
+		)
+		self.assertTrue(np.allclose(compact, waveform))
+
+		# This test asserts that the workspace reproduces the FDTD iterator, sampled at a grid index.
+		iterator = [u[5, 4] for u in FDTD_2D(u_0.tolist(), u_1.tolist(), B.tolist(), c_0, c_1, c_2, T=20)]
+		workspace = FDTDWorkspace((12, 12), 20, lanes=2)
+		workspace.setBoundary(B)
+		self.assertEqual(workspace.gridSize(), (10, 10))
+		self.assertTrue(np.allclose(workspace.render(u_0, u_1, c_0, c_1, c_2, (5, 4)), iterator))
+		# This test asserts that the workspace is reusable across strikes and boundary conditions, and that each lane of a
+		# batch is independent.
+		W = workspace.renderBatch(u_0, [(window, (x + 1, y + 1)), (np.zeros((0, 0)), (0, 0))], c_0, c_1, c_2, (5, 4))
+		self.assertEqual(W.shape, (2, 20))
+		self.assertTrue(np.allclose(W[0], iterator))
+		self.assertEqual(np.abs(W[1]).max(), 0.)
+		workspace.setBoundary(np.pad(np.ones((6, 6), dtype=np.int8), 1, mode='constant'))
+		self.assertEqual(workspace.gridSize(), (8, 8))
+		self.assertFalse(np.allclose(workspace.render(u_0[:8, :8], u_1[:8, :8], c_0, c_1, c_2, (5, 4)), iterator))
+		# This test asserts that the 9-point stencil weights the diagonal neighbours of each cell by c_3.
+		u, v = u_0.copy(), u_1.copy()
+		for _ in range(20):
+			u[1:-1, 1:-1] = B[1:-1, 1:-1] * (
+				c_0 * (v[2:, 1:-1] + v[:-2, 1:-1] + v[1:-1, 2:] + v[1:-1, :-2]) +
+				c_1 * v[1:-1, 1:-1] - c_2 * u[1:-1, 1:-1] +
+				0.1 * (v[2:, 2:] + v[2:, :-2] + v[:-2, 2:] + v[:-2, :-2])
+			)
+			u, v = v, u
+		workspace.setBoundary(B)
+		self.assertAlmostEqual(workspace.render(u_0, u_1, c_0, c_1, c_2, (5, 4), 0.1)[-1], v[5, 4], places=12)
+		# This test asserts that any part of a strike which lies outside of the drum is discarded, such that the workspace is
+		# equal to a dense reference which is masked by the boundary conditions at every step.
+		B_inner = np.zeros((12, 12), dtype=np.int8)
+		B_inner[2:10, 2:10] = 1
+		strike = np.zeros((12, 12))
+		strike[1:4, 1:4] = 1.
+		workspace = FDTDWorkspace((12, 12), 20)
+		workspace.setBoundary(B_inner)
+		for c_3 in [0., 0.1]:
+			u, v = np.zeros((12, 12)), strike * B_inner
+			reference = []
+			for _ in range(20):
+				u[1:-1, 1:-1] = B_inner[1:-1, 1:-1] * (
+					c_0 * (v[2:, 1:-1] + v[:-2, 1:-1] + v[1:-1, 2:] + v[1:-1, :-2]) +
+					c_1 * v[1:-1, 1:-1] - c_2 * u[1:-1, 1:-1] +
+					c_3 * (v[2:, 2:] + v[2:, :-2] + v[:-2, 2:] + v[:-2, :-2])
+				)
+				u, v = v, u
+				reference.append(v[3, 3])
+			self.assertTrue(np.allclose(workspace.render(np.zeros((12, 12)), strike, c_0, c_1, c_2, (3, 3), c_3), reference))
+		# This test asserts that the workspace rejects batches larger than its amount of lanes.
+		with self.assertRaises(ValueError):
+			workspace.renderBatch(u_0, np.stack([u_1] * 3), c_0, c_1, c_2, (5, 4))
+
 	def test_lamé(self) -> None:
 		'''
 		Tests used in conjunction with triangular_modes.hpp.
@@ -156,3 +236,58 @@ class PhysicsTests(TestCase):
 		self.assertGreater(rc[51, 50], 0.)
 		self.assertGreater(rc[50, 49], 0.)
 		self.assertGreater(rc[50, 51], 0.)
+
+		# This test asserts that the compact distributions span only their support, and are equal to the full matrix.
+		for matrix_size, mu, compact, full in [
+			((100, ), (50.5, ), raisedCosineCompact((100, ), (50.5, ), sigma=10), raisedCosine((100, ), (50.5, ), sigma=10)),
+			(
+				(100, 100),
+				(3., 50.),
+				raisedCosineCompact((100, 100), (3., 50.), sigma=10),
+				raisedCosine((100, 100), (3., 50.), sigma=10),
+			),
+			(
+				(100, 100),
+				(50., 50.),
+				raisedTriangleCompact((100, 100), (50., 50), x_ab=(30., 70.), y_ab=(40.5, 60.)),
+				raisedTriangle((100, 100), (50., 50), x_ab=(30., 70.), y_ab=(40.5, 60.)),
+			),
+		]:
+			window, offset = compact
+			self.assertLessEqual(window.size, 41 * 41)
+			expanded = np.zeros(matrix_size)
+			expanded[tuple(slice(o, o + n) for o, n in zip(offset, window.shape))] = window
+			self.assertTrue(np.allclose(expanded, full))
+
+		# This test asserts that a batch of distributions is equal to each distribution calculated individually, and that
+		# each compact window is equal to the support of the same distribution.
+		centres = np.array([[3., 50.], [50.5, 50.], [98.2, 99.]])
+		widths = np.array([10., 4.5, 7.])
+		x_ab = np.array([[2., 40.], [45., 55.], [40., 99.]])
+		y_ab = np.array([[40., 60.], [45., 55.5], [40., 99.]])
+		for distributions, batch, (windows, offsets) in [
+			(
+				[raisedCosine((100, 100), (centres[k, 0], centres[k, 1]), widths[k]) for k in range(3)],
+				raisedCosineBatch((100, 100), centres, widths),
+				raisedCosineBatchCompact((100, 100), centres, widths),
+			),
+			(
+				[
+					raisedTriangle((100, 100), (centres[k, 0], centres[k, 1]), tuple(x_ab[k]), tuple(y_ab[k]))
+					for k in range(3)
+				],
+				raisedTriangleBatch((100, 100), centres, x_ab, y_ab),
+				raisedTriangleBatchCompact((100, 100), centres, x_ab, y_ab),
+			),
+		]:
+			self.assertEqual(batch.shape, (3, 100, 100))
+			self.assertEqual(offsets.shape, (3, 2))
+			for k in range(3):
+				self.assertTrue(np.allclose(batch[k], distributions[k]))
+				expanded = np.zeros((300, 300))
+				expanded[
+					offsets[k, 0] + 100:offsets[k, 0] + 100 + windows.shape[1],
+					offsets[k, 1] + 100:offsets[k, 1] + 100 + windows.shape[2],
+				] = windows[k]
+				self.assertTrue(np.allclose(expanded[100:200, 100:200], distributions[k]))
+				self.assertAlmostEqual(expanded.sum(), distributions[k].sum())
@@ -1,4 +1,5 @@
 # core
+import math
 import os
 from unittest import TestCase
 
@@ -11,15 +12,23 @@ from kac_drumset.geometry import (
 	ConvexPolygon,
 	Ellipse,
 	IrregularStar,
+	Polygon,
 	Shape,
+	ShapeBank,
+	shapeHash,
 	TravellingSalesmanPolygon,
 )
 from kac_drumset.samplers import (
+	# methods
+	generateParallel,
+	# classes
 	BesselModel,
 	FDTDModel,
 	LaméModel,
 	PoissonModel,
+	PreparedDrum,
 )
+from kac_drumset.samplers.resample import resample
 from kac_prediction.utils import clearDirectory
 
 
@@ -77,6 +86,31 @@ class SamplerTests(TestCase):
 			self.assertLessEqual(model.waveform.max(), 1.)
 			self.assertGreaterEqual(model.waveform.min(), -1.)
 
+		# This test asserts that one channel is rendered per pickup.
+		settings = {'duration': 1., 'sample_rate': 48000, 'pickups': [(0.5, 0.), (0.5, np.pi / 2.)]}
+		model = BesselModel(**settings)
+		model.updateProperties(0)
+		model.generateWaveform()
+		self.assertEqual(model.waveform.shape, (2, model.length))
+		self.assertLessEqual(model.waveform.max(), 1.)
+		self.assertGreaterEqual(model.waveform.min(), -1.)
+
+		# This test asserts that a batch of samples must not contain duplicate indices.
+		with self.assertRaises(AssertionError):
+			model.generateBatch([0, 0])
+
+		# This test asserts that a batch of samples is equal to the same samples generated one at a time.
+		np.random.seed(0)
+		waveforms, labels = model.generateBatch(range(10))
+		self.assertEqual(waveforms.shape, (10, *model.waveform.shape))
+		np.random.seed(0)
+		for i in range(10):
+			model.updateProperties(i)
+			model.generateWaveform()
+			self.assertTrue(np.allclose(waveforms[i], model.waveform))
+			self.assertEqual(labels['drum_size'][i], model.getLabels()['drum_size'])
+			self.assertEqual(labels['strike_location'][i], model.getLabels()['strike_location'])
+
 	def test_fdtd_model(self) -> None:
 		'''
 		Tests used in conjunction with `samplers/fdtd_model.py`.
@@ -136,9 +170,11 @@ class SamplerTests(TestCase):
 						)
 						model.updateProperties()
 
-						# This test asserts that the boundary considitions matches the size H
+						# This test asserts that the boundary conditions are cropped from a grid of size H
 						# model.H + 2 is used to account for model.B being padded
-						self.assertEqual(model.B.shape[0], model.H + 2)
+						self.assertLessEqual(max(model.B.shape), model.H + 2)
+						self.assertTrue(min(model.drum.origin) >= 0)
+						self.assertEqual(model.B[[0, -1]].sum() + model.B[:, [0, -1]].sum(), 0)
 
 						# This test asserts that the listening location is always within the drum.
 						# model.H + 1 is used to account for model.B being padded
@@ -166,6 +202,200 @@ class SamplerTests(TestCase):
 							# fails sporadically
 							# self.assertNotEqual(np.sum(model.waveform), 0.)
 
+		# This test asserts that a model with a bandwidth is simulated at its internal rate, and that the waveform is equal
+		# to the same simulation resampled to the sample rate.
+		model = FDTDModel(arbitrary_shape=ConvexPolygon, bandwidth=8000., duration=0.02, sample_rate=96000)
+		internal = FDTDModel(arbitrary_shape=ConvexPolygon, duration=0.02, sample_rate=20000)
+		self.assertEqual(model.internal_rate, 20000)
+		self.assertEqual(model.H, internal.H)
+		model.updateProperties(0)
+		model.generateWaveform()
+		self.assertEqual(model.waveform.shape, (model.length,))
+		self.assertFalse(np.isnan(model.waveform).any())
+		internal.drum = model.drum
+		internal.strike = model.strike
+		internal.generateWaveform()
+		self.assertTrue(np.allclose(model.waveform, resample(internal.waveform, 20000, 96000, model.length)))
+		# This test asserts that a non-round bandwidth is simulated at a rate in steps of 100 Hz, such that the reduced ratio
+		# of the internal rate to the sample rate remains small.
+		model = FDTDModel(arbitrary_shape=ConvexPolygon, bandwidth=8001., duration=0.02, sample_rate=48000)
+		self.assertEqual(model.internal_rate, 20100)
+		self.assertLessEqual(model.sample_rate // math.gcd(model.sample_rate, model.internal_rate), 480)
+		model.updateProperties(0)
+		model.generateWaveform()
+		self.assertEqual(model.waveform.shape, (model.length,))
+		self.assertFalse(np.isnan(model.waveform).any())
+		# This test asserts that the resampler is band-limited.
+		t = np.arange(20000) / 20000
+		sine = resample(np.sin(2 * np.pi * 1000 * t) + np.sin(2 * np.pi * 9000 * t), 20000, 8000, 8000)
+		self.assertLess(np.abs(sine - np.sin(2 * np.pi * 1000 * np.arange(8000) / 8000))[200:-200].max(), 1e-3)
+
+		# This test asserts that the 9-point stencil upholds its own stability criterion, λ ≤ (2 - 4α)^-0.5, and that the
+		# conservation law of energy is upheld.
+		model = FDTDModel(arbitrary_shape=ConvexPolygon, duration=0.02, sample_rate=48000, stencil='9-point')
+		self.assertLessEqual(model.cfl, (3 / 4) ** 0.5)
+		self.assertGreater(model.H, FDTDModel(arbitrary_shape=ConvexPolygon, duration=0.02, sample_rate=48000).H)
+		model.updateProperties(0)
+		model.generateWaveform()
+		self.assertFalse(np.isnan(model.waveform).any())
+		self.assertLessEqual(np.abs(model.waveform).max(), 1.)
+
+		# This test asserts that duplicate drum shapes can only be rejected when the arbitrary shape has more than one
+		# canonical form, such that every circle is a duplicate, whereas ellipses are unique.
+		with self.assertRaises(AssertionError):
+			FDTDModel(arbitrary_shape=Circle, dedup_tolerance=1e-3, duration=0.02, sample_rate=48000)
+		model = FDTDModel(arbitrary_shape=Ellipse, dedup_tolerance=1e-3, duration=0.02, sample_rate=48000, seed=0)
+		waveforms, labels = model.generateBatch(range(0, 50, 5))
+		self.assertFalse(np.isnan(waveforms).any())
+		self.assertEqual(len(model.shape_filter or []), 10)
+
+		# This test asserts that the model does not generate duplicate drum shapes when dedup_tolerance is set.
+		shape_settings: IrregularStar.Settings = {'N': 3}
+		model = FDTDModel(
+			arbitrary_shape=IrregularStar,
+			dedup_tolerance=1e-3,
+			duration=0.02,
+			sample_rate=48000,
+			shape_settings=shape_settings,
+		)
+		shape_hashes = set()
+		for _ in range(20):
+			model.updateProperties()
+			shape_hashes.add(shapeHash(model.shape, 1e-3))
+		self.assertEqual(len(shape_hashes), 20)
+
+		# This test asserts that the model loads its drum shapes and masks from a shape bank in order.
+		bank = ShapeBank.generate(os.path.join(self.tmp_dir, 'bank'), ConvexPolygon, 3, H=model.H)
+		model = FDTDModel(
+			arbitrary_shape=ConvexPolygon,
+			duration=0.02,
+			sample_rate=48000,
+			shape_bank=bank.path,
+		)
+		for i in range(15):
+			model.updateProperties(i)
+			self.assertEqual(model.shape.__getLabels__()['vertices'], bank.getVertices(i // 5).tolist())
+			# the cropped boundary conditions contain every cell of the mask
+			x_0, y_0 = model.drum.origin
+			mask = np.pad(bank.getMask(i // 5), 1)
+			self.assertTrue(np.array_equal(model.B, mask[x_0:x_0 + model.B.shape[0], y_0:y_0 + model.B.shape[1]]))
+			self.assertEqual(model.B.sum(), mask.sum())
+			self.assertTrue(model.shape.isPointInside(model.strike))
+
+		# This test asserts that the same prepared drum is reused for every strike of a drum shape.
+		model = FDTDModel(arbitrary_shape=ConvexPolygon, duration=0.02, sample_rate=48000, strikes_per_shape=3)
+		for i in range(9):
+			model.updateProperties(i)
+			if i % 3 == 0:
+				drum = model.drum
+			self.assertIs(model.drum, drum)
+			self.assertIs(model.shape, drum.shape)
+			self.assertTrue(model.shape.isPointInside(model.strike))
+
+		# This test asserts that a drum can be prepared explicitly.
+		polygon = ConvexPolygon()
+		model.drum = model.prepareDrum(polygon)
+		x_0, y_0 = model.drum.origin
+		mask = np.pad(polygon.draw(model.H), 1)
+		self.assertTrue(np.array_equal(model.B, mask[x_0:x_0 + model.B.shape[0], y_0:y_0 + model.B.shape[1]]))
+		self.assertTrue(polygon.isPointInside(model.w))
+
+		# This test asserts that a cropped drum produces the same waveform as the uncropped grid.
+		model.updateProperties(1)
+		model.generateWaveform()
+		cropped = model.waveform
+		model.drum = PreparedDrum(polygon, mask, model.drum.centroid, model.w)
+		model.generateWaveform()
+		self.assertTrue(np.allclose(model.waveform, cropped))
+
+		# This test asserts that a shape which does not accept a random generator can be used as the arbitrary shape.
+		polygon_settings: Polygon.Settings = {'vertices': [[0., 0.], [1., 0.], [1., 1.], [0., 1.]]}
+		model = FDTDModel(arbitrary_shape=Polygon, duration=0.02, sample_rate=48000, shape_settings=polygon_settings)
+		model.updateProperties(0)
+		self.assertTrue(np.allclose(model.getLabels()['vertices'], polygon_settings['vertices']))
+		model.generateWaveform()
+		self.assertFalse(np.isnan(model.waveform).any())
+
+		# This test asserts that a batch of samples must not contain duplicate indices.
+		with self.assertRaises(AssertionError):
+			model.generateBatch([5, 6, 5])
+
+		# This test asserts that a batch of samples is grouped by drum, and that each strike is equal to the same strike
+		# generated one at a time. After generating the batch, the model retains the last drum in the batch.
+		model = FDTDModel(arbitrary_shape=ConvexPolygon, duration=0.02, sample_rate=48000)
+		waveforms, labels = model.generateBatch([5, 6, 7, 0, 1])
+		self.assertEqual(waveforms.shape, (5, model.length))
+		self.assertEqual(labels['vertices'][0], labels['vertices'][2])
+		self.assertEqual(labels['vertices'][3], labels['vertices'][4])
+		self.assertNotEqual(labels['vertices'][0], labels['vertices'][3])
+		for b in range(3):
+			x, y = labels['strike_location'][b]
+			model.strike = (float(x), float(y))
+			model.generateWaveform()
+			self.assertTrue(np.allclose(waveforms[b], model.waveform))
+
+		# This test asserts that, given a seed, any subset of indices is identical to the same samples in a serial run.
+		model = FDTDModel(arbitrary_shape=IrregularStar, duration=0.02, sample_rate=48000, seed=1)
+		waveforms, labels = model.generateBatch(range(10))
+		shard, shard_labels = model.generateBatch([8, 3, 4])
+		self.assertTrue(np.array_equal(shard, waveforms[[8, 3, 4]]))
+		for b, i in enumerate([8, 3, 4]):
+			self.assertEqual(shard_labels['vertices'][b], labels['vertices'][i])
+			self.assertEqual(shard_labels['strike_location'][b], labels['strike_location'][i])
+
+		# This test asserts that, given a seed, a drum whose strikes are split across batches is rebuilt identically when
+		# duplicate drum shapes are rejected.
+		model = FDTDModel(arbitrary_shape=IrregularStar, dedup_tolerance=1e-6, duration=0.02, sample_rate=48000, seed=7)
+		waveforms, labels = model.generateBatch(range(10))
+		model = FDTDModel(arbitrary_shape=IrregularStar, dedup_tolerance=1e-6, duration=0.02, sample_rate=48000, seed=7)
+		shard, shard_labels = model.generateBatch([0, 1, 2])
+		self.assertTrue(np.array_equal(shard, waveforms[:3]))
+		shard, shard_labels = model.generateBatch([3, 4, 9])
+		self.assertTrue(np.array_equal(shard, waveforms[[3, 4, 9]]))
+		for b, i in enumerate([3, 4, 9]):
+			self.assertEqual(shard_labels['vertices'][b], labels['vertices'][i])
+		self.assertEqual(len(model.shape_filter or []), 2)
+		# This test asserts that only the accepted shapes of the most recent drums are remembered.
+		for d in range(2, 80):
+			model.updateProperties(d * model.strikes_per_shape)
+		self.assertEqual(len(model.shapes), 64)
+		self.assertEqual(next(iter(model.shapes)), 80 - 64)
+
+	def test_generate_parallel(self) -> None:
+		'''
+		Tests used in conjunction with `samplers/parallel.py`.
+		'''
+
+		# This test asserts that the dataset is written to a memory-mapped array, with every sample and its labels.
+		path = os.path.join(self.tmp_dir, 'waveforms.npy')
+		settings: PoissonModel.Settings = {
+			'duration': 0.1,
+			'pickups': [(0.25, 0.25), (0.75, 0.5)],
+			'sample_rate': 48000,
+			'strikes_per_shape': 4,
+		}
+		waveforms, labels = generateParallel(PoissonModel, dict(settings), 23, path, workers=2)
+		self.assertIsInstance(waveforms, np.memmap)
+		self.assertEqual(waveforms.shape, (23, 2, 4800))
+		self.assertTrue(np.array_equal(np.load(path), waveforms))
+		self.assertFalse(np.any(np.all(waveforms == 0., axis=(1, 2))))
+		self.assertEqual(len(labels['drum_size']), 23)
+
+		# This test asserts that every strike of a drum is generated by the same worker.
+		for i in range(23):
+			self.assertEqual(labels['drum_size'][i], labels['drum_size'][i - i % 4])
+			self.assertEqual(labels['strike_location'][i] == [0.5, 0.5], i % 4 == 0)
+
+		# This test asserts that each worker generates different drums.
+		self.assertEqual(len({label[0] for label in labels['drum_size']}), 6)
+
+		# This test asserts that, given a seed, the dataset is identical to a serial run.
+		settings['seed'] = 0
+		waveforms, labels = generateParallel(PoissonModel, dict(settings), 23, path, workers=3)
+		serial, serial_labels = PoissonModel(**settings).generateBatch(range(23))
+		self.assertTrue(np.array_equal(waveforms, serial))
+		self.assertEqual(labels, serial_labels)
+
 	def test_lamé_model(self) -> None:
 		'''
 		Tests used in conjunction with `samplers/lamé_model.py`.
@@ -202,6 +432,27 @@ class SamplerTests(TestCase):
 			self.assertLessEqual(model.waveform.max(), 1.)
 			self.assertGreaterEqual(model.waveform.min(), -1.)
 
+		# This test asserts that one channel is rendered per pickup.
+		settings = {'duration': 1., 'sample_rate': 48000, 'pickups': [(0.2, 0.3, 0.5), (0.5, 0.5, 0.5)]}
+		model = LaméModel(**settings)
+		model.updateProperties(0)
+		model.generateWaveform()
+		self.assertEqual(model.waveform.shape, (2, model.length))
+		self.assertLessEqual(model.waveform.max(), 1.)
+		self.assertGreaterEqual(model.waveform.min(), -1.)
+
+		# This test asserts that a batch of samples is equal to the same samples generated one at a time.
+		np.random.seed(0)
+		waveforms, labels = model.generateBatch(range(10))
+		self.assertEqual(waveforms.shape, (10, *model.waveform.shape))
+		np.random.seed(0)
+		for i in range(10):
+			model.updateProperties(i)
+			model.generateWaveform()
+			self.assertTrue(np.allclose(waveforms[i], model.waveform))
+			self.assertEqual(labels['drum_size'][i], model.getLabels()['drum_size'])
+			self.assertEqual(labels['strike_location'][i], model.getLabels()['strike_location'])
+
 	def test_poisson_model(self) -> None:
 		'''
 		Tests used in conjunction with `samplers/poisson_model.py`.
@@ -247,3 +498,24 @@ class SamplerTests(TestCase):
 			model.generateWaveform()
 			self.assertLessEqual(model.waveform.max(), 1.)
 			self.assertGreaterEqual(model.waveform.min(), -1.)
+
+		# This test asserts that one channel is rendered per pickup.
+		settings = {'duration': 1., 'sample_rate': 48000, 'pickups': [(0.25, 0.25), (0.75, 0.5), (0.5, 0.75)]}
+		model = PoissonModel(**settings)
+		model.updateProperties(0)
+		model.generateWaveform()
+		self.assertEqual(model.waveform.shape, (3, model.length))
+		self.assertLessEqual(model.waveform.max(), 1.)
+		self.assertGreaterEqual(model.waveform.min(), -1.)
+
+		# This test asserts that a batch of samples is equal to the same samples generated one at a time.
+		np.random.seed(0)
+		waveforms, labels = model.generateBatch(range(10))
+		self.assertEqual(waveforms.shape, (10, *model.waveform.shape))
+		np.random.seed(0)
+		for i in range(10):
+			model.updateProperties(i)
+			model.generateWaveform()
+			self.assertTrue(np.allclose(waveforms[i], model.waveform))
+			self.assertEqual(labels['drum_size'][i], model.getLabels()['drum_size'])
+			self.assertEqual(labels['strike_location'][i], model.getLabels()['strike_location'])